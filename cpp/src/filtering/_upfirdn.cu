@@ -111,39 +111,41 @@ extern "C" __global__ void __launch_bounds__( 512 )
 }
 
 ///////////////////////////////////////////////////////////////////////////////
-//                              UPFIRDN2D                                    //
+//                              UPFIRDNND                                    //
 ///////////////////////////////////////////////////////////////////////////////
 
+// Input and output are C-contiguous and viewed as (batch, axis, inner), where
+// batch and inner are the flattened dimensions before and after the filtered
+// axis. Consecutive threads map to consecutive inner elements, so memory
+// accesses stay coalesced without transposing the filtered axis to the end.
 template<typename T>
-__device__ void _cupy_upfirdn2D( const T *__restrict__ inp,
-                                 const int inpH,
+__device__ void _cupy_upfirdnND( const T *__restrict__ inp,
                                  const T *__restrict__ h_trans_flip,
                                  const int up,
                                  const int down,
-                                 const int axis,
                                  const int x_shape_a,
                                  const int h_per_phase,
                                  const int padded_len,
+                                 const long long inner,
                                  T *__restrict__ out,
                                  const int outW,
-                                 const int outH ) {
+                                 const long long total ) {
 
-    const int ty { static_cast<int>( blockIdx.x * blockDim.x + threadIdx.x ) };
-    const int tx { static_cast<int>( blockIdx.y * blockDim.y + threadIdx.y ) };
+    const long long t { static_cast<long long>( blockIdx.x * blockDim.x + threadIdx.x ) };
+    const long long stride { static_cast<long long>( blockDim.x * gridDim.x ) };
 
-    if ( ( tx < outH ) && ( ty < outW ) ) {
-        int x_idx {};
-        int h_idx {};
+    for ( long long tid = t; tid < total; tid += stride ) {
+        const long long in_idx { tid % inner };
+        const long long rest { tid / inner };
+        const long long y { rest % outW };
+        const long long batch { rest / outW };
 
-        if ( axis == 1 ) {
-            x_idx = ( static_cast<int>( tx * down ) / up ) % padded_len;
-            h_idx = ( tx * down ) % up * h_per_phase;
-        } else {
-            x_idx = ( static_cast<int>( ty * down ) / up ) % padded_len;
-            h_idx = ( ty * down ) % up * h_per_phase;
-        }
+        const T *__restrict__ x { inp + batch * x_shape_a * inner + in_idx };
+
+        const int x_idx { static_cast<int>( ( y * down ) / up ) % padded_len };
+        int       h_idx { static_cast<int>( ( y * down ) % up * h_per_phase ) };
+        int       x_conv_idx { x_idx - h_per_phase + 1 };
 
-        int x_conv_idx { x_idx - h_per_phase + 1 };
         if ( x_conv_idx < 0 ) {
             h_idx -= x_conv_idx;
             x_conv_idx = 0;
@@ -153,80 +155,74 @@ __device__ void _cupy_upfirdn2D( const T *__restrict__ inp,
 
         for ( int x_c = x_conv_idx; x_c < ( x_idx + 1 ); x_c++ ) {
             if ( x_c < x_shape_a && x_c >= 0 ) {
-                if ( axis == 1 ) {
-                    temp += inp[ty * inpH + x_c] * h_trans_flip[h_idx];
-                } else {
-                    temp += inp[x_c * inpH + tx] * h_trans_flip[h_idx];
-                }
+                temp += x[x_c * inner] * h_trans_flip[h_idx];
             }
             h_idx += 1;
         }
-        out[ty * outH + tx] = temp;
+        out[tid] = temp;
     }
 }
 
-extern "C" __global__ void __launch_bounds__( 256 ) _cupy_upfirdn2D_float32( const float *__restrict__ inp,
-                                                                             const int inpH,
-                                                                             const float *__restrict__ h_trans_flip,
-                                                                             const int up,
-                                                                             const int down,
-                                                                             const int axis,
-                                                                             const int x_shape_a,
-                                                                             const int h_per_phase,
-                                                                             const int padded_len,
-                                                                             float *__restrict__ out,
-                                                                             const int outW,
-                                                                             const int outH ) {
-    _cupy_upfirdn2D<float>(
-        inp, inpH, h_trans_flip, up, down, axis, x_shape_a, h_per_phase, padded_len, out, outW, outH );
+extern "C" __global__ void __launch_bounds__( 512 )
+    _cupy_upfirdnND_float32( const float *__restrict__ inp,
+                             const float *__restrict__ h_trans_flip,
+                             const int up,
+                             const int down,
+                             const int x_shape_a,
+                             const int h_per_phase,
+                             const int padded_len,
+                             const long long inner,
+                             float *__restrict__ out,
+                             const int outW,
+                             const long long total ) {
+    _cupy_upfirdnND<float>(
+        inp, h_trans_flip, up, down, x_shape_a, h_per_phase, padded_len, inner, out, outW, total );
 }
 
-extern "C" __global__ void __launch_bounds__( 256 ) _cupy_upfirdn2D_float64( const double *__restrict__ inp,
-                                                                             const int inpH,
-                                                                             const double *__restrict__ h_trans_flip,
-                                                                             const int up,
-                                                                             const int down,
-                                                                             const int axis,
-                                                                             const int x_shape_a,
-                                                                             const int h_per_phase,
-                                                                             const int padded_len,
-                                                                             double *__restrict__ out,
-                                                                             const int outW,
-                                                                             const int outH ) {
-    _cupy_upfirdn2D<double>(
-        inp, inpH, h_trans_flip, up, down, axis, x_shape_a, h_per_phase, padded_len, out, outW, outH );
+extern "C" __global__ void __launch_bounds__( 512 )
+    _cupy_upfirdnND_float64( const double *__restrict__ inp,
+                             const double *__restrict__ h_trans_flip,
+                             const int up,
+                             const int down,
+                             const int x_shape_a,
+                             const int h_per_phase,
+                             const int padded_len,
+                             const long long inner,
+                             double *__restrict__ out,
+                             const int outW,
+                             const long long total ) {
+    _cupy_upfirdnND<double>(
+        inp, h_trans_flip, up, down, x_shape_a, h_per_phase, padded_len, inner, out, outW, total );
 }
 
-extern "C" __global__ void __launch_bounds__( 256 )
-    _cupy_upfirdn2D_complex64( const thrust::complex<float> *__restrict__ inp,
-                               const int inpH,
+extern "C" __global__ void __launch_bounds__( 512 )
+    _cupy_upfirdnND_complex64( const thrust::complex<float> *__restrict__ inp,
                                const thrust::complex<float> *__restrict__ h_trans_flip,
                                const int up,
                                const int down,
-                               const int axis,
                                const int x_shape_a,
                                const int h_per_phase,
                                const int padded_len,
+                               const long long inner,
                                thrust::complex<float> *__restrict__ out,
                                const int outW,
-                               const int outH ) {
-    _cupy_upfirdn2D<thrust::complex<float>>(
-        inp, inpH, h_trans_flip, up, down, axis, x_shape_a, h_per_phase, padded_len, out, outW, outH );
+                               const long long total ) {
+    _cupy_upfirdnND<thrust::complex<float>>(
+        inp, h_trans_flip, up, down, x_shape_a, h_per_phase, padded_len, inner, out, outW, total );
 }
 
-extern "C" __global__ void __launch_bounds__( 256 )
-    _cupy_upfirdn2D_complex128( const thrust::complex<double> *__restrict__ inp,
-                                const int inpH,
+extern "C" __global__ void __launch_bounds__( 512 )
+    _cupy_upfirdnND_complex128( const thrust::complex<double> *__restrict__ inp,
                                 const thrust::complex<double> *__restrict__ h_trans_flip,
                                 const int up,
                                 const int down,
-                                const int axis,
                                 const int x_shape_a,
                                 const int h_per_phase,
                                 const int padded_len,
+                                const long long inner,
                                 thrust::complex<double> *__restrict__ out,
                                 const int outW,
-                                const int outH ) {
-    _cupy_upfirdn2D<thrust::complex<double>>(
-        inp, inpH, h_trans_flip, up, down, axis, x_shape_a, h_per_phase, padded_len, out, outW, outH );
+                                const long long total ) {
+    _cupy_upfirdnND<thrust::complex<double>>(
+        inp, h_trans_flip, up, down, x_shape_a, h_per_phase, padded_len, inner, out, outW, total );
 }
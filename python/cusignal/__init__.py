@@ -18,11 +18,24 @@ from cusignal.acoustics.cepstrum import (
     minimum_phase,
 )
 from cusignal.estimation.filters import KalmanFilter
+from cusignal.demod.demod import (
+    fm_demod,
+    am_demod,
+    pm_demod,
+    FMDemodulator,
+    PMDemodulator,
+    Deemphasis,
+)
 from cusignal.filtering.resample import (
     decimate,
     resample,
     resample_poly,
     upfirdn,
+    resample_farrow,
+    FarrowResampler,
+    filter_cache_info,
+    filter_cache_clear,
+    filter_cache_resize,
 )
 from cusignal.filtering.filtering import (
     wiener,
@@ -30,19 +43,38 @@ from cusignal.filtering.filtering import (
     sosfilt,
     hilbert,
     hilbert2,
+    HilbertTransformer,
     detrend,
     channelize_poly,
     freq_shift,
 )
-from cusignal.convolution.correlate import correlate, correlate2d
+from cusignal.filtering.channelizer import Channelizer, Synthesizer
+from cusignal.filtering.nco import NCO
+from cusignal.filtering.ddc import DDC
+from cusignal.filtering.multistage import MultiStageDecimator
+from cusignal.filtering.order_statistic import (
+    order_filter,
+    medfilt,
+    medfilt2d,
+)
+from cusignal.filtering.savitzky_golay import savgol_coeffs, savgol_filter
+from cusignal.convolution.correlate import (
+    correlate,
+    correlate2d,
+    correlation_lags,
+)
 from cusignal.convolution.convolve import (
     fftconvolve,
+    oaconvolve,
+    Convolver,
     choose_conv_method,
     convolve,
     convolve2d,
     convolve1d2o,
     convolve1d3o,
 )
+from cusignal.convolution.bank import convolve_bank
+from cusignal.convolution.tiled import tiled_fftconvolve
 from cusignal.filter_design.fir_filter_design import (
     kaiser_beta,
     kaiser_atten,
@@ -107,6 +139,14 @@ from cusignal.utils.arraytools import (
     get_pinned_mem,
     from_pycuda,
 )
+from cusignal.utils.cost_model import (
+    get_cost_model,
+    set_cost_model,
+    reset_cost_model,
+    calibrate_cost_model,
+    save_cost_model,
+    load_cost_model,
+)
 from cusignal.io.reader import (
     read_bin,
     unpack_bin,
@@ -14,9 +14,17 @@
 from cusignal.convolution.convolve import (
     convolve,
     fftconvolve,
+    oaconvolve,
+    Convolver,
     convolve2d,
     choose_conv_method,
     convolve1d2o,
     convolve1d3o,
 )
-from cusignal.convolution.correlate import correlate, correlate2d
+from cusignal.convolution.correlate import (
+    correlate,
+    correlate2d,
+    correlation_lags,
+)
+from cusignal.convolution.bank import convolve_bank
+from cusignal.convolution.tiled import tiled_fftconvolve
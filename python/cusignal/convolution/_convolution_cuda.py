@@ -38,6 +38,83 @@ _SUPPORTED_TYPES = [
     "complex128",
 ]
 
+_nd_ctypes = {
+    "int32": "int",
+    "int64": "long long",
+    "float32": "float",
+    "float64": "double",
+    "complex64": "complex<float>",
+    "complex128": "complex<double>",
+}
+
+_convolve_nd_code = """
+#include <cupy/complex.cuh>
+
+typedef {ctype} T;
+constexpr int ND {{ {ndim} }};
+
+extern "C" __global__ void _cupy_convolve_nd(
+        const T * __restrict__ inp,
+        const T * __restrict__ ker,
+        const long long * __restrict__ dims,
+        const long long n_out,
+        T * __restrict__ out ) {{
+
+    // Shapes of the input, kernel and output, and the position of the
+    // output in the full convolution
+    long long in_shape[ND], k_shape[ND], out_shape[ND], offset[ND];
+    for ( int d = 0; d < ND; d++ ) {{
+        in_shape[d] = dims[d];
+        k_shape[d] = dims[ND + d];
+        out_shape[d] = dims[2 * ND + d];
+        offset[d] = dims[3 * ND + d];
+    }}
+
+    const long long stride {{ static_cast<long long>( blockDim.x ) *
+                             gridDim.x }};
+
+    for ( long long i = static_cast<long long>( blockIdx.x ) * blockDim.x +
+              threadIdx.x; i < n_out; i += stride ) {{
+
+        // Index in the full output, and the taps along each axis that
+        // overlap the input
+        long long f[ND], lo[ND], hi[ND], j[ND];
+        long long rem {{ i }};
+        bool done {{ false }};
+        for ( int d = ND - 1; d >= 0; d-- ) {{
+            f[d] = rem % out_shape[d] + offset[d];
+            rem /= out_shape[d];
+            lo[d] = max( 0LL, f[d] - in_shape[d] + 1 );
+            hi[d] = min( k_shape[d] - 1, f[d] );
+            done |= lo[d] > hi[d];
+            j[d] = lo[d];
+        }}
+
+        T acc {{}};
+        const long long fl {{ f[ND - 1] }};
+        while ( !done ) {{
+            long long kb {{ 0 }}, xb {{ 0 }};
+            for ( int d = 0; d < ND - 1; d++ ) {{
+                kb = ( kb + j[d] ) * k_shape[d + 1];
+                xb = ( xb + f[d] - j[d] ) * in_shape[d + 1];
+            }}
+            for ( long long t = lo[ND - 1]; t <= hi[ND - 1]; t++ ) {{
+                acc += ker[kb + t] * inp[xb + fl - t];
+            }}
+
+            // Next row of taps
+            int d {{ ND - 2 }};
+            while ( d >= 0 && ++j[d] > hi[d] ) {{
+                j[d] = lo[d];
+                d--;
+            }}
+            done = d < 0;
+        }}
+        out[i] = acc;
+    }}
+}}
+"""
+
 
 class _cupy_convolve_wrapper(object):
     def __init__(self, grid, block, kernel):
@@ -449,6 +526,67 @@ def _convolve(
     return out
 
 
+def _get_convolve_nd_kernel(dtype, ndim):
+    key = ("convolve_nd", str(dtype), ndim)
+    kernel = _cupy_kernel_cache.get(key)
+    if kernel is None:
+        kernel = cp.RawKernel(
+            _convolve_nd_code.format(ctype=_nd_ctypes[str(dtype)], ndim=ndim),
+            "_cupy_convolve_nd",
+            options=("-std=c++11",),
+        )
+        _cupy_kernel_cache[key] = kernel
+    return kernel
+
+
+def _convolve_nd(in1, in2, mode):
+
+    # Promote inputs
+    promType = cp.promote_types(in1.dtype, in2.dtype)
+    if str(promType) not in _nd_ctypes:
+        raise ValueError(
+            "Datatype {} not found for 'convolve_nd'".format(promType)
+        )
+    in1 = cp.ascontiguousarray(in1, promType)
+    in2 = cp.ascontiguousarray(in2, promType)
+
+    full = [n + k - 1 for n, k in zip(in1.shape, in2.shape)]
+    if mode == "full":
+        out_dimens = full
+    elif mode == "same":
+        out_dimens = list(in1.shape)
+    elif mode == "valid":
+        out_dimens = [n - k + 1 for n, k in zip(in1.shape, in2.shape)]
+        if min(out_dimens) < 1:
+            raise ValueError(
+                "no part of the output is valid, use option 1 (same) or 2 "
+                "(full) for third argument"
+            )
+    else:
+        raise ValueError("mode must be 'valid', 'same', or 'full'")
+    offset = [(f - o) // 2 for f, o in zip(full, out_dimens)]
+
+    out = cp.empty(out_dimens, promType)
+    if out.size == 0:
+        return out
+
+    dims = cp.asarray(
+        np.concatenate([in1.shape, in2.shape, out_dimens, offset]),
+        dtype=np.int64,
+    )
+    threadsperblock = 256
+    blockspergrid = min(_iDivUp(out.size, threadsperblock), 65535)
+
+    kernel = _get_convolve_nd_kernel(promType, in1.ndim)
+    kernel(
+        (blockspergrid,),
+        (threadsperblock,),
+        (in1, in2, dims, np.int64(out.size), out),
+    )
+
+    return out
+
+
 def _convolve2d(in1, in2, use_convolve, mode, boundary, fillvalue):
 
     val = _valfrommode(mode)
@@ -0,0 +1,357 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cupy as cp
+import numpy as np
+
+from ..utils._caches import _cupy_kernel_cache
+from ..utils.cost_model import _fft_work, get_cost_model
+from ..utils.fftpack_helper import next_fast_len
+from .convolution_utils import _float_ctypes, _float_result_type, _iDivUp
+
+# Kernels longer than this are always convolved with FFTs; the direct
+# kernel holds a whole kernel and one tile of signal in shared memory.
+_BANK_DIRECT_MAX_TAPS = 1024
+
+# Outputs computed by one thread block of the direct kernel
+_BANK_TILE = 256
+
+# Bound on the number of elements of the spectrum products held at once
+_BANK_CHUNK_ELEMENTS = 1 << 24
+
+_convolve_bank_code = """
+#include <cupy/complex.cuh>
+
+typedef {ctype} T;
+
+extern "C" __global__ void _cupy_convolve_bank(
+        const T * __restrict__ sig,
+        const T * __restrict__ ker,
+        const int n_signals,
+        const int n_kernels,
+        const int n,
+        const int l,
+        const int n_out,
+        const int offset,
+        const int n_rows,
+        const bool paired,
+        T * __restrict__ out ) {{
+
+    extern __shared__ unsigned char smem[];
+    T *s_ker {{ reinterpret_cast<T *>( smem ) }};
+    T *s_sig {{ s_ker + l }};
+
+    const int t0 {{ static_cast<int>( blockIdx.x * blockDim.x ) }};
+    const int first {{ t0 + offset - ( l - 1 ) }};
+    const int span {{ static_cast<int>( blockDim.x ) + l - 1 }};
+
+    for ( int row = blockIdx.y; row < n_rows; row += gridDim.y ) {{
+        const int m {{ paired ? row % n_signals : row / n_kernels }};
+        const int k {{ row % n_kernels }};
+
+        // Stage the kernel and the tile of signal it slides over
+        __syncthreads( );
+        for ( int j = threadIdx.x; j < l; j += blockDim.x ) {{
+            s_ker[j] = ker[static_cast<long long>( k ) * l + j];
+        }}
+        for ( int j = threadIdx.x; j < span; j += blockDim.x ) {{
+            const int idx {{ first + j }};
+            s_sig[j] = ( idx >= 0 && idx < n )
+                ? sig[static_cast<long long>( m ) * n + idx] : T( 0 );
+        }}
+        __syncthreads( );
+
+        const int t {{ t0 + static_cast<int>( threadIdx.x ) }};
+        if ( t < n_out ) {{
+            T acc {{}};
+            const T *s {{ s_sig + threadIdx.x + l - 1 }};
+            for ( int j = 0; j < l; j++ ) {{
+                acc += s_ker[j] * s[-j];
+            }}
+            out[static_cast<long long>( row ) * n_out + t] = acc;
+        }}
+    }}
+}}
+"""
+
+
+def _get_convolve_bank_kernel(dtype):
+    key = ("convolve_bank", str(dtype))
+    kernel = _cupy_kernel_cache.get(key)
+    if kernel is None:
+        kernel = cp.RawKernel(
+            _convolve_bank_code.format(ctype=_float_ctypes[str(dtype)]),
+            "_cupy_convolve_bank",
+            options=("-std=c++11",),
+        )
+        _cupy_kernel_cache[key] = kernel
+    return kernel
+
+
+def _bank_direct_gpu(sig, ker, rows, paired, n_out, offset):
+    M, N = sig.shape
+    K, L = ker.shape
+    out = cp.empty((rows, n_out), sig.dtype)
+    if out.size == 0:
+        return out
+
+    kernel = _get_convolve_bank_kernel(sig.dtype)
+    grid = (_iDivUp(n_out, _BANK_TILE), min(rows, 65535))
+    shared = (2 * L - 1 + _BANK_TILE) * sig.itemsize
+    kernel(
+        grid,
+        (_BANK_TILE,),
+        (
+            sig,
+            ker,
+            np.int32(M),
+            np.int32(K),
+            np.int32(N),
+            np.int32(L),
+            np.int32(n_out),
+            np.int32(offset),
+            np.int32(rows),
+            np.bool_(paired),
+            out,
+        ),
+        shared_mem=shared,
+    )
+    return out
+
+
+def _bank_direct_cpu(sig, ker, rows, paired, n_out, offset):
+    M, N = sig.shape
+    K, L = ker.shape
+
+    # Signals padded so that every output reads L samples in range
+    pad = np.zeros((M, N + 2 * L), sig.dtype)
+    pad[:, L : L + N] = sig
+    start = L + offset
+
+    if paired:
+        s = pad[np.arange(rows) % M]
+        h = ker[np.arange(rows) % K]
+        out = np.zeros((rows, n_out), sig.dtype)
+    else:
+        s = pad[:, None, :]
+        h = ker[None, :, :]
+        out = np.zeros((M, K, n_out), sig.dtype)
+
+    for j in range(L):
+        out += h[..., j : j + 1] * s[..., start - j : start - j + n_out]
+    return out.reshape(rows, n_out)
+
+
+def _bank_fft(xp, sig, ker, rows, paired, n_out, offset):
+    M, N = sig.shape
+    K, L = ker.shape
+    nfft = next_fast_len(N + L - 1)
+    crop = slice(offset, offset + n_out)
+
+    if sig.dtype.kind == "c":
+        fwd, inv = xp.fft.fft, xp.fft.ifft
+    else:
+        fwd, inv = xp.fft.rfft, xp.fft.irfft
+    S = fwd(sig, nfft, axis=-1)
+    H = fwd(ker, nfft, axis=-1)
+
+    if paired:
+        Y = inv(S[np.arange(rows) % M] * H[np.arange(rows) % K], nfft)
+        return xp.ascontiguousarray(Y[:, crop])
+
+    # Broadcast the spectra of a bounded number of signals at a time
+    out = xp.empty((M, K, n_out), sig.dtype)
+    chunk = max(1, _BANK_CHUNK_ELEMENTS // max(1, K * S.shape[-1]))
+    for m in range(0, M, chunk):
+        Y = inv(S[m : m + chunk, None, :] * H[None, :, :], nfft)
+        out[m : m + chunk] = Y[..., crop]
+    return out.reshape(rows, n_out)
+
+
+def _bank_costs(M, K, N, L, rows, n_out):
+    """
+    Seconds the cost model predicts for the FFT and direct methods of
+    `convolve_bank`.
+    """
+    c = get_cost_model()
+    # Forward transforms of every input and an inverse one per output, in
+    # units of three transforms
+    nfft = next_fast_len(N + L - 1)
+    costs = {
+        "fft": c["fft_overhead"]
+        + c["fft_per_point"] * ((M + K + rows) / 3.0 * _fft_work(nfft)),
+        "direct": float("inf"),
+    }
+    if L <= _BANK_DIRECT_MAX_TAPS:
+        costs["direct"] = (
+            c["conv_direct_overhead"]
+            + c["conv_direct_per_mac"] * rows * n_out * L
+        )
+    return costs
+
+
+def _bank_method(M, K, N, L, rows, n_out):
+    """The method the cost model predicts to be faster."""
+    costs = _bank_costs(M, K, N, L, rows, n_out)
+    return min(costs, key=costs.get)
+
+
+def convolve_bank(signals, kernels, mode="full", method="auto", paired=False):
+    """
+    Convolve a bank of signals with a bank of kernels.
+
+    Computes the 1-D convolution of every signal with every kernel, or of
+    each signal with the kernel at the same position, in a single batched
+    operation.
+
+    Parameters
+    ----------
+    signals : array_like
+        Signals of length N, as a 1-D array or stacked along the first axis
+        of a 2-D array of shape ``(M, N)``.
+    kernels : array_like
+        Kernels of length L, as a 1-D array or stacked along the first axis
+        of a 2-D array of shape ``(K, L)``.
+    mode : str {'full', 'valid', 'same'}, optional
+        A string indicating the size of the output, as in `convolve`, with
+        each signal as `in1` and each kernel as `in2`:
+
+        ``full``
+           The output is the full discrete linear convolution
+           of the inputs. (Default)
+        ``valid``
+           The output consists only of those elements that do not
+           rely on the zero-padding.
+        ``same``
+           The output is the same size as the signals, centered
+           with respect to the 'full' output.
+    method : str {'auto', 'direct', 'fft'}, optional
+        A string indicating which method to use to calculate the
+        convolutions.
+
+        ``direct``
+           A kernel that stages each kernel and a tile of signal in shared
+           memory and computes the sums directly. Only available for kernels
+           of up to 1024 taps.
+        ``fft``
+           The spectra of all signals and kernels are computed once and
+           their products broadcast over every pair.
+        ``auto``
+           Chooses the method the cost model predicts to be faster; see
+           `get_cost_model`. (Default)
+    paired : bool, optional
+        If False (default), convolve every signal with every kernel. If
+        True, convolve signal ``i`` with kernel ``i``; M and K must then be
+        equal, or one of them 1.
+
+    Returns
+    -------
+    out : ndarray
+        If `paired` is False, the convolutions of shape ``(M, K, n_out)``;
+        otherwise, of shape ``(max(M, K), n_out)``. Axes of 1-D inputs are
+        dropped. The output is floating point, in the precision of the
+        inputs.
+
+    See Also
+    --------
+    convolve, fftconvolve
+
+    Notes
+    -----
+    The FFT method transforms each signal and each kernel once, so
+    ``M * K`` convolutions cost ``M + K`` forward transforms and ``M * K``
+    inverse ones. The products are formed for a bounded number of signals
+    at a time. NumPy inputs are convolved on the host.
+
+    Examples
+    --------
+    Match 512 templates against 64 channels:
+
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> channels = cp.random.randn(64, 2 ** 14)
+    >>> templates = cp.random.randn(512, 128)
+    >>> scores = cusignal.convolve_bank(channels, templates[:, ::-1], "valid")
+    >>> scores.shape
+    (64, 512, 16257)
+
+    """
+    if mode not in ("full", "same", "valid"):
+        raise ValueError(
+            "acceptable mode flags are 'valid', 'same', or 'full'"
+        )
+    if method not in ("auto", "direct", "fft"):
+        raise ValueError(
+            "Acceptable method flags are 'auto', 'direct', or 'fft'."
+        )
+
+    xp = cp.get_array_module(signals, kernels)
+    sig = xp.asarray(signals)
+    ker = xp.asarray(kernels)
+    if not (1 <= sig.ndim <= 2 and 1 <= ker.ndim <= 2):
+        raise ValueError("signals and kernels must be 1-D or 2-D")
+    sig_1d, ker_1d = sig.ndim == 1, ker.ndim == 1
+    sig = sig.reshape(-1, sig.shape[-1])
+    ker = ker.reshape(-1, ker.shape[-1])
+    M, N = sig.shape
+    K, L = ker.shape
+    if N == 0 or L == 0:
+        raise ValueError("signals and kernels must not be empty")
+
+    if paired:
+        if M != K and 1 not in (M, K):
+            raise ValueError(
+                "paired convolution needs as many signals as kernels"
+            )
+        rows = max(M, K)
+    else:
+        rows = M * K
+
+    full = N + L - 1
+    if mode == "full":
+        n_out = full
+    elif mode == "same":
+        n_out = N
+    else:
+        n_out = abs(N - L) + 1
+    offset = (full - n_out) // 2
+
+    dtype = _float_result_type(sig.dtype, ker.dtype)
+    sig = xp.ascontiguousarray(sig, dtype)
+    ker = xp.ascontiguousarray(ker, dtype)
+
+    if method == "auto":
+        method = _bank_method(M, K, N, L, rows, n_out)
+
+    if method == "direct":
+        if L > _BANK_DIRECT_MAX_TAPS:
+            raise ValueError(
+                "the direct method supports kernels of up to {} taps".format(
+                    _BANK_DIRECT_MAX_TAPS
+                )
+            )
+        if xp is cp:
+            out = _bank_direct_gpu(sig, ker, rows, paired, n_out, offset)
+        else:
+            out = _bank_direct_cpu(sig, ker, rows, paired, n_out, offset)
+    else:
+        out = _bank_fft(xp, sig, ker, rows, paired, n_out, offset)
+
+    if paired:
+        return out[0] if sig_1d and ker_1d else out
+    out = out.reshape(M, K, n_out)
+    if ker_1d:
+        out = out[:, 0]
+    if sig_1d:
+        out = out[0]
+    return out
@@ -11,10 +11,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
+import timeit
+
 import cupy as cp
 import numpy as np
 
-import timeit
+from scipy.special import lambertw
+
+from ..utils.cost_model import _fft_work, get_cost_model
+from ..utils.fftpack_helper import next_fast_len
 
 FULL = 2
 SAME = 1
@@ -24,6 +30,23 @@ CIRCULAR = 8
 REFLECT = 4
 PAD = 0
 
+# Largest kernel checked for separability; larger ones are convolved with
+# FFTs anyway
+_SEPARABLE_MAX_SIZE = 1 << 16
+
+# Bits of float64 mantissa left free of the exact integer sums of the
+# Fourier method, as headroom for the rounding error of the transforms
+_INT_FFT_GUARD_BITS = 4
+
+# C++ types of the floating-point types the convolution kernels are built
+# for
+_float_ctypes = {
+    "float32": "float",
+    "float64": "double",
+    "complex64": "complex<float>",
+    "complex128": "complex<double>",
+}
+
 _modedict = {"valid": 0, "same": 1, "full": 2}
 
 _boundarydict = {
@@ -37,11 +60,11 @@ _boundarydict = {
 }
 
 
-def _inputs_swap_needed(mode, shape1, shape2):
+def _inputs_swap_needed(mode, shape1, shape2, axes=None):
     """
     If in 'valid' mode, returns whether or not the input arrays need to be
     swapped depending on whether `shape1` is at least as large as `shape2` in
-    every dimension.
+    every dimension, or in every dimension of `axes` if given.
 
     This is important for some of the correlation and convolution
     implementations in this module, where the larger array input needs to come
@@ -53,6 +76,10 @@ def _inputs_swap_needed(mode, shape1, shape2):
     if mode == "valid":
         ok1, ok2 = True, True
 
+        if axes is not None:
+            shape1 = [shape1[a] for a in axes]
+            shape2 = [shape2[a] for a in axes]
+
         for d1, d2 in zip(shape1, shape2):
             if not d1 >= d2:
                 ok1 = False
@@ -111,46 +138,158 @@ def _prod(iterable):
     return product
 
 
-def _fftconv_faster(x, h, mode):
+def _oa_block_len(s_long, s_short):
     """
-    See if using `fftconvolve` or `_correlateND` is faster. The boolean value
-    returned depends on the sizes and shapes of the input values.
-
-    The big O ratios were found to hold across different machines, which makes
-    sense as it's the ratio that matters (the effective speed of the computer
-    is found in both big O constants). Regardless, this had been tuned on an
-    early 2015 MacBook Pro with 8GB RAM and an Intel i5 processor.
+    FFT length of the overlap-add blocks along one axis, where the input to
+    be split has `s_long` samples and the other one `s_short`. Returns None
+    if a single transform of the whole axis is cheaper.
     """
+    if s_short == 1 or 2 * s_short > s_long:
+        return None
+
+    # The work per output sample, N * log2(2 * N) / (N - overlap), is
+    # smallest for N = -overlap * W_{-1}(-1 / (2 * e * overlap)).
+    overlap = s_short - 1
+    opt = -overlap * lambertw(-1.0 / (2 * math.e * overlap), k=-1).real
+
+    # Blocks at least twice the overlap keep the overlap-add to a single
+    # neighbour
+    block = next_fast_len(max(int(math.ceil(opt)), 2 * s_short - 1))
+    if block >= s_long:
+        return None
+    return block
+
+
+def _conv_out_shape(x_shape, h_shape, mode):
     if mode == "full":
-        out_shape = [n + k - 1 for n, k in zip(x.shape, h.shape)]
-        big_O_constant = 10963.92823819 if x.ndim == 1 else 8899.1104874
+        return [n + k - 1 for n, k in zip(x_shape, h_shape)]
     elif mode == "same":
-        out_shape = x.shape
-        if x.ndim == 1:
-            if h.size <= x.size:
-                big_O_constant = 7183.41306773
-            else:
-                big_O_constant = 856.78174111
-        else:
-            big_O_constant = 34519.21021589
+        return list(x_shape)
     elif mode == "valid":
-        out_shape = [n - k + 1 for n, k in zip(x.shape, h.shape)]
-        big_O_constant = 41954.28006344 if x.ndim == 1 else 66453.24316434
-    else:
-        raise ValueError(
-            "Acceptable mode flags are \
-                         'valid',"
-            " 'same', or 'full'."
+        return [abs(n - k) + 1 for n, k in zip(x_shape, h_shape)]
+    raise ValueError("Acceptable mode flags are 'valid', 'same', or 'full'.")
+
+
+def _conv_work(x_shape, h_shape, mode):
+    """
+    Work of every method convolving arrays of shapes `x_shape` and
+    `h_shape`, in the units of the cost model: multiply-accumulates for
+    'direct', and ``L * log2(L)`` of a transform of length ``L`` for 'fft'
+    and 'oa'. The FFT methods take three transforms per convolution, and
+    overlap-add one transform of the smaller input and two per block.
+    The work of 'oa' is None if it would use a single block.
+    """
+    out_shape = _conv_out_shape(x_shape, h_shape, mode)
+
+    # Every output sample needs at most the size of the overlap of the inputs
+    overlap = [min(n, k) for n, k in zip(x_shape, h_shape)]
+    macs = _prod(out_shape) * _prod(overlap)
+
+    # As `oaconvolve`, split the larger input in blocks
+    if _prod(h_shape) > _prod(x_shape):
+        x_shape, h_shape = h_shape, x_shape
+    n_full, n_block, n_blocks = 1, 1, 1
+    for s_a, s_k in zip(x_shape, h_shape):
+        n_full *= next_fast_len(s_a + s_k - 1)
+        block = _oa_block_len(s_a, s_k)
+        if block is None:
+            n_block *= next_fast_len(s_a + s_k - 1)
+        else:
+            n_block *= block
+            n_blocks *= _iDivUp(s_a, block - s_k + 1)
+
+    oa = None
+    if n_blocks > 1:
+        oa = (1 + 2 * n_blocks) / 3.0 * _fft_work(n_block)
+    return {"direct": macs, "fft": _fft_work(n_full), "oa": oa}
+
+
+def _separable_cost(x_shape, h_shape, mode):
+    """
+    Seconds the cost model predicts for convolving with a rank-one kernel
+    of shape `h_shape` one axis at a time, as `_convolve_separable` does.
+    """
+    c = get_cost_model()
+    out_shape = _conv_out_shape(x_shape, h_shape, mode)
+    shape = list(x_shape)
+    cost = 0.0
+    for axis, k in enumerate(h_shape):
+        shape[axis] = out_shape[axis]
+        cost += c["conv_direct_overhead"] + c["conv_direct_per_mac"] * (
+            _prod(shape) * min(x_shape[axis], k)
         )
+    return cost
 
-    # see whether the Fourier transform convolution method or the direct
-    # convolution method is faster (discussed in scikit-image PR #1792)
-    direct_time = x.size * h.size * _prod(out_shape)
-    fft_time = sum(
-        n * np.log(n) for n in (x.shape + h.shape + tuple(out_shape))
-    )
 
-    return big_O_constant * fft_time < direct_time
+def _use_separable(x_shape, h_shape, mode):
+    """
+    Whether convolving one axis at a time would beat the N-D direct method,
+    if the kernel turns out to be separable.
+    """
+    if len(h_shape) < 2 or _prod(h_shape) > _SEPARABLE_MAX_SIZE:
+        return False
+    c = get_cost_model()
+    macs = _conv_work(x_shape, h_shape, mode)["direct"]
+    direct = c["conv_direct_overhead"] + c["conv_direct_per_mac"] * macs
+    return _separable_cost(x_shape, h_shape, mode) < direct
+
+
+def _separable_factors(h, dtype):
+    """
+    1-D factors, one per axis, whose outer product is the kernel `h`, as
+    NumPy arrays of `dtype`. Returns None if `h` is not of rank one to
+    within the tolerance of `numpy.linalg.matrix_rank`, or if `dtype` is not
+    floating point.
+    """
+    if dtype.kind not in "fc" or h.dtype.kind not in "iufc":
+        return None
+    if h.ndim < 2 or h.size == 0 or h.size > _SEPARABLE_MAX_SIZE:
+        return None
+
+    # Peel off one axis at a time; the kernel is separable if every
+    # unfolding has a single significant singular value
+    eps = np.finfo(dtype).eps
+    rest = cp.asnumpy(h).astype(np.result_type(dtype, np.float64))
+    factors = []
+    for k in h.shape[:-1]:
+        mat = rest.reshape(k, -1)
+        u, s, vh = np.linalg.svd(mat, full_matrices=False)
+        if s.size > 1 and s[1] > s[0] * max(mat.shape) * eps:
+            return None
+        factors.append(u[:, 0] * s[0])
+        rest = vh[0]
+    factors.append(rest)
+    return [f.astype(dtype) for f in factors]
+
+
+def _conv_costs(x, h, mode):
+    """
+    Seconds the cost model predicts for the direct, FFT and overlap-add
+    convolution of `x` and `h`; see `get_cost_model`. The direct cost is
+    that of the separable method when `h` is a rank-one N-D kernel.
+    """
+    c = get_cost_model()
+    work = _conv_work(x.shape, h.shape, mode)
+
+    costs = {
+        "direct": c["conv_direct_overhead"]
+        + c["conv_direct_per_mac"] * work["direct"],
+        "fft": c["fft_overhead"] + c["fft_per_point"] * work["fft"],
+        "oa": float("inf"),
+    }
+    if work["oa"] is not None:
+        costs["oa"] = c["fft_overhead"] + c["fft_per_point"] * work["oa"]
+
+    # Only pay for the separability check when it could change the choice
+    if _use_separable(x.shape, h.shape, mode):
+        separable = _separable_cost(x.shape, h.shape, mode)
+        dtype = np.result_type(x.dtype, h.dtype)
+        if (
+            separable < min(costs.values())
+            and _separable_factors(h, dtype) is not None
+        ):
+            costs["direct"] = separable
+    return costs
 
 
 def _timeit_fast(stmt="pass", setup="pass", repeat=3):
@@ -207,6 +346,61 @@ def _bvalfromboundary(boundary):
         )
 
 
+def _as_int64(a):
+    """Integers as int64; uint64 is reinterpreted, which keeps residues."""
+    if a.dtype == np.uint64:
+        return a.view(np.int64)
+    return a.astype(np.int64)
+
+
+def _int_max_abs(a):
+    """Largest magnitude of the integers in `a`, as a Python int."""
+    a = _as_int64(a)
+    return max(int(a.max()), -int(a.min()))
+
+
+def _int_fft_split(max1, max2, shape1, shape2):
+    """
+    Limb width in bits and number of limbs of each input for an exact FFT
+    convolution of integer arrays of shapes `shape1` and `shape2` and
+    magnitudes up to `max1` and `max2`. Returns None if the inputs can be
+    transformed whole, and ``(0, 0, 0)`` if no split keeps the sums exact.
+    """
+    # The rounding error of a transform grows with its size: the exact
+    # outputs, and the products of limbs summed into them, must stay below
+    # the float64 mantissa less the bits of the transform size and a guard,
+    # for the rounded results to come out exact.
+    fft_size = 1
+    for n1, n2 in zip(shape1, shape2):
+        fft_size *= next_fast_len(int(n1) + int(n2) - 1)
+    budget = 2 ** (np.finfo(np.float64).nmant - _INT_FFT_GUARD_BITS)
+    budget //= fft_size
+    if max1 * max2 <= budget:
+        return None
+
+    # Limbs below the top one are in [0, 2**bits) and the top one, which
+    # carries the sign, within [-2**bits, 2**bits); outputs of the same
+    # weight sum the products of up to min(n1, n2) pairs of limbs.
+    for bits in range(26, 0, -1):
+        n1 = max(1, -(-max1.bit_length() // bits))
+        n2 = max(1, -(-max2.bit_length() // bits))
+        if min(n1, n2) * 4 ** bits <= budget:
+            return bits, n1, n2
+    return 0, 0, 0
+
+
+def _float_result_type(*dtypes):
+    """
+    Floating-point type inputs of `dtypes` are convolved in: their common
+    type in at least single precision, or double precision for types the
+    kernels are not built for.
+    """
+    dtype = np.result_type(*dtypes, np.float32)
+    if dtype.char not in "fdFD":
+        dtype = np.dtype("D" if dtype.kind == "c" else "d")
+    return dtype
+
+
 def _iDivUp(a, b):
     return (a // b + 1) if (a % b != 0) else (a // b)
 
@@ -15,21 +15,47 @@ import cupy as cp
 import numpy as np
 import sys
 
+from numpy.lib.stride_tricks import as_strided
+
+from ..utils._caches import _conv_method_cache
+from ..utils.cost_model import get_cost_model
 from ..utils.fftpack_helper import (
     _init_nd_shape_and_axes_sorted,
     next_fast_len,
 )
 from . import _convolution_cuda
+from .bank import _BANK_DIRECT_MAX_TAPS, _bank_costs, convolve_bank
 from .convolution_utils import (
+    CIRCULAR,
+    PAD,
+    REFLECT,
+    _as_int64,
+    _bvalfromboundary,
     _inputs_swap_needed,
+    _int_fft_split,
+    _int_max_abs,
     _numeric_arrays,
     _centered,
-    _fftconv_faster,
+    _conv_costs,
+    _float_result_type,
+    _iDivUp,
+    _oa_block_len,
+    _prod,
+    _separable_factors,
     _timeit_fast,
+    _use_separable,
 )
 
 _modedict = {"valid": 0, "same": 1, "full": 2}
 
+# Bound on the number of elements of the block spectra held at once by
+# `oaconvolve`
+_OA_CHUNK_ELEMENTS = 1 << 23
+
+# Bound on the number of elements of the convolutions with the components
+# of a Volterra kernel held at once
+_VOLTERRA_CHUNK_ELEMENTS = 1 << 24
+
 
 def convolve(
     in1,
@@ -62,18 +88,23 @@ def convolve(
         ``same``
            The output is the same size as `in1`, centered
            with respect to the 'full' output.
-    method : str {'auto', 'direct', 'fft'}, optional
+    method : str {'auto', 'direct', 'fft', 'oa'}, optional
         A string indicating which method to use to calculate the convolution.
 
         ``direct``
            The convolution is determined directly from sums, the definition of
-           convolution.
+           convolution. N-dimensional kernels of rank one, such as Gaussian
+           or box kernels, are applied as successive 1-D convolutions when
+           that is predicted to be faster.
         ``fft``
            The Fourier Transform is used to perform the convolution by calling
            `fftconvolve`.
+        ``oa``
+           The Fourier Transform of overlapping blocks is used to perform the
+           convolution by calling `oaconvolve`.
         ``auto``
-           Automatically chooses direct or Fourier method based on an estimate
-           of which is faster (default).
+           Automatically chooses direct, Fourier or overlap-add method based
+           on an estimate of which is faster (default).
 
     Returns
     -------
@@ -85,6 +116,7 @@ def convolve(
     --------
     choose_conv_method : chooses the fastest appropriate convolution method
     fftconvolve
+    oaconvolve
 
     Notes
     -----
@@ -95,6 +127,12 @@ def convolve(
     there are certain constraints that may force `method=direct` (more detail
     in `choose_conv_method` docstring).
 
+    A kernel is taken as separable when the singular values of its
+    unfoldings, beyond the first, are below the tolerance of
+    `numpy.linalg.matrix_rank`. Separable convolution costs ``sum(k)``
+    rather than ``prod(k)`` operations per output sample for a kernel of
+    shape ``k``.
+
     Examples
     --------
     Smooth a square pulse using a Hann window:
@@ -137,15 +175,38 @@ def convolve(
     if method == "auto":
         method = choose_conv_method(volume, kernel, mode=mode)
 
-    if method == "fft":
-        out = fftconvolve(volume, kernel, mode=mode)
-        result_type = cp.result_type(volume, kernel)
+    result_type = cp.result_type(volume, kernel)
+    if method in ("fft", "oa") and result_type.kind in "ui":
+        # Integers too large for the float64 mantissa are split in limbs
+        split = _int_fft_split(
+            _int_max_abs(volume),
+            _int_max_abs(kernel),
+            volume.shape,
+            kernel.shape,
+        )
+        if split == (0, 0, 0):
+            method = "direct"
+        elif split is not None:
+            return _int_fftconvolve(volume, kernel, mode, *split)
+
+    if method in ("fft", "oa"):
+        if method == "fft":
+            out = fftconvolve(volume, kernel, mode=mode)
+        else:
+            out = oaconvolve(volume, kernel, mode=mode)
         if result_type.kind in {"u", "i"}:
             out = cp.around(out)
         return out.astype(result_type)
     elif method == "direct":
         if volume.ndim > 1:
-            raise ValueError("Direct method is only implemented for 1D")
+            factors = None
+            if _use_separable(volume.shape, kernel.shape, mode):
+                factors = _separable_factors(
+                    kernel, cp.result_type(volume, kernel)
+                )
+            if factors is not None:
+                return _convolve_separable(volume, factors, mode)
+            return _convolution_cuda._convolve_nd(volume, kernel, mode)
 
         swapped_inputs = (mode != "valid") and (kernel.size > volume.size)
 
@@ -158,8 +219,74 @@ def convolve(
 
     else:
         raise ValueError(
-            "Acceptable method flags are 'auto'," " 'direct', or 'fft'."
+            "Acceptable method flags are 'auto', 'direct', 'fft', or 'oa'."
+        )
+
+
+def _convolve_separable(x, factors, mode):
+    """
+    Convolve `x` with the outer product of the 1-D `factors`, one axis at a
+    time.
+    """
+    for axis, f in enumerate(factors):
+        method = "direct" if f.size <= _BANK_DIRECT_MAX_TAPS else "fft"
+        x = cp.moveaxis(x, axis, -1)
+        lead = x.shape[:-1]
+        y = convolve_bank(
+            x.reshape(-1, x.shape[-1]), cp.asarray(f), mode, method=method
         )
+        x = cp.moveaxis(y.reshape(lead + (y.shape[-1],)), -1, axis)
+    return cp.ascontiguousarray(x)
+
+
+def _int_limbs(a, bits, n_limbs):
+    """
+    Split integers into `n_limbs` limbs of `bits` bits, least significant
+    first, as floats; the last limb carries the sign.
+    """
+    rest = _as_int64(a)
+    limbs = []
+    for _ in range(n_limbs - 1):
+        limbs.append((rest & ((1 << bits) - 1)).astype(np.float64))
+        rest = rest >> bits
+    limbs.append(rest.astype(np.float64))
+    return limbs
+
+
+def _int_fftconvolve(in1, in2, mode, bits, n1, n2):
+    """
+    Exact convolution of integer arrays with float64 FFTs, splitting them in
+    limbs small enough that every product of limbs convolves exactly.
+    Results wrap around as with the direct method.
+    """
+    s1 = np.array(in1.shape)
+    s2 = np.array(in2.shape)
+    shape = s1 + s2 - 1
+    fshape = [next_fast_len(int(d)) for d in shape]
+    fslice = tuple([slice(sz) for sz in shape])
+
+    spectra1 = [cp.fft.rfftn(x, fshape) for x in _int_limbs(in1, bits, n1)]
+    spectra2 = [cp.fft.rfftn(x, fshape) for x in _int_limbs(in2, bits, n2)]
+
+    # Sum the products of limbs of the same weight, and accumulate modulo
+    # 2**64; weights of 2**64 and above vanish.
+    ret = cp.zeros(tuple(shape), np.uint64)
+    for k in range(n1 + n2 - 1):
+        if bits * k >= 64:
+            break
+        sp = 0
+        for i in range(max(0, k - n2 + 1), min(k, n1 - 1) + 1):
+            sp = sp + spectra1[i] * spectra2[k - i]
+        part = cp.around(cp.fft.irfftn(sp, fshape)[fslice]).astype(np.int64)
+        ret += part.view(np.uint64) << np.uint64(bits * k)
+    ret = ret.view(np.int64).astype(cp.result_type(in1, in2))
+
+    if mode == "full":
+        return ret
+    elif mode == "same":
+        return cp.ascontiguousarray(_centered(ret, s1))
+    else:
+        return cp.ascontiguousarray(_centered(ret, s1 - s2 + 1))
 
 
 def fftconvolve(in1, in2, mode="full", axes=None):
@@ -291,7 +418,7 @@ def fftconvolve(in1, in2, mode="full", axes=None):
     shape[axes] = s1[axes] + s2[axes] - 1
 
     # Check that input sizes are compatible with 'valid' mode
-    if _inputs_swap_needed(mode, s1, s2):
+    if _inputs_swap_needed(mode, s1, s2, axes):
         # Convolution is commutative; order doesn't have any effect on output
         in1, s1, in2, s2 = in2, s2, in1, s1
 
@@ -324,6 +451,474 @@ def fftconvolve(in1, in2, mode="full", axes=None):
         )
 
 
+def _overlap_add(xp, y, pos, step):
+    """
+    Merge the blocks along axis `pos` of `y`, each of ``y.shape[pos + 1]``
+    samples and starting `step` samples after the previous one, into a
+    single axis.
+    """
+    n, block = y.shape[pos], y.shape[pos + 1]
+    before, after = y.shape[:pos], y.shape[pos + 2 :]
+    head = (slice(None),) * pos
+
+    out = xp.zeros(before + ((n + 1) * step,) + after, y.dtype)
+    view = out.reshape(before + (n + 1, step) + after)
+    view[head + (slice(0, n),)] = y[head + (slice(None), slice(0, step))]
+    view[head + (slice(1, None), slice(0, block - step))] += y[
+        head + (slice(None), slice(step, None))
+    ]
+    return out
+
+
+def _oaconvolve_full(xp, a, k, axes, complex_result):
+    """Full convolution over `axes` of `a`, split in blocks, with `k`."""
+    if complex_result:
+        fwd, inv = xp.fft.fftn, xp.fft.ifftn
+    else:
+        fwd, inv = xp.fft.rfftn, xp.fft.irfftn
+
+    # Step and number of blocks of every axis of `a` split in blocks
+    blocks = {}
+    fshape = []
+    for ax in axes:
+        s_a, s_k = a.shape[ax], k.shape[ax]
+        block = _oa_block_len(s_a, s_k)
+        if block is None:
+            fshape.append(next_fast_len(s_a + s_k - 1))
+        else:
+            step = block - s_k + 1
+            blocks[ax] = (step, _iDivUp(s_a, step))
+            fshape.append(block)
+
+    full = [max(s_a, s_k) for s_a, s_k in zip(a.shape, k.shape)]
+    for ax in axes:
+        full[ax] = a.shape[ax] + k.shape[ax] - 1
+    trim = tuple(slice(d) for d in full)
+
+    if not blocks:
+        sp = fwd(a, fshape, axes=axes) * fwd(k, fshape, axes=axes)
+        return inv(sp, fshape, axes=axes)[trim]
+
+    def split(shape, counts):
+        # Insert an axis counting the blocks in front of every split axis
+        out = []
+        for ax, d in enumerate(shape):
+            if ax in blocks:
+                out.append(counts[ax])
+            out.append(d)
+        return tuple(out)
+
+    faxes = [ax + sum(1 for b in blocks if b <= ax) for ax in axes]
+    kf = fwd(k, fshape, axes=axes)
+    kf = kf.reshape(split(kf.shape, dict.fromkeys(blocks, 1)))
+
+    # Transform a bounded number of blocks along the first split axis at a
+    # time, and add their contributions to the output
+    c = min(blocks)
+    step_c, n_c = blocks[c]
+    per_block = _prod(fshape) * _prod(
+        full[ax] for ax in range(a.ndim) if ax not in axes
+    )
+    per_block *= _prod(n for ax, (_, n) in blocks.items() if ax != c)
+    chunk = max(1, _OA_CHUNK_ELEMENTS // per_block)
+
+    ret = None
+    for j0 in range(0, n_c, chunk):
+        counts = {ax: n for ax, (_, n) in blocks.items()}
+        counts[c] = min(chunk, n_c - j0)
+        seg = a[(slice(None),) * c + (slice(j0 * step_c, None),)]
+        seg = seg[(slice(None),) * c + (slice(counts[c] * step_c),)]
+
+        # Zero pad every split axis to a whole number of blocks
+        shape = list(seg.shape)
+        for ax, (step, _) in blocks.items():
+            shape[ax] = counts[ax] * step
+        buf = xp.zeros(shape, a.dtype)
+        buf[tuple(slice(d) for d in seg.shape)] = seg
+        for ax, (step, _) in blocks.items():
+            shape[ax] = step
+        buf = buf.reshape(split(shape, counts))
+
+        y = inv(fwd(buf, fshape, axes=faxes) * kf, fshape, axes=faxes)
+        for ax in sorted(blocks, reverse=True):
+            pos = ax + sum(1 for b in blocks if b < ax)
+            y = _overlap_add(xp, y, pos, blocks[ax][0])
+
+        if ret is None:
+            shape = list(y.shape)
+            shape[c] = (n_c + 1) * step_c
+            ret = xp.zeros(shape, y.dtype)
+        start = j0 * step_c
+        ret[(slice(None),) * c + (slice(start, start + y.shape[c]),)] += y
+
+    return ret[trim]
+
+
+def oaconvolve(in1, in2, mode="full", axes=None):
+    """Convolve two N-dimensional arrays using the overlap-add method.
+
+    Convolve `in1` and `in2` using the overlap-add method, with
+    the output size determined by the `mode` argument.
+
+    This is generally much faster than `convolve` for large arrays (n > ~500),
+    and generally much faster than `fftconvolve` when one array is much
+    larger than the other, but can be slower when only a few output values are
+    needed or when the arrays are very similar in shape, and can only
+    output float arrays (int or object array inputs will be cast to float).
+
+    Parameters
+    ----------
+    in1 : array_like
+        First input.
+    in2 : array_like
+        Second input. Should have the same number of dimensions as `in1`.
+    mode : str {'full', 'valid', 'same'}, optional
+        A string indicating the size of the output:
+
+        ``full``
+           The output is the full discrete linear convolution
+           of the inputs. (Default)
+        ``valid``
+           The output consists only of those elements that do not
+           rely on the zero-padding. In 'valid' mode, either `in1` or `in2`
+           must be at least as large as the other in every dimension.
+        ``same``
+           The output is the same size as `in1`, centered
+           with respect to the 'full' output.
+    axes : int or array_like of ints or None, optional
+        Axes over which to compute the convolution.
+        The default is over all axes. The other axes are independent
+        batches and are broadcast as in `fftconvolve`.
+
+    Returns
+    -------
+    out : array
+        An N-dimensional array containing a subset of the discrete linear
+        convolution of `in1` with `in2`.
+
+    See Also
+    --------
+    convolve : Uses the direct convolution or FFT convolution algorithm
+               depending on which is faster.
+    fftconvolve : An implementation of convolution using FFT.
+
+    Notes
+    -----
+    The larger input is split along every axis where the other input is
+    less than half as long into blocks whose FFT length minimizes the work
+    per output sample. The spectrum of the smaller input is computed once
+    at the block length and reused for every block. Blocks are transformed
+    a bounded number at a time, so the complex temporaries scale with the
+    block length rather than with the length of the larger input.
+
+    NumPy inputs are convolved on the host with `numpy.fft`, with the same
+    block sizes.
+
+    References
+    ----------
+    .. [1] Wikipedia, "Overlap-add_method".
+           https://en.wikipedia.org/wiki/Overlap-add_method
+    .. [2] Richard G. Lyons. Understanding Digital Signal Processing,
+           Third Edition, 2011. Chapter 13.10.
+           ISBN 13: 978-0137-02741-5
+
+    Examples
+    --------
+    Convolve a 100,000 sample signal with a 512-sample filter.
+
+    >>> import cusignal
+    >>> import cupy as cp
+    >>> sig = cp.random.randn(100000)
+    >>> filt = cusignal.firwin(512, 0.01)
+    >>> fsig = cusignal.oaconvolve(sig, filt)
+
+    Filter 64 channels at once:
+
+    >>> sigs = cp.random.randn(64, 100000)
+    >>> fsigs = cusignal.oaconvolve(sigs, filt[None, :], axes=-1)
+
+    """
+    xp = cp.get_array_module(in1, in2)
+    in1 = xp.asarray(in1)
+    in2 = xp.asarray(in2)
+    noaxes = axes is None
+
+    if mode not in _modedict:
+        raise ValueError(
+            "acceptable mode flags are 'valid', 'same', or 'full'"
+        )
+
+    if in1.ndim == in2.ndim == 0:  # scalar inputs
+        return in1 * in2
+    elif in1.ndim != in2.ndim:
+        raise ValueError("in1 and in2 should have the same dimensionality")
+    elif in1.size == 0 or in2.size == 0:  # empty arrays
+        return xp.array([])
+
+    _, axes = _init_nd_shape_and_axes_sorted(in1, shape=None, axes=axes)
+    if not noaxes and not axes.size:
+        raise ValueError("when provided, axes cannot be empty")
+    axes = [int(ax) for ax in axes]
+
+    s1 = np.array(in1.shape)
+    s2 = np.array(in2.shape)
+    other_axes = np.setdiff1d(np.arange(in1.ndim), axes)
+    if not np.all(
+        (s1[other_axes] == s2[other_axes])
+        | (s1[other_axes] == 1)
+        | (s2[other_axes] == 1)
+    ):
+        raise ValueError(
+            "incompatible shapes for in1 and in2:"
+            " {0} and {1}".format(in1.shape, in2.shape)
+        )
+
+    if _inputs_swap_needed(mode, s1, s2, axes):
+        # Convolution is commutative; order doesn't have any effect on output
+        in1, s1, in2, s2 = in2, s2, in1, s1
+
+    complex_result = in1.dtype.kind == "c" or in2.dtype.kind == "c"
+
+    # Split the larger input in blocks
+    if _prod(s1[axes]) >= _prod(s2[axes]):
+        ret = _oaconvolve_full(xp, in1, in2, axes, complex_result)
+    else:
+        ret = _oaconvolve_full(xp, in2, in1, axes, complex_result)
+
+    if mode == "full":
+        return ret
+
+    if mode == "same":
+        return _centered(ret, s1)
+
+    shape = np.array(ret.shape)
+    shape[axes] = s1[axes] - s2[axes] + 1
+    return _centered(ret, shape)
+
+
+# Bound on the number of elements of the workspace of `Convolver.apply`
+_CONVOLVER_CHUNK_ELEMENTS = 1 << 24
+
+
+class Convolver(object):
+    """
+    FFT convolution with a fixed kernel, for many inputs of the same shape.
+
+    The spectrum of the kernel is computed once, at the FFT length
+    `next_fast_len` chooses for the full convolution, so each call costs
+    two transforms instead of the three of `fftconvolve`. The zero padded
+    input is staged in a workspace that is kept between calls.
+
+    Parameters
+    ----------
+    h : array_like
+        The kernel.
+    input_length : int or sequence of ints
+        Length of the inputs along each of `axes`.
+    mode : str {'full', 'valid', 'same'}, optional
+        A string indicating the size of the output, as in `fftconvolve`,
+        with the inputs as `in1` and `h` as `in2`. Default is 'full'.
+    axes : int or array_like of ints or None, optional
+        Axes of `h` and of the inputs over which to convolve. The default
+        is over all axes. Along the other axes `h` must have length 1 or
+        the length of the inputs.
+
+    Attributes
+    ----------
+    output_shape : tuple of ints
+        Length of the outputs along each of `axes`.
+
+    See Also
+    --------
+    fftconvolve, oaconvolve
+
+    Notes
+    -----
+    Real inputs and kernels use real transforms. The kernel spectrum is
+    computed once per array module and precision of the inputs; NumPy
+    inputs are convolved on the host with `numpy.fft`. A `Convolver` keeps
+    a workspace between calls and must not be shared between threads.
+
+    Examples
+    --------
+    Pulse compression of many received pulses with one matched filter:
+
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> chirp = cusignal.chirp(cp.arange(512) / 512e3, 0, 512e-6, 100e3)
+    >>> mf = cusignal.Convolver(chirp[::-1].conj(), 8192, mode="same")
+    >>> y = mf(cp.random.randn(8192))
+    >>> Y = mf.apply(cp.random.randn(256, 8192))  # 256 pulses at once
+
+    """
+
+    def __init__(self, h, input_length, mode="full", axes=None):
+        if mode not in _modedict:
+            raise ValueError(
+                "acceptable mode flags are 'valid', 'same', or 'full'"
+            )
+        h = cp.get_array_module(h).asarray(h)
+        if h.ndim == 0:
+            raise ValueError("h must have at least one dimension")
+
+        noaxes = axes is None
+        _, axes = _init_nd_shape_and_axes_sorted(h, shape=None, axes=axes)
+        if not noaxes and not axes.size:
+            raise ValueError("when provided, axes cannot be empty")
+        axes = tuple(int(ax) for ax in axes)
+
+        n = np.atleast_1d(np.asarray(input_length, dtype=np.int64))
+        if n.size == 1:
+            n = np.repeat(n, len(axes))
+        if n.shape != (len(axes),) or (n < 1).any():
+            raise ValueError(
+                "input_length must be a positive length for each axis"
+            )
+        n = tuple(int(v) for v in n)
+        k = tuple(h.shape[ax] for ax in axes)
+        # Raises if neither input is at least as large as the other
+        _inputs_swap_needed(mode, n, k)
+
+        full = [a + b - 1 for a, b in zip(n, k)]
+        if mode == "full":
+            out = full
+        elif mode == "same":
+            out = list(n)
+        else:
+            out = [abs(a - b) + 1 for a, b in zip(n, k)]
+
+        self.h = h
+        self.input_length = n
+        self.mode = mode
+        self.axes = axes
+        self.output_shape = tuple(out)
+        self._fshape = [next_fast_len(d) for d in full]
+        self._crop = [
+            slice((f - o) // 2, (f - o) // 2 + o) for f, o in zip(full, out)
+        ]
+        self._spectra = {}
+        self._work = None
+
+    def _spectrum(self, xp, dtype):
+        key = (xp.__name__, str(dtype))
+        sp = self._spectra.get(key)
+        if sp is None:
+            h = cp.asnumpy(self.h) if xp is np else cp.asarray(self.h)
+            h = h.astype(dtype)
+            fwd = xp.fft.fftn if dtype.kind == "c" else xp.fft.rfftn
+            sp = fwd(h, self._fshape, axes=self.axes)
+            self._spectra[key] = sp
+        return sp
+
+    def _workspace(self, xp, shape, dtype):
+        # Only the input region is ever written, so the padding stays zero
+        work = self._work
+        if (
+            work is None
+            or work.shape != shape
+            or work.dtype != dtype
+            or cp.get_array_module(work) is not xp
+        ):
+            work = xp.zeros(shape, dtype)
+            self._work = work
+        return work
+
+    def _convolve(self, x, lead):
+        xp = cp.get_array_module(x)
+        axes = [ax + lead for ax in self.axes]
+        if tuple(x.shape[ax] for ax in axes) != self.input_length:
+            raise ValueError(
+                "inputs must have length {} along axes {}".format(
+                    self.input_length, self.axes
+                )
+            )
+
+        dtype = _float_result_type(x.dtype, self.h.dtype)
+        sp = self._spectrum(xp, dtype)
+
+        shape = list(x.shape)
+        for ax, f in zip(axes, self._fshape):
+            shape[ax] = f
+        work = self._workspace(xp, tuple(shape), dtype)
+        work[tuple(slice(d) for d in x.shape)] = x
+
+        if dtype.kind == "c":
+            y = xp.fft.ifftn(xp.fft.fftn(work, axes=axes) * sp, axes=axes)
+        else:
+            y = xp.fft.irfftn(
+                xp.fft.rfftn(work, axes=axes) * sp, self._fshape, axes=axes
+            )
+
+        crop = [slice(None)] * y.ndim
+        for ax, sl in zip(axes, self._crop):
+            crop[ax] = sl
+        return xp.ascontiguousarray(y[tuple(crop)])
+
+    def __call__(self, x):
+        """
+        Convolve one input with the kernel.
+
+        Parameters
+        ----------
+        x : array_like
+            Input with the dimensions of `h`, of length `input_length`
+            along `axes`.
+
+        Returns
+        -------
+        y : ndarray
+            The convolution, of length `output_shape` along `axes`.
+        """
+        xp = cp.get_array_module(x)
+        x = xp.asarray(x)
+        if x.ndim != self.h.ndim:
+            raise ValueError("x must have the dimensions of h; use apply")
+        return self._convolve(x, 0)
+
+    def apply(self, X):
+        """
+        Convolve a batch of inputs with the kernel.
+
+        Parameters
+        ----------
+        X : array_like
+            Inputs stacked along one or more leading axes in front of the
+            dimensions of `h`.
+
+        Returns
+        -------
+        Y : ndarray
+            The convolutions, stacked as in `X`.
+
+        Notes
+        -----
+        The batch is transformed a bounded number of inputs at a time, so
+        the workspace does not grow with the size of the batch.
+        """
+        xp = cp.get_array_module(X)
+        X = xp.asarray(X)
+        lead = X.ndim - self.h.ndim
+        if lead < 1:
+            raise ValueError("X must have a batch axis in front of h")
+        if X.shape[0] == 0:
+            return self._convolve(X, lead)
+
+        per_item = _prod(X.shape[1:]) * _prod(self._fshape) // max(
+            1, _prod(self.input_length)
+        )
+        chunk = max(1, _CONVOLVER_CHUNK_ELEMENTS // max(1, per_item))
+        if chunk >= X.shape[0]:
+            return self._convolve(X, lead)
+
+        Y = None
+        for start in range(0, X.shape[0], chunk):
+            y = self._convolve(X[start : start + chunk], lead)
+            if Y is None:
+                Y = xp.empty((X.shape[0],) + y.shape[1:], y.dtype)
+            Y[start : start + chunk] = y
+        return Y
+
+
 def convolve2d(
     in1,
     in2,
@@ -370,6 +965,12 @@ def convolve2d(
         A 2-dimensional array containing a subset of the discrete linear
         convolution of `in1` with `in2`.
 
+    Notes
+    -----
+    Kernels of rank one, such as Gaussian or box kernels, are applied as a
+    pass along each axis when that is predicted to be faster; see
+    `convolve`.
+
     Examples
     --------
     Compute the gradient of an image by 2D convolution with a complex Scharr
@@ -410,6 +1011,30 @@ def convolve2d(
     if _inputs_swap_needed(mode, in1.shape, in2.shape):
         in1, in2 = in2, in1
 
+    # Rank-one kernels are applied as two 1-D passes over the input padded
+    # as the boundary condition requires
+    factors = None
+    if _use_separable(in1.shape, in2.shape, mode):
+        factors = _separable_factors(in2, cp.result_type(in1, in2))
+    if factors is not None:
+        if mode == "full":
+            pad = [(k - 1, k - 1) for k in in2.shape]
+        elif mode == "same":
+            pad = [(k // 2, (k - 1) // 2) for k in in2.shape]
+        else:
+            pad = [(0, 0), (0, 0)]
+        bval = _bvalfromboundary(boundary)
+        if bval == PAD:
+            fill = 0 if fillvalue is None else fillvalue
+            padded = cp.pad(in1, pad, "constant", constant_values=fill)
+        elif bval == CIRCULAR:
+            padded = cp.pad(in1, pad, "wrap")
+        elif bval == REFLECT:
+            padded = cp.pad(in1, pad, "symmetric")
+        else:
+            raise ValueError("Incorrect boundary value.")
+        return _convolve_separable(padded, factors, "valid")
+
     return _convolution_cuda._convolve2d(
         in1,
         in2,
@@ -449,15 +1074,17 @@ def choose_conv_method(in1, in2, mode="full", measure=False):
            The output is the same size as `in1`, centered
            with respect to the 'full' output.
     measure : bool, optional
-        If True, run and time the convolution of `in1` and `in2` with both
-        methods and return the fastest. If False (default), predict the fastest
-        method using precomputed values.
+        If True, run and time the convolution of `in1` and `in2` with every
+        method and return the fastest. Measurements are memoized per
+        device, shapes, data types and `mode`, so that each GPU is timed
+        on its own. If False (default), predict the fastest method with
+        the cost model; see `get_cost_model`.
 
     Returns
     -------
     method : str
         A string indicating which convolution method is fastest, either
-        'direct' or 'fft'
+        'direct', 'fft' or 'oa'
     times : dict, optional
         A dictionary containing the times (in seconds) needed for each method.
         This value is only returned if ``measure=True``.
@@ -467,6 +1094,21 @@ def choose_conv_method(in1, in2, mode="full", measure=False):
     convolve
     correlate
 
+    Notes
+    -----
+    The prediction counts the multiply-accumulates of the direct method and
+    the FFT operations of the Fourier and overlap-add methods, and converts
+    them to seconds with the constants of the cost model. Overlap-add wins
+    when one input is much longer than the other. The constants can be
+    fitted to the current device with `calibrate_cost_model` and saved
+    with `save_cost_model`, so that later processes load them.
+
+    Integer inputs whose convolution could exceed the precision of float64,
+    less headroom for the rounding error of transforms of their size, are
+    convolved exactly by the Fourier method, which then splits them in
+    limbs of fewer bits and transforms each; the prediction counts the
+    extra transforms.
+
     Examples
     --------
     Estimate the fastest method for a given input:
@@ -477,7 +1119,7 @@ def choose_conv_method(in1, in2, mode="full", measure=False):
     >>> b = cp.random.randn(1000000)
     >>> method = cusignal.choose_conv_method(a, b, mode='same')
     >>> method
-    'fft'
+    'direct'
 
     This can then be applied to other arrays of the same dtype and shape:
 
@@ -494,14 +1136,24 @@ def choose_conv_method(in1, in2, mode="full", measure=False):
     kernel = cp.asarray(in2)
 
     if measure:
-        times = {}
-        for method in ("fft", "direct"):
-            times[method] = _timeit_fast(
-                lambda: convolve(volume, kernel, mode=mode, method=method)
-            )
-
-        chosen_method = "fft" if times["fft"] < times["direct"] else "direct"
-        return chosen_method, times
+        key = (
+            cp.cuda.Device().id,
+            volume.shape,
+            kernel.shape,
+            str(volume.dtype),
+            str(kernel.dtype),
+            mode,
+        )
+        measured = _conv_method_cache.get(key)
+        if measured is None:
+            times = {}
+            for method in ("fft", "oa", "direct"):
+                times[method] = _timeit_fast(
+                    lambda: convolve(volume, kernel, mode=mode, method=method)
+                )
+            measured = (min(times, key=times.get), times)
+            _conv_method_cache.put(key, measured)
+        return measured[0], dict(measured[1])
 
     # fftconvolve doesn't support complex256
     fftconv_unsup = "complex256" if sys.maxsize > 2 ** 32 else "complex192"
@@ -516,47 +1168,260 @@ def choose_conv_method(in1, in2, mode="full", measure=False):
         max_value = int(cp.abs(volume).max()) * int(cp.abs(kernel).max())
         max_value *= int(min(volume.size, kernel.size))
         if max_value > 2 ** cp.finfo("float").nmant - 1:
+            if not _numeric_arrays([volume, kernel], kinds="ui"):
+                return "direct"
+
+    if _numeric_arrays([volume, kernel], kinds="ui"):
+        # Integer results stay exact with FFTs of limbs of the inputs,
+        # at the cost of more transforms
+        split = _int_fft_split(
+            _int_max_abs(volume),
+            _int_max_abs(kernel),
+            volume.shape,
+            kernel.shape,
+        )
+        if split == (0, 0, 0):
             return "direct"
+        if split is not None:
+            bits, n1, n2 = split
+            inverse = min(n1 + n2 - 1, _iDivUp(64, bits))
+            costs = _conv_costs(volume, kernel, mode)
+            c = get_cost_model()
+            costs["fft"] = c["fft_overhead"] + (
+                costs["fft"] - c["fft_overhead"]
+            ) * (n1 + n2 + inverse) / 3.0
+            costs["oa"] = float("inf")
+            return min(costs, key=costs.get)
 
     if _numeric_arrays([volume, kernel], kinds="b"):
         return "direct"
 
     if _numeric_arrays([volume, kernel]):
-        if _fftconv_faster(volume, kernel, mode):
-            return "fft"
+        costs = _conv_costs(volume, kernel, mode)
+        return min(costs, key=costs.get)
 
     return "direct"
 
 
+def _volterra2_components(K, eps, scale=1.0):
+    """
+    Rank-one components ``(weight, (a, b))`` of a second-order Volterra
+    kernel, whose sum of ``weight * outer(a, b)`` is the kernel symmetrized.
+    Components below the rank tolerance of the kernel are dropped.
+    """
+    M = K.shape[0]
+    Ks = (K + K.T) / 2
+    if not np.iscomplexobj(Ks):
+        lam, V = np.linalg.eigh(Ks)
+        tol = np.abs(lam).max(initial=0) * M * eps
+        return [
+            (scale * w, (v, v)) for w, v in zip(lam, V.T) if abs(w) > tol
+        ]
+    U, s, Vh = np.linalg.svd(Ks)
+    tol = s.max(initial=0) * M * eps
+    return [
+        (scale * w, (a, b)) for w, a, b in zip(s, U.T, Vh) if w > tol
+    ]
+
+
+def _volterra3_components(K, eps):
+    """
+    Rank-one components ``(weight, (a, b, c))`` of a third-order Volterra
+    kernel, from the SVD of its unfolding along the first axis and the
+    second-order components of each right singular vector.
+    """
+    M = K.shape[0]
+    U, s, Vh = np.linalg.svd(K.reshape(M, M * M), full_matrices=False)
+    tol = s.max(initial=0) * M * M * eps
+    components = []
+    for w, u, v in zip(s, U.T, Vh):
+        if w <= tol:
+            break
+        for weight, (a, b) in _volterra2_components(v.reshape(M, M), eps, w):
+            components.append((weight, (u, a, b)))
+    return components
+
+
+def _pack_components(components, max_kernels):
+    """
+    Group components so that each group convolves with at most
+    `max_kernels` distinct 1-D kernels. Returns the kernels, the indices of
+    the kernels of each component and the weights of every group.
+    """
+    groups = []
+    kernels, ids, index, weights = [], {}, [], []
+    for weight, vecs in components:
+        new = {id(v) for v in vecs} - set(ids)
+        if kernels and len(kernels) + len(new) > max_kernels:
+            groups.append((kernels, index, weights))
+            kernels, ids, index, weights = [], {}, [], []
+        for v in vecs:
+            if id(v) not in ids:
+                ids[id(v)] = len(kernels)
+                kernels.append(v)
+        index.append([ids[id(v)] for v in vecs])
+        weights.append(weight)
+    if kernels:
+        groups.append((kernels, index, weights))
+    return [(np.array(k), np.array(i), np.array(w)) for k, i, w in groups]
+
+
+def _volterra_lowrank(xp, x, components, mode, method, n_out, dtype):
+    B = x.shape[0]
+    out = xp.zeros((B, n_out), dtype)
+    max_kernels = max(1, _VOLTERRA_CHUNK_ELEMENTS // max(1, B * n_out))
+    for kernels, index, weights in _pack_components(components, max_kernels):
+        conv = convolve_bank(
+            x, xp.asarray(kernels, dtype), mode, method=method
+        ).reshape(B, len(kernels), n_out)
+        y = conv[:, index[:, 0]]
+        for p in range(1, index.shape[1]):
+            y = y * conv[:, index[:, p]]
+        out += xp.einsum("t,btn->bn", xp.asarray(weights, dtype), y)
+    return out
+
+
+def _volterra_direct(xp, x, K, mode):
+    M = K.shape[0]
+    if mode == "full":
+        x = xp.pad(x, ((0, 0), (M - 1, M - 1)), "constant")
+    elif mode == "same":
+        x = xp.pad(x, ((0, 0), (M // 2, (M - 1) // 2)), "constant")
+    B, P = x.shape
+    n_out = P - M + 1
+
+    if xp is cp:
+        # Valid outputs of the signals laid end to end never straddle two
+        # of them, so the whole batch is one launch
+        if K.ndim == 2:
+            y = _convolution_cuda._convolve1d2o(x.ravel(), K, "valid")
+        else:
+            y = _convolution_cuda._convolve1d3o(x.ravel(), K, "valid")
+        out = cp.zeros(B * P, y.dtype)
+        out[: y.size] = y
+        return out.reshape(B, P)[:, :n_out]
+
+    # Lagged copies of the signals, X[b, n, i] = x[b, n + M - 1 - i]
+    x = np.ascontiguousarray(x)
+    X = as_strided(
+        x, (B, n_out, M), (x.strides[0], x.strides[1], x.strides[1])
+    )[..., ::-1]
+    if K.ndim == 2:
+        return ((X @ K) * X).sum(axis=-1)
+    out = np.zeros((B, n_out), np.result_type(x, K))
+    for i in range(M):
+        out += X[..., i] * ((X @ K[i]) * X).sum(axis=-1)
+    return out
+
+
+def _volterra(in1, in2, mode, method, order):
+    if mode not in ("full", "same", "valid"):
+        raise ValueError(
+            "acceptable mode flags are 'valid', 'same', or 'full'"
+        )
+    if method not in ("auto", "direct", "fft"):
+        raise ValueError(
+            "Acceptable method flags are 'auto', 'direct', or 'fft'."
+        )
+
+    xp = cp.get_array_module(in1, in2)
+    signal = xp.asarray(in1)
+    kernel = xp.asarray(in2)
+    if kernel.ndim != order or len(set(kernel.shape)) != 1:
+        raise ValueError(
+            "in2 must be a {}-dimensional kernel of equal sides".format(order)
+        )
+    if signal.ndim < 1:
+        raise ValueError("in1 must have at least one dimension")
+
+    M = kernel.shape[0]
+    lead, N = signal.shape[:-1], signal.shape[-1]
+    if mode == "valid" and N < M:
+        raise ValueError(
+            "in1 must be at least as long as in2 in 'valid' mode"
+        )
+    x = signal.reshape(-1, N)
+    B = x.shape[0]
+    n_out = {"full": N + M - 1, "same": N, "valid": N - M + 1}[mode]
+
+    result_type = xp.result_type(signal, kernel)
+    if method == "auto" and result_type.kind in "bui":
+        method = "direct"
+
+    if method != "direct":
+        dtype = _float_result_type(result_type)
+        host = cp.asnumpy(kernel).astype(np.result_type(dtype, np.float64))
+        eps = np.finfo(dtype).eps
+        if order == 2:
+            components = _volterra2_components(host, eps)
+        else:
+            components = _volterra3_components(host, eps)
+
+        if method == "auto":
+            # Direct sums against convolutions with the distinct kernels
+            # of the components
+            n_kernels = len({id(v) for _, vecs in components for v in vecs})
+            lowrank = min(
+                _bank_costs(
+                    B, n_kernels, N, M, B * n_kernels, n_out
+                ).values()
+            )
+            c = get_cost_model()
+            direct = (
+                c["conv_direct_overhead"]
+                + c["conv_direct_per_mac"] * B * n_out * M ** order
+            )
+            method = "direct" if direct < lowrank else "auto"
+
+    if method == "direct":
+        out = _volterra_direct(xp, x, kernel, mode)
+    else:
+        out = _volterra_lowrank(
+            xp,
+            xp.asarray(x, dtype),
+            components,
+            mode,
+            method,
+            n_out,
+            dtype,
+        )
+        if result_type.kind in "bui":
+            out = xp.around(out.real)
+        out = out.astype(result_type)
+    return out.reshape(lead + (n_out,))
+
+
 def convolve1d2o(
     in1,
     in2,
     mode="valid",
-    method="direct",
+    method="auto",
 ):
     """
-    Convolve a 1-dimensional arrays with a 2nd order filter.
+    Convolve 1-dimensional arrays with a 2nd order filter.
     This results in a second order convolution.
 
     Convolve `in1` and `in2`, with the output size determined by the
-    `mode` argument.
+    `mode` argument. The output is
+    ``y[n] = sum(in2[i, j] * in1[n - i] * in1[n - j])`` over the indices of
+    `in2`.
 
     Parameters
     ----------
     in1 : array_like
-        First input.
+        Signal of length N, or signals stacked along the leading axes, which
+        are convolved separately.
     in2 : array_like
-        Second input. Should have the same number of dimensions as `in1`.
+        Second order kernel, of shape ``(M, M)``.
     mode : str {'full', 'valid', 'same'}, optional
         A string indicating the size of the output:
 
         ``full``
-           The output is the full discrete linear convolution
-           of the inputs. (Default)
+           The output is the full discrete convolution of the inputs.
         ``valid``
            The output consists only of those elements that do not
-           rely on the zero-padding. In 'valid' mode, either `in1` or `in2`
-           must be at least as large as the other in every dimension.
+           rely on the zero-padding, and `in1` must be at least as long as
+           `in2`. (Default)
         ``same``
            The output is the same size as `in1`, centered
            with respect to the 'full' output.
@@ -567,17 +1432,20 @@ def convolve1d2o(
            The convolution is determined directly from sums, the definition of
            convolution.
         ``fft``
-           The Fourier Transform is used to perform the convolution by calling
-           `fftconvolve`.
+           The kernel is decomposed into rank-one components, and the
+           convolutions of the signals with their factors are computed with
+           the Fourier Transform.
         ``auto``
-           Automatically chooses direct or Fourier method based on an estimate
-           of which is faster (default).
+           Chooses between the direct sums and the convolutions with the
+           rank-one components, directly or with the Fourier Transform, from
+           an estimate of which is faster; integer inputs always use the
+           direct method (default).
 
     Returns
     -------
     out : ndarray
-        A 1-dimensional array containing a subset of the discrete linear
-        convolution of `in1` with `in2`.
+        An array of the leading shape of `in1` containing a subset of the
+        discrete second order convolution of `in1` with `in2`.
 
     See Also
     --------
@@ -585,6 +1453,16 @@ def convolve1d2o(
     convolve1d2o
     convolve1d3o
 
+    Notes
+    -----
+    The symmetric part of the kernel, which is all the output depends on,
+    is diagonalized, so that
+    ``y[n] = sum(w[r] * (in1 * v[r])[n] ** 2)`` over its eigenpairs, or
+    over the singular triplets of a complex kernel. Components below the
+    rank tolerance are dropped, so low-rank kernels only cost a few 1-D
+    convolutions per signal, computed with `convolve_bank`. NumPy inputs
+    are convolved on the host.
+
     Examples
     --------
     Convolution of a 2nd order filter on a 1d signal
@@ -594,62 +1472,43 @@ def convolve1d2o(
     >>> d = 50
     >>> a = np.random.uniform(-1,1,(200))
     >>> b = np.random.uniform(-1,1,(d,d))
-    >>> c = cs.convolve1d3o(a,b)
+    >>> c = cs.convolve1d2o(a,b)
 
     """
-
-    signal = cp.asarray(in1)
-    kernel = cp.asarray(in2)
-
-    if mode == "valid" and signal.shape[0] < kernel.shape[0]:
-        # Convolution is commutative
-        # order doesn't have any effect on output
-        signal, kernel = kernel, signal
-
-    if mode in ["same", "full"]:
-        raise NotImplementedError(
-            "Mode == {} not implemented".format(
-                mode
-            )
-        )
-
-    if method == "direct":
-        return _convolution_cuda._convolve1d2o(
-            signal, kernel, mode
-        )
-    else:
-        raise NotImplementedError("Only Direct method implemented")
+    return _volterra(in1, in2, mode, method, 2)
 
 
 def convolve1d3o(
     in1,
     in2,
     mode="valid",
-    method="direct",
+    method="auto",
 ):
     """
-    Convolve a 1-dimensional array with a 3rd order filter.
-    This results in a second order convolution.
+    Convolve 1-dimensional arrays with a 3rd order filter.
+    This results in a third order convolution.
 
     Convolve `in1` and `in2`, with the output size determined by the
-    `mode` argument.
+    `mode` argument. The output is
+    ``y[n] = sum(in2[i, j, k] * in1[n - i] * in1[n - j] * in1[n - k])``
+    over the indices of `in2`.
 
     Parameters
     ----------
     in1 : array_like
-        First input.
+        Signal of length N, or signals stacked along the leading axes, which
+        are convolved separately.
     in2 : array_like
-        Second input. Should have the same number of dimensions as `in1`.
+        Third order kernel, of shape ``(M, M, M)``.
     mode : str {'full', 'valid', 'same'}, optional
         A string indicating the size of the output:
 
         ``full``
-           The output is the full discrete linear convolution
-           of the inputs. (Default)
+           The output is the full discrete convolution of the inputs.
         ``valid``
            The output consists only of those elements that do not
-           rely on the zero-padding. In 'valid' mode, either `in1` or `in2`
-           must be at least as large as the other in every dimension.
+           rely on the zero-padding, and `in1` must be at least as long as
+           `in2`. (Default)
         ``same``
            The output is the same size as `in1`, centered
            with respect to the 'full' output.
@@ -660,17 +1519,20 @@ def convolve1d3o(
            The convolution is determined directly from sums, the definition of
            convolution.
         ``fft``
-           The Fourier Transform is used to perform the convolution by calling
-           `fftconvolve`.
+           The kernel is decomposed into rank-one components, and the
+           convolutions of the signals with their factors are computed with
+           the Fourier Transform.
         ``auto``
-           Automatically chooses direct or Fourier method based on an estimate
-           of which is faster (default).
+           Chooses between the direct sums and the convolutions with the
+           rank-one components, directly or with the Fourier Transform, from
+           an estimate of which is faster; integer inputs always use the
+           direct method (default).
 
     Returns
     -------
     out : ndarray
-        A 1-dimensional array containing a subset of the discrete linear
-        convolution of `in1` with `in2`.
+        An array of the leading shape of `in1` containing a subset of the
+        discrete third order convolution of `in1` with `in2`.
 
     See Also
     --------
@@ -678,6 +1540,15 @@ def convolve1d3o(
     convolve1d2o
     convolve1d3o
 
+    Notes
+    -----
+    The kernel is unfolded to an ``(M, M * M)`` matrix whose singular
+    vectors are in turn decomposed as in `convolve1d2o`, giving components
+    that are products of three 1-D convolutions. Their number is at most
+    ``M ** 2``, against ``M ** 3`` products per output sample for the
+    direct sums, and far fewer for low-rank kernels. NumPy inputs are
+    convolved on the host.
+
     Examples
     --------
     Convolution of a 3rd order filter on a 1d signal
@@ -690,25 +1561,4 @@ def convolve1d3o(
     >>> c = cs.convolve1d3o(a,b)
 
     """
-
-    signal = cp.asarray(in1)
-    kernel = cp.asarray(in2)
-
-    if mode == "valid" and signal.shape[0] < kernel.shape[0]:
-        # Convolution is commutative
-        # order doesn't have any effect on output
-        signal, kernel = kernel, signal
-
-    if mode in ["same", "full"]:
-        raise NotImplementedError(
-            "Mode == {} not implemented".format(
-                mode
-            )
-        )
-
-    if method == "direct":
-        return _convolution_cuda._convolve1d3o(
-            signal, kernel, mode
-        )
-    else:
-        raise NotImplementedError("Only Direct method implemented")
+    return _volterra(in1, in2, mode, method, 3)
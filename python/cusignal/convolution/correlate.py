@@ -12,20 +12,231 @@
 # limitations under the License.
 
 import cupy as cp
+import numpy as np
 
 from . import _convolution_cuda
 
+from ..utils._caches import _cupy_kernel_cache
+from ..utils.cost_model import _fft_work, get_cost_model
+from ..utils.fftpack_helper import next_fast_len
 from .convolve import convolve
-from .convolution_utils import _reverse_and_conj, _inputs_swap_needed
+from .convolution_utils import (
+    _float_ctypes,
+    _float_result_type,
+    _iDivUp,
+    _inputs_swap_needed,
+    _oa_block_len,
+    _reverse_and_conj,
+)
 
 _modedict = {"valid": 0, "same": 1, "full": 2}
 
+# Threads per block of the direct lag kernel, and the number of blocks it
+# aims to launch in total
+_LAG_THREADS = 256
+_LAG_BLOCKS = 4096
+
+# Bound on the number of elements of the cross-spectra held at once
+_LAG_CHUNK_ELEMENTS = 1 << 24
+
+_correlate_lags_code = """
+#include <cupy/complex.cuh>
+
+typedef {ctype} T;
+
+extern "C" __global__ void _cupy_correlate_lags(
+        const T * __restrict__ x,
+        const T * __restrict__ y,
+        const long long * __restrict__ ix,
+        const long long * __restrict__ iy,
+        const int n1,
+        const int n2,
+        const int max_lag,
+        const int n_rows,
+        T * __restrict__ partial ) {{
+
+    extern __shared__ unsigned char smem[];
+    T *s_acc {{ reinterpret_cast<T *>( smem ) }};
+
+    const int lags {{ 2 * max_lag + 1 }};
+    const int stride {{ static_cast<int>( blockDim.x * gridDim.x ) }};
+
+    for ( int row = blockIdx.y; row < n_rows; row += gridDim.y ) {{
+        const int p {{ row / lags }};
+        const int tau {{ row % lags - max_lag }};
+        const T *xr {{ x + ix[p] * n1 }};
+        const T *yr {{ y + iy[p] * n2 }};
+
+        // Samples of y that overlap x shifted by tau
+        const int lo {{ max( 0, -tau ) }};
+        const int hi {{ min( n2, n1 - tau ) }};
+
+        T acc {{}};
+        for ( int n = lo + static_cast<int>( blockIdx.x * blockDim.x +
+                  threadIdx.x ); n < hi; n += stride ) {{
+            acc += xr[n + tau] * {conj}( yr[n] );
+        }}
+        s_acc[threadIdx.x] = acc;
+        __syncthreads( );
+
+        for ( int s = blockDim.x / 2; s > 0; s >>= 1 ) {{
+            if ( threadIdx.x < s ) {{
+                s_acc[threadIdx.x] += s_acc[threadIdx.x + s];
+            }}
+            __syncthreads( );
+        }}
+        if ( threadIdx.x == 0 ) {{
+            partial[static_cast<long long>( row ) * gridDim.x + blockIdx.x] =
+                s_acc[0];
+        }}
+        __syncthreads( );
+    }}
+}}
+"""
+
+
+def _get_correlate_lags_kernel(dtype):
+    key = ("correlate_lags", str(dtype))
+    kernel = _cupy_kernel_cache.get(key)
+    if kernel is None:
+        kernel = cp.RawKernel(
+            _correlate_lags_code.format(
+                ctype=_float_ctypes[str(dtype)],
+                conj="conj" if dtype.kind == "c" else "",
+            ),
+            "_cupy_correlate_lags",
+            options=("-std=c++11",),
+        )
+        _cupy_kernel_cache[key] = kernel
+    return kernel
+
+
+def _correlate_lags_direct(x, y, ix, iy, max_lag):
+    n1, n2 = x.shape[-1], y.shape[-1]
+    lags = 2 * max_lag + 1
+    rows = ix.size * lags
+    n_blocks = max(
+        1, min(_iDivUp(n2, _LAG_THREADS), _iDivUp(_LAG_BLOCKS, rows))
+    )
+    partial = cp.empty((rows, n_blocks), x.dtype)
+
+    kernel = _get_correlate_lags_kernel(x.dtype)
+    kernel(
+        (n_blocks, min(rows, 65535)),
+        (_LAG_THREADS,),
+        (
+            x,
+            y,
+            cp.asarray(ix.ravel(), np.int64),
+            cp.asarray(iy.ravel(), np.int64),
+            np.int32(n1),
+            np.int32(n2),
+            np.int32(max_lag),
+            np.int32(rows),
+            partial,
+        ),
+        shared_mem=_LAG_THREADS * x.itemsize,
+    )
+    return partial.sum(axis=-1).reshape(ix.shape + (lags,))
+
+
+def _lag_block_len(n2, max_lag):
+    """FFT length of the blocks of `y` and number of blocks."""
+    width = 2 * max_lag + 1
+    nfft = _oa_block_len(n2 + width - 1, width)
+    if nfft is None:
+        nfft = next_fast_len(n2 + width - 1)
+    return nfft, _iDivUp(n2, nfft - width + 1)
+
+
+def _correlate_lags_fft(x, y, lead, max_lag):
+    n1, n2 = x.shape[-1], y.shape[-1]
+    width = 2 * max_lag + 1
+    nfft, n_blocks = _lag_block_len(n2, max_lag)
+    block = nfft - width + 1
+
+    # Every block of y is correlated with the stretch of x it can reach
+    # within max_lag, and the cross-spectra of the blocks are summed so
+    # that only one inverse transform per pair is needed.
+    span = n_blocks * block
+    xpad = cp.zeros(x.shape[:-1] + (span + 2 * max_lag,), x.dtype)
+    m = min(n1, span + max_lag)
+    xpad[..., max_lag : max_lag + m] = x[..., :m]
+    ypad = cp.zeros(y.shape[:-1] + (span,), y.dtype)
+    ypad[..., :n2] = y
+    ypad = ypad.reshape(y.shape[:-1] + (n_blocks, block))
+
+    if x.dtype.kind == "c":
+        fwd, inv = cp.fft.fft, cp.fft.ifft
+    else:
+        fwd, inv = cp.fft.rfft, cp.fft.irfft
+    n_freq = nfft if x.dtype.kind == "c" else nfft // 2 + 1
+
+    acc = None
+    step = max(
+        1, _LAG_CHUNK_ELEMENTS // (max(1, int(np.prod(lead))) * n_freq)
+    )
+    seg = cp.arange(block + 2 * max_lag)
+    for b in range(0, n_blocks, step):
+        starts = cp.arange(b, min(b + step, n_blocks)) * block
+        X = fwd(xpad[..., starts[:, None] + seg], nfft, axis=-1)
+        Y = fwd(ypad[..., b : b + step, :], nfft, axis=-1)
+        part = (X * Y.conj()).sum(axis=-2)
+        acc = part if acc is None else acc + part
+
+    return cp.ascontiguousarray(inv(acc, nfft, axis=-1)[..., :width])
+
+
+def _lag_method(n1, n2, n_x, n_y, n_pairs, max_lag):
+    """Whether the cost model predicts the direct method to be faster."""
+    c = get_cost_model()
+    width = 2 * max_lag + 1
+    direct = (
+        c["conv_direct_overhead"]
+        + c["conv_direct_per_mac"] * n_pairs * width * min(n1, n2)
+    )
+    # Forward transforms of every block of every input and an inverse one
+    # per pair, in units of three transforms
+    nfft, n_blocks = _lag_block_len(n2, max_lag)
+    fft = c["fft_overhead"] + c["fft_per_point"] * (
+        ((n_x + n_y) * n_blocks + n_pairs) / 3.0 * _fft_work(nfft)
+    )
+    return "direct" if direct < fft else "fft"
+
+
+def _correlate_lags(in1, in2, max_lag, method):
+    if in1.ndim == 0 or in2.ndim == 0:
+        raise ValueError("max_lag needs inputs of at least one dimension")
+    if int(max_lag) != max_lag or max_lag < 0:
+        raise ValueError("max_lag must be a non-negative integer")
+    max_lag = int(max_lag)
+
+    dtype = _float_result_type(in1.dtype, in2.dtype)
+    x = cp.ascontiguousarray(in1, dtype)
+    y = cp.ascontiguousarray(in2, dtype)
+
+    # Pairs of rows of x and y, broadcast over the leading axes
+    n_x = int(np.prod(x.shape[:-1]))
+    n_y = int(np.prod(y.shape[:-1]))
+    ix, iy = np.broadcast_arrays(
+        np.arange(n_x).reshape(x.shape[:-1]),
+        np.arange(n_y).reshape(y.shape[:-1]),
+    )
+    n1, n2 = x.shape[-1], y.shape[-1]
+
+    if method == "auto":
+        method = _lag_method(n1, n2, n_x, n_y, ix.size, max_lag)
+    if method == "direct":
+        return _correlate_lags_direct(x, y, ix, iy, max_lag)
+    return _correlate_lags_fft(x, y, ix.shape, max_lag)
+
 
 def correlate(
     in1,
     in2,
     mode="full",
     method="auto",
+    max_lag=None,
 ):
     r"""
     Cross-correlate two N-dimensional arrays.
@@ -52,7 +263,7 @@ def correlate(
         ``same``
            The output is the same size as `in1`, centered
            with respect to the 'full' output.
-    method : str {'auto', 'direct', 'fft'}, optional
+    method : str {'auto', 'direct', 'fft', 'oa'}, optional
         A string indicating which method to use to calculate the correlation.
 
         ``direct``
@@ -61,19 +272,33 @@ def correlate(
         ``fft``
            The Fast Fourier Transform is used to perform the correlation more
            quickly (only available for numerical arrays.)
+        ``oa``
+           The Fast Fourier Transform of overlapping blocks is used, which is
+           faster when one input is much longer than the other (only
+           available for numerical arrays.)
         ``auto``
-           Automatically chooses direct or Fourier method based on an estimate
-           of which is faster (default).  See `convolve` Notes for more detail.
+           Automatically chooses direct, Fourier or overlap-add method based
+           on an estimate of which is faster (default).  See `convolve` Notes
+           for more detail.
+    max_lag : int, optional
+        If given, only the lags ``-max_lag`` to ``max_lag`` of the full
+        cross-correlation are computed, along the last axis; `mode` is then
+        ignored. The leading axes of `in1` and `in2` are broadcast against
+        each other, each pair of rows being correlated separately. The
+        'direct' method sums the products for each lag, and the FFT methods
+        correlate blocks of `in2` with the stretch of `in1` within reach.
 
     Returns
     -------
     correlate : array
         An N-dimensional array containing a subset of the discrete linear
-        cross-correlation of `in1` with `in2`.
+        cross-correlation of `in1` with `in2`. With `max_lag`, an array of
+        the broadcast leading shape followed by ``2 * max_lag + 1`` lags.
 
     See Also
     --------
     choose_conv_method : contains more documentation on `method`.
+    correlation_lags : the lags of each element of the output.
 
     Notes
     -----
@@ -131,19 +356,27 @@ def correlate(
     in1 = cp.asarray(in1)
     in2 = cp.asarray(in2)
 
+    if max_lag is not None:
+        if method not in ("auto", "direct", "fft", "oa"):
+            raise ValueError(
+                "Acceptable method flags are 'auto', 'direct', 'fft', "
+                "or 'oa'."
+            )
+        return _correlate_lags(in1, in2, max_lag, method)
+
     if in1.ndim == in2.ndim == 0:
         return in1 * in2.conj()
     elif in1.ndim != in2.ndim:
         raise ValueError("in1 and in2 should have the same dimensionality")
 
     # this either calls fftconvolve or this function with method=='direct'
-    if method in ("fft", "auto"):
+    if method in ("fft", "oa", "auto"):
         return convolve(in1, _reverse_and_conj(in2), mode, method)
 
     elif method == "direct":
 
         if in1.ndim > 1:
-            raise ValueError("Direct method is only implemented for 1D")
+            return convolve(in1, _reverse_and_conj(in2), mode, method)
 
         swapped_inputs = in2.size > in1.size
 
@@ -156,10 +389,74 @@ def correlate(
 
     else:
         raise ValueError(
-            "Acceptable method flags are 'auto'," " 'direct', or 'fft'."
+            "Acceptable method flags are 'auto', 'direct', 'fft', or 'oa'."
         )
 
 
+def correlation_lags(in1_len, in2_len, mode="full", max_lag=None):
+    r"""
+    Calculates the lag / displacement indices array for 1D cross-correlation.
+
+    Parameters
+    ----------
+    in1_len : int
+        First input size.
+    in2_len : int
+        Second input size.
+    mode : str {'full', 'valid', 'same'}, optional
+        A string indicating the size of the output.
+        See the documentation `correlate` for more information.
+    max_lag : int, optional
+        If given, the lags of ``correlate(..., max_lag=max_lag)``, which
+        do not depend on the input sizes or `mode`.
+
+    Returns
+    -------
+    lags : array
+        Returns an array containing cross-correlation lag/displacement
+        indices. Indices can be indexed with the np.argmax of the
+        correlation to return the lag/displacement.
+
+    See Also
+    --------
+    correlate : Compute the N-dimensional cross-correlation.
+
+    Examples
+    --------
+    Estimate the delay between two channels from lags within +/- 2000
+    samples only:
+
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> x = cp.random.randn(2 ** 20)
+    >>> y = cp.roll(x, 123) + 0.1 * cp.random.randn(2 ** 20)
+    >>> corr = cusignal.correlate(y, x, max_lag=2000)
+    >>> lags = cusignal.correlation_lags(len(y), len(x), max_lag=2000)
+    >>> int(lags[cp.argmax(corr)])
+    123
+
+    """
+    if max_lag is not None:
+        return cp.arange(-max_lag, max_lag + 1)
+
+    if mode == "full":
+        lags = cp.arange(-in2_len + 1, in1_len)
+    elif mode == "same":
+        lags = cp.arange(-in2_len + 1, in1_len)
+        mid = lags.size // 2
+        lag_bound = in1_len // 2
+        lags = lags[mid - lag_bound : mid + lag_bound + in1_len % 2]
+    elif mode == "valid":
+        lag_bound = in1_len - in2_len
+        if lag_bound >= 0:
+            lags = cp.arange(lag_bound + 1)
+        else:
+            lags = cp.arange(lag_bound, 1)
+    else:
+        raise ValueError("Mode {} is invalid".format(mode))
+    return lags
+
+
 def correlate2d(
     in1,
     in2,
@@ -0,0 +1,245 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import cupy as cp
+import numpy as np
+
+from ..utils.fftpack_helper import next_fast_len
+from .convolution_utils import (
+    _conv_out_shape,
+    _float_result_type,
+    _iDivUp,
+)
+
+# Bound on the number of elements of one tile's transform; each worker
+# holds a few arrays of this size on the device at a time
+_TILED_BLOCK_ELEMENTS = 1 << 22
+
+# Worker threads used when `max_workers` is not given; two keep a tile
+# being read or written on the host while another one is transformed
+_TILED_DEFAULT_WORKERS = 2
+
+
+def _tile_fft_shape(out_shape, h_shape):
+    """
+    FFT shape of the tiles: the whole output, halved along the longer axis
+    until it fits the element budget. Large tiles keep both the overlap
+    read twice and the per-tile overhead small.
+    """
+    shape = [next_fast_len(n + k - 1) for n, k in zip(out_shape, h_shape)]
+    while shape[0] * shape[1] > _TILED_BLOCK_ELEMENTS:
+        ax = 0 if shape[0] - h_shape[0] >= shape[1] - h_shape[1] else 1
+        smaller = next_fast_len(max(shape[ax] // 2, 2 * h_shape[ax] - 1))
+        if smaller >= shape[ax]:
+            break
+        shape[ax] = smaller
+    return shape
+
+
+def _read_block(in1, lo, block_shape, dtype):
+    """
+    The region of `in1` of `block_shape` starting at `lo`, which may reach
+    past its edges, zero-padded and copied to the device.
+    """
+    src, dst = [], []
+    for start, size, n in zip(lo, block_shape, in1.shape):
+        a, b = max(start, 0), min(start + size, n)
+        src.append(slice(a, max(a, b)))
+        dst.append(slice(a - start, max(a, b) - start))
+
+    block = cp.zeros(block_shape, dtype)
+    region = in1[tuple(src)]
+    if region.size:
+        block[tuple(dst)] = cp.asarray(region, dtype)
+    return block
+
+
+def tiled_fftconvolve(
+    in1, in2, mode="full", out=None, tile_shape=None, max_workers=None
+):
+    """
+    Convolve a 2-D array too large for the device with FFTs of tiles.
+
+    The output is computed one tile at a time by overlap-save: the region
+    of `in1` each tile depends on is read, transformed together with a
+    single transform of `in2`, and the tile written to `out`. Only the
+    tiles in flight are held on the device, so `in1` and `out` may be
+    NumPy memory maps of images far larger than the device memory.
+
+    Parameters
+    ----------
+    in1 : array_like
+        First input, a 2-D array. NumPy arrays and memory maps are read one
+        tile at a time.
+    in2 : array_like
+        Second input, a 2-D kernel that fits on the device.
+    mode : str {'full', 'valid', 'same'}, optional
+        A string indicating the size of the output:
+
+        ``full``
+           The output is the full discrete linear convolution
+           of the inputs. (Default)
+        ``valid``
+           The output consists only of those elements that do not
+           rely on the zero-padding. In 'valid' mode, `in1` must be at
+           least as large as `in2` in every dimension.
+        ``same``
+           The output is the same size as `in1`, centered
+           with respect to the 'full' output.
+    out : ndarray, optional
+        Array the convolution is written to, such as a NumPy memory map
+        opened for writing. It must have the shape of the output. If not
+        given, a NumPy array is allocated for NumPy inputs and a CuPy
+        array for CuPy inputs.
+    tile_shape : tuple of int, optional
+        Shape of the output tiles. By default, tiles are as large as
+        transforms of at most ``2**22`` elements allow.
+    max_workers : int, optional
+        Number of threads that process tiles concurrently, each on its own
+        CUDA stream. Defaults to 2.
+
+    Returns
+    -------
+    out : ndarray
+        The convolution of `in1` with `in2`, in the precision of the inputs,
+        written to `out` if given.
+
+    See Also
+    --------
+    fftconvolve, oaconvolve
+
+    Notes
+    -----
+    Each worker holds about three arrays of the tile transform size on the
+    device, plus one tile of input and output on the host, so the memory
+    used is bounded by `tile_shape` and `max_workers` rather than by the
+    size of `in1`. Tiles are written to disjoint regions of `out`.
+
+    Examples
+    --------
+    Smooth a waterfall stored on disk into a second file:
+
+    >>> import numpy as np
+    >>> import cusignal
+    >>> img = np.memmap("waterfall.f32", np.float32, "r", shape=(100000, 8192))
+    >>> res = np.memmap("smooth.f32", np.float32, "w+", shape=img.shape)
+    >>> kernel = np.ones((9, 9), np.float32) / 81
+    >>> _ = cusignal.tiled_fftconvolve(img, kernel, "same", out=res)
+    >>> res.flush()
+
+    """
+    if mode not in ("full", "same", "valid"):
+        raise ValueError(
+            "acceptable mode flags are 'valid', 'same', or 'full'"
+        )
+
+    on_device = isinstance(in1, cp.ndarray)
+    if not hasattr(in1, "shape"):
+        in1 = np.asarray(in1)
+    h = cp.asarray(in2)
+    if in1.ndim != 2 or h.ndim != 2:
+        raise ValueError("in1 and in2 should have two dimensions")
+    if 0 in in1.shape or 0 in h.shape:
+        raise ValueError("in1 and in2 must not be empty")
+    if mode == "valid" and any(n < k for n, k in zip(in1.shape, h.shape)):
+        raise ValueError(
+            "in1 should be at least as large as in2 in every dimension "
+            "for 'valid' mode"
+        )
+
+    dtype = _float_result_type(in1.dtype, h.dtype)
+    h = h.astype(dtype, copy=False)
+
+    out_shape = tuple(_conv_out_shape(in1.shape, h.shape, mode))
+    offset = [
+        (n + k - 1 - s) // 2 for n, k, s in zip(in1.shape, h.shape, out_shape)
+    ]
+    if out is None:
+        out = (cp if on_device else np).empty(out_shape, dtype)
+    elif tuple(out.shape) != out_shape:
+        raise ValueError(
+            "out should have shape {}, not {}".format(
+                out_shape, tuple(out.shape)
+            )
+        )
+    if out.size == 0:
+        return out
+
+    if tile_shape is None:
+        fft_shape = _tile_fft_shape(out_shape, h.shape)
+        tile_shape = [
+            min(s - k + 1, n)
+            for s, k, n in zip(fft_shape, h.shape, out_shape)
+        ]
+    else:
+        if len(tile_shape) != 2 or min(tile_shape) < 1:
+            raise ValueError("tile_shape should be two positive integers")
+        tile_shape = [min(int(t), n) for t, n in zip(tile_shape, out_shape)]
+    block_shape = [t + k - 1 for t, k in zip(tile_shape, h.shape)]
+    fft_shape = [next_fast_len(b) for b in block_shape]
+
+    if dtype.kind == "c":
+        fwd, inv = cp.fft.fft2, cp.fft.ifft2
+    else:
+        fwd, inv = cp.fft.rfft2, cp.fft.irfft2
+    H = fwd(h, fft_shape)
+    cp.cuda.Stream.null.synchronize()
+
+    # Every worker thread transforms its tiles on a stream of its own
+    local = threading.local()
+
+    def _stream():
+        if not hasattr(local, "stream"):
+            local.stream = cp.cuda.Stream(non_blocking=True)
+        return local.stream
+
+    def _tile(i, j):
+        o0, o1 = i * tile_shape[0], j * tile_shape[1]
+        t0 = min(tile_shape[0], out_shape[0] - o0)
+        t1 = min(tile_shape[1], out_shape[1] - o1)
+        lo = (
+            o0 + offset[0] - h.shape[0] + 1,
+            o1 + offset[1] - h.shape[1] + 1,
+        )
+
+        stream = _stream()
+        with stream:
+            block = _read_block(in1, lo, block_shape, dtype)
+            y = inv(fwd(block, fft_shape) * H, fft_shape)
+            y = y[
+                h.shape[0] - 1 : h.shape[0] - 1 + t0,
+                h.shape[1] - 1 : h.shape[1] - 1 + t1,
+            ].astype(dtype, copy=False)
+            if not isinstance(out, np.ndarray):
+                out[o0 : o0 + t0, o1 : o1 + t1] = y
+                stream.synchronize()
+            else:
+                y = cp.asnumpy(y, stream=stream)
+                stream.synchronize()
+                out[o0 : o0 + t0, o1 : o1 + t1] = y
+
+    tiles = [
+        (i, j)
+        for i in range(_iDivUp(out_shape[0], tile_shape[0]))
+        for j in range(_iDivUp(out_shape[1], tile_shape[1]))
+    ]
+    if max_workers is None:
+        max_workers = _TILED_DEFAULT_WORKERS
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for future in [pool.submit(_tile, i, j) for i, j in tiles]:
+            future.result()
+    return out
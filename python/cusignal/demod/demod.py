@@ -0,0 +1,411 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cupy as cp
+import numpy as np
+
+from scipy import signal
+
+from ..filtering.filtering import sosfilt
+
+_fm_discriminator_kernel = cp.ElementwiseKernel(
+    "raw C x, raw C prev, int64 n, F scale",
+    "F out",
+    """
+    const C a { x[i] };
+    const C b { ( i % n ) ? x[i - 1] : prev[i / n] };
+
+    // Angle of a * conj(b), the phase advance over one sample
+    const F re { a.real() * b.real() + a.imag() * b.imag() };
+    const F im { a.imag() * b.real() - a.real() * b.imag() };
+    out = atan2( im, re ) * scale;
+    """,
+    "_fm_discriminator_kernel",
+    options=("-std=c++11",),
+)
+
+_pm_wrap_kernel = cp.ElementwiseKernel(
+    "raw C x, raw F prev, int64 n",
+    "F phase, int8 wrap",
+    """
+    const C a { x[i] };
+    phase = atan2( a.imag(), a.real() );
+
+    F last;
+    if ( i % n ) {
+        const C b { x[i - 1] };
+        last = atan2( b.imag(), b.real() );
+    } else {
+        last = prev[i / n];
+    }
+
+    // Number of turns to add, as in numpy.unwrap
+    const F pi { 3.141592653589793 };
+    const F d { phase - last };
+    wrap = ( d > pi ) ? -1 : ( ( d < -pi ) ? 1 : 0 );
+    """,
+    "_pm_wrap_kernel",
+    options=("-std=c++11",),
+)
+
+_pm_unwrap_kernel = cp.ElementwiseKernel(
+    "F phase, int64 turns",
+    "F out",
+    """
+    out = phase + 6.283185307179586 * turns;
+    """,
+    "_pm_unwrap_kernel",
+    options=("-std=c++11",),
+)
+
+
+def _complex_input(x):
+    xp = cp.get_array_module(x)
+    x = xp.asarray(x)
+    if x.dtype.kind != "c":
+        raise ValueError("x must be complex.")
+    return xp, xp.ascontiguousarray(x)
+
+
+def _stale(state, x, xp):
+    return (
+        state is None
+        or state.shape != x.shape[:-1]
+        or cp.get_array_module(state) is not xp
+    )
+
+
+class FMDemodulator(object):
+    """
+    Stateful FM discriminator.
+
+    Computes the phase advance between consecutive samples of a complex
+    baseband signal, ``angle(x[n] * conj(x[n - 1]))``, in one elementwise
+    pass. The last sample of each block is carried to the next one, so a
+    stream demodulates without gaps at block boundaries.
+
+    Parameters
+    ----------
+    fs : float, optional
+        Sampling rate of the input. If given, the output is the
+        instantaneous frequency in Hz; otherwise it is in radians per
+        sample.
+
+    Notes
+    -----
+    The first output sample after construction or `reset` is 0.
+
+    NumPy inputs are processed on the host with an equivalent NumPy
+    implementation.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> fs = 2.4e6
+    >>> demod = cusignal.FMDemodulator(fs)
+    >>> t = cp.arange(2 ** 16) / fs
+    >>> x = cp.exp(2j * cp.pi * 75e3 * t).reshape(4, -1)  # 4 channels
+    >>> y = demod(x)  # 75 kHz everywhere but the very first sample
+
+    """
+
+    def __init__(self, fs=None):
+        self.fs = fs
+        self.reset()
+
+    def reset(self):
+        """Forget the last sample of the previous block."""
+        self._prev = None
+
+    def __call__(self, x):
+        """
+        Demodulate the next block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of complex samples, time along the last axis.
+            Leading axes are independent channels.
+
+        Returns
+        -------
+        y : ndarray
+            Instantaneous frequency, with the real precision of `x`.
+        """
+        xp, x = _complex_input(x)
+        out_dtype = x.real.dtype
+        if x.shape[-1] == 0:
+            return xp.empty(x.shape, out_dtype)
+        if _stale(self._prev, x, xp):
+            self._prev = x[..., 0].copy()
+
+        scale = 1.0 if self.fs is None else self.fs / (2 * np.pi)
+        prev = self._prev.astype(x.dtype)
+
+        if xp is cp:
+            y = cp.empty(x.shape, out_dtype)
+            if y.size:
+                _fm_discriminator_kernel(
+                    x, prev, x.shape[-1], out_dtype.type(scale), y
+                )
+        else:
+            xb = np.concatenate((prev[..., None], x), -1)
+            y = np.angle(xb[..., 1:] * xb[..., :-1].conj()) * scale
+            y = y.astype(out_dtype, copy=False)
+
+        self._prev = x[..., -1].copy()
+
+        return y
+
+
+class PMDemodulator(object):
+    """
+    Stateful phase demodulator.
+
+    Returns the phase of a complex baseband signal. With ``unwrap=True``
+    the phase is unwrapped continuously across blocks.
+
+    Parameters
+    ----------
+    unwrap : bool, optional
+        If False (default), return the wrapped phase in ``(-pi, pi]``,
+        computed in a single elementwise pass. If True, remove the jumps
+        of more than pi between consecutive samples, as `numpy.unwrap`
+        does, carrying the phase of the last sample and the accumulated
+        number of turns between blocks.
+
+    Notes
+    -----
+    Unwrapping counts whole turns with an integer running sum, so the
+    result does not drift over long streams. It needs a scan over each
+    block in addition to the elementwise passes.
+
+    NumPy inputs are processed on the host with an equivalent NumPy
+    implementation.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> demod = cusignal.PMDemodulator(unwrap=True)
+    >>> x = cp.exp(0.01j * cp.arange(10000))
+    >>> phase = cp.concatenate([demod(x[:5000]), demod(x[5000:])])  # ramp
+
+    """
+
+    def __init__(self, unwrap=False):
+        self.unwrap = unwrap
+        self.reset()
+
+    def reset(self):
+        """Forget the phase of the previous block."""
+        self._prev = None
+        self._turns = None
+
+    def __call__(self, x):
+        """
+        Demodulate the next block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of complex samples, time along the last axis.
+            Leading axes are independent channels.
+
+        Returns
+        -------
+        y : ndarray
+            Phase in radians, with the real precision of `x`.
+        """
+        xp, x = _complex_input(x)
+        if not self.unwrap:
+            return xp.angle(x)
+
+        out_dtype = x.real.dtype
+        if x.shape[-1] == 0:
+            return xp.empty(x.shape, out_dtype)
+        if _stale(self._prev, x, xp):
+            self._prev = xp.angle(x[..., 0])
+            self._turns = xp.zeros(x.shape[:-1], np.int64)
+        prev = self._prev.astype(out_dtype)
+
+        if xp is cp:
+            phase = cp.empty(x.shape, out_dtype)
+            wrap = cp.empty(x.shape, np.int8)
+            _pm_wrap_kernel(x, prev, x.shape[-1], phase, wrap)
+        else:
+            phase = np.angle(x)
+            d = np.diff(phase, axis=-1, prepend=prev[..., None])
+            wrap = (d < -np.pi).astype(np.int8) - (d > np.pi)
+
+        turns = xp.cumsum(wrap, axis=-1, dtype=np.int64)
+        turns += self._turns[..., None]
+
+        if xp is cp:
+            y = _pm_unwrap_kernel(phase, turns)
+        else:
+            y = (phase + 2 * np.pi * turns).astype(out_dtype)
+
+        self._prev = phase[..., -1].copy()
+        self._turns = turns[..., -1].copy()
+
+        return y
+
+
+class Deemphasis(object):
+    """
+    Stateful single-pole de-emphasis filter for FM audio.
+
+    Implements ``y[n] = a * y[n - 1] + (1 - a) * x[n]`` with
+    ``a = exp(-1 / (tau * fs))``, the discrete equivalent of an RC
+    low-pass filter with time constant `tau`. The filter state is carried
+    between blocks.
+
+    Parameters
+    ----------
+    fs : float
+        Sampling rate of the input.
+    tau : float, optional
+        Time constant in seconds. Default is 75e-6 (Americas); use 50e-6
+        in most other regions.
+
+    Notes
+    -----
+    The recursion is evaluated with `sosfilt`, one thread block per
+    channel. NumPy inputs are filtered on the host with
+    `scipy.signal.sosfilt`.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> fs = 240e3
+    >>> fm = cusignal.FMDemodulator()
+    >>> de = cusignal.Deemphasis(fs, 50e-6)
+    >>> x = cp.exp(1j * cp.random.randn(8, 2 ** 16).cumsum(-1))
+    >>> audio = de(fm(x))
+
+    """
+
+    def __init__(self, fs, tau=75e-6):
+        a = np.exp(-1.0 / (tau * fs))
+        self.fs = fs
+        self.tau = tau
+        self._sos = np.array([[1.0 - a, 0.0, 0.0, 1.0, -a, 0.0]])
+        self.reset()
+
+    def reset(self):
+        """Clear the filter state."""
+        self._zi = None
+
+    def __call__(self, x):
+        """
+        Filter the next block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of samples, time along the last axis. Leading axes
+            are independent channels.
+
+        Returns
+        -------
+        y : ndarray
+            De-emphasized samples.
+        """
+        xp = cp.get_array_module(x)
+        x = xp.asarray(x)
+        if x.dtype.kind not in "fc":
+            x = x.astype(np.float64)
+
+        if (
+            self._zi is None
+            or self._zi.shape[1:-1] != x.shape[:-1]
+            or cp.get_array_module(self._zi) is not xp
+        ):
+            self._zi = xp.zeros((1,) + x.shape[:-1] + (2,), x.dtype)
+
+        sos = self._sos.astype(x.real.dtype)
+        zi = self._zi.astype(x.dtype)
+        if xp is cp:
+            y, self._zi = sosfilt(cp.asarray(sos), x, zi=zi)
+        else:
+            y, self._zi = signal.sosfilt(sos, x, zi=zi)
+
+        return y
+
+
+def fm_demod(x, fs=None):
+    """
+    Demodulate FM with a discriminator.
+
+    One-shot form of `FMDemodulator`.
+
+    Parameters
+    ----------
+    x : array_like
+        Complex baseband signal, time along the last axis. Leading axes
+        are independent channels.
+    fs : float, optional
+        Sampling rate of `x`. If given, the output is the instantaneous
+        frequency in Hz; otherwise it is in radians per sample.
+
+    Returns
+    -------
+    y : ndarray
+        Instantaneous frequency, with the real precision of `x`. The
+        first sample is 0.
+    """
+    return FMDemodulator(fs)(x)
+
+
+def am_demod(x):
+    """
+    Demodulate AM with an envelope detector.
+
+    Parameters
+    ----------
+    x : array_like
+        Complex baseband signal.
+
+    Returns
+    -------
+    y : ndarray
+        Magnitude of `x`, with its real precision. The detector has no
+        memory, so blocks of a stream can be processed independently.
+    """
+    xp, x = _complex_input(x)
+    return xp.abs(x)
+
+
+def pm_demod(x, unwrap=False):
+    """
+    Demodulate PM.
+
+    One-shot form of `PMDemodulator`.
+
+    Parameters
+    ----------
+    x : array_like
+        Complex baseband signal, time along the last axis. Leading axes
+        are independent channels.
+    unwrap : bool, optional
+        If True, unwrap the phase along the last axis. Default is False.
+
+    Returns
+    -------
+    y : ndarray
+        Phase in radians, with the real precision of `x`.
+    """
+    return PMDemodulator(unwrap)(x)
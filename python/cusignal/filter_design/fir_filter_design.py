@@ -15,6 +15,7 @@ import cupy as cp
 import numpy as np
 
 from scipy import signal
+from ..utils.cost_model import _use_gpu_design
 from ..windows.windows import get_window
 
 
@@ -145,7 +146,7 @@ def firwin(
     scale=True,
     nyq=1.0,
     fs=None,
-    gpupath=True,
+    gpupath=None,
 ):
     """
     FIR filter design using the window method.
@@ -204,9 +205,12 @@ def firwin(
     fs : float, optional
         The sampling frequency of the signal.  Each frequency in `cutoff`
         must be between 0 and ``fs/2``.  Default is 2.
-    gpupath : bool, Optional
-        Optional path for filter design. gpupath == False may be desirable if
-        filter sizes are small.
+    gpupath : bool or None, optional
+        Where to design the filter. True designs on the GPU and returns a
+        CuPy array; False designs on the host and returns a NumPy array.
+        The default, None, picks whichever the cost model predicts to be
+        faster for `numtaps` and always returns a CuPy array; see
+        `get_cost_model`.
 
     Returns
     -------
@@ -271,6 +275,10 @@ def firwin(
     array([ 0.04890915,  0.91284326,  0.04890915])
 
     """
+    to_device = gpupath is None
+    if to_device:
+        gpupath = _use_gpu_design(numtaps)
+
     if gpupath:
         pp = cp
     else:
@@ -356,6 +364,9 @@ def firwin(
             s = np.sum(h * c)
             h /= s
 
+        if to_device:
+            h = cp.asarray(h)
+
     return h
 
 
@@ -16,6 +16,11 @@ from cusignal.filtering.resample import (
     resample,
     resample_poly,
     upfirdn,
+    resample_farrow,
+    FarrowResampler,
+    filter_cache_info,
+    filter_cache_clear,
+    filter_cache_resize,
 )
 from cusignal.filtering.filtering import (
     wiener,
@@ -23,7 +28,18 @@ from cusignal.filtering.filtering import (
     sosfilt,
     hilbert,
     hilbert2,
+    HilbertTransformer,
     detrend,
     channelize_poly,
     freq_shift,
 )
+from cusignal.filtering.channelizer import Channelizer, Synthesizer
+from cusignal.filtering.nco import NCO
+from cusignal.filtering.ddc import DDC
+from cusignal.filtering.multistage import MultiStageDecimator
+from cusignal.filtering.order_statistic import (
+    order_filter,
+    medfilt,
+    medfilt2d,
+)
+from cusignal.filtering.savitzky_golay import savgol_coeffs, savgol_filter
@@ -13,8 +13,7 @@
 
 import cupy as cp
 
-from math import ceil
-
+from ..convolution.convolution_utils import _prod
 from ..utils._caches import _cupy_kernel_cache
 from ..utils.helper_tools import _print_atts, _get_function, _get_tpb_bpg
 
@@ -82,7 +81,7 @@ class _cupy_upfirdn_wrapper(object):
         self.kernel(self.grid, self.block, kernel_args)
 
 
-class _cupy_upfirdn2d_wrapper(object):
+class _cupy_upfirdnNd_wrapper(object):
     def __init__(self, grid, block, kernel):
         if isinstance(grid, int):
             grid = (grid,)
@@ -106,19 +105,20 @@ class _cupy_upfirdn2d_wrapper(object):
         out,
     ):
 
+        inner = _prod(x.shape[axis + 1 :])
+
         kernel_args = (
             x,
-            x.shape[1],
             h_trans_flip,
             up,
             down,
-            axis,
             x_shape_a,
             h_per_phase,
             padded_len,
+            inner,
             out,
-            out.shape[0],
-            out.shape[1],
+            out.shape[axis],
+            out.size,
         )
 
         self.kernel(self.grid, self.block, kernel_args)
@@ -151,8 +151,8 @@ def _get_backend_kernel(
     if kernel:
         if k_type == "upfirdn1D":
             return _cupy_upfirdn_wrapper(grid, block, kernel)
-        elif k_type == "upfirdn2D":
-            return _cupy_upfirdn2d_wrapper(grid, block, kernel)
+        elif k_type == "upfirdnND":
+            return _cupy_upfirdnNd_wrapper(grid, block, kernel)
     else:
         raise ValueError(
             "Kernel {} not found in _cupy_kernel_cache".format(k_type)
@@ -182,59 +182,48 @@ class _UpFIRDn(object):
         x,
         axis,
     ):
-        """Apply the prepared filter to the specified axis of a nD signal x"""
+        """
+        Apply the prepared filter to the specified axis of a nD signal x.
 
+        The remaining axes are treated as a flattened batch and indexed with
+        strides directly, so the filtered axis is never moved.
+        """
+
+        axis = axis % x.ndim
         output_len = _output_len(
             self._h_len_orig, x.shape[axis], self._up, self._down
         )
-        output_shape = cp.asarray(x.shape)
-        output_shape[axis] = output_len
-        out = cp.zeros(
-            cp.asnumpy(output_shape), dtype=self._output_type, order="C"
-        )
-        axis = axis % x.ndim
+        output_shape = x.shape[:axis] + (output_len,) + x.shape[axis + 1 :]
+        # Every output sample is written by the kernel; no need to zero-fill
+        out = cp.empty(output_shape, dtype=self._output_type, order="C")
+        if out.size == 0:
+            return out
+
+        x = cp.ascontiguousarray(x, self._output_type)
 
         # Precompute variables on CPU
         x_shape_a = x.shape[axis]
         h_per_phase = len(self._h_trans_flip) // self._up
         padded_len = x.shape[axis] + (len(self._h_trans_flip) // self._up) - 1
 
-        if out.ndim > 1:
-            threadsperblock = (16, 16)
-            blockspergrid_x = ceil(out.shape[0] / threadsperblock[0])
-            blockspergrid_y = ceil(out.shape[1] / threadsperblock[1])
-            blockspergrid = (blockspergrid_x, blockspergrid_y)
-
-        else:
-            threadsperblock, blockspergrid = _get_tpb_bpg()
+        threadsperblock, blockspergrid = _get_tpb_bpg()
 
         if out.ndim == 1:
             k_type = "upfirdn1D"
-
-            _populate_kernel_cache(out.dtype, k_type)
-
-            kernel = _get_backend_kernel(
-                out.dtype,
-                blockspergrid,
-                threadsperblock,
-                k_type,
-            )
-        elif out.ndim == 2:
-            k_type = "upfirdn2D"
-
-            _populate_kernel_cache(out.dtype, k_type)
-
-            kernel = _get_backend_kernel(
-                out.dtype,
-                blockspergrid,
-                threadsperblock,
-                k_type,
-            )
         else:
-            raise NotImplementedError("upfirdn() requires ndim <= 2")
+            k_type = "upfirdnND"
+
+        _populate_kernel_cache(out.dtype, k_type)
+
+        kernel = _get_backend_kernel(
+            out.dtype,
+            blockspergrid,
+            threadsperblock,
+            k_type,
+        )
 
         kernel(
-            cp.asarray(x, self._output_type),
+            x,
             self._h_trans_flip,
             self._up,
             self._down,
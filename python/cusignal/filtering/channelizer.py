@@ -0,0 +1,493 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cupy as cp
+import numpy as np
+
+from numpy.lib.stride_tricks import as_strided
+
+
+_channelizer_fold_kernel = cp.ElementwiseKernel(
+    "raw T x, raw T h, int64 n_chans, int64 n_taps, int64 hop, \
+     int64 n_frames, int64 row_len, int64 frame_offset",
+    "T v",
+    """
+    const long long per_row { n_frames * n_chans };
+    const long long row { i / per_row };
+    const long long m { ( i % per_row ) / n_chans };
+    const long long k { i % n_chans };
+
+    // Rotate the commutator so every channel stays referenced to time
+    // when frames advance by less than n_chans samples.
+    const long long shift { ( ( m + frame_offset + 1 ) * hop ) % n_chans };
+    const long long r { n_chans - 1 - ( k + shift ) % n_chans };
+
+    const long long base { row * row_len + m * hop + r };
+
+    T acc {};
+    for ( int t = 0; t < n_taps; t++ ) {
+        acc += x[base + t * n_chans] * h[t * n_chans + r];
+    }
+    v = acc;
+    """,
+    "_channelizer_fold_kernel",
+    options=("-std=c++11",),
+)
+
+
+def _fold_numpy(xb, hr, n_chans, n_taps, hop, n_frames, frame_offset):
+    """NumPy reference of `_channelizer_fold_kernel`"""
+    s = xb.strides
+    frames = as_strided(
+        xb,
+        shape=xb.shape[:-1] + (n_frames, n_taps, n_chans),
+        strides=s[:-1] + (hop * s[-1], n_chans * s[-1], s[-1]),
+        writeable=False,
+    )
+    z = np.einsum("...mtc,tc->...mc", frames, hr.reshape(n_taps, n_chans))
+
+    shift = ((np.arange(n_frames) + frame_offset + 1) * hop) % n_chans
+    idx = n_chans - 1 - (np.arange(n_chans) + shift[:, None]) % n_chans
+    idx = np.broadcast_to(idx, z.shape)
+
+    return np.take_along_axis(z, idx, axis=-1)
+
+
+class Channelizer(object):
+    """
+    Stateful polyphase filter bank channelizer.
+
+    Splits a wideband signal into `n_chans` uniformly spaced channels with a
+    polyphase FIR prototype filter followed by an FFT. Unlike
+    `channelize_poly`, the number of taps per polyphase branch is not
+    limited, channels may be oversampled, and filter state is kept between
+    calls so a long stream can be processed block by block.
+
+    Parameters
+    ----------
+    h : array_like
+        1-D prototype low-pass filter. It is zero-padded to a multiple of
+        `n_chans` and split into ``ceil(len(h) / n_chans)`` taps per branch.
+    n_chans : int
+        Number of channels.
+    oversample : int, optional
+        Channel oversampling factor. Each output frame advances the input by
+        ``n_chans // oversample`` samples. 1 gives a critically sampled
+        channelizer, 2 a 2x oversampled one. Must divide `n_chans`.
+        Default is 1.
+    layout : {'channel', 'time'}, optional
+        Layout of the returned array. ``'channel'`` returns
+        ``(..., n_chans, n_frames)``, as `channelize_poly` does;
+        ``'time'`` returns ``(..., n_frames, n_chans)``. Both are views of
+        the FFT output and never involve a transpose copy. Default is
+        ``'channel'``.
+
+    Attributes
+    ----------
+    n_taps : int
+        Number of taps per polyphase branch.
+    hop : int
+        Number of input samples consumed per output frame.
+
+    Notes
+    -----
+    With ``oversample=1`` the output for a signal whose length is a
+    multiple of `n_chans` is identical to that of `channelize_poly`.
+
+    For oversampled channelizers the commutator is circularly shifted each
+    frame so that all channels are at baseband.
+
+    Input of any dimensionality is accepted, with the last axis holding
+    time and all leading axes treated as independent streams. NumPy inputs
+    are processed on the host with an equivalent NumPy implementation.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> h = cusignal.firwin(4096 * 64, 1.0 / 4096)
+    >>> chan = cusignal.Channelizer(h, 4096, oversample=2)
+    >>> x = cp.random.randn(2 ** 22) + 1j * cp.random.randn(2 ** 22)
+    >>> y = chan(x)  # (4096, 2048)
+
+    """
+
+    def __init__(self, h, n_chans, oversample=1, layout="channel"):
+        n_chans = int(n_chans)
+        oversample = int(oversample)
+        if n_chans < 1:
+            raise ValueError("n_chans must be >= 1")
+        if oversample < 1 or n_chans % oversample:
+            raise ValueError("oversample must be >= 1 and divide n_chans")
+        if layout not in ("channel", "time"):
+            raise ValueError("layout must be 'channel' or 'time'")
+
+        h = cp.asnumpy(h)
+        if h.ndim != 1 or h.size == 0:
+            raise ValueError("h must be 1-D with non-zero length")
+
+        self.n_chans = n_chans
+        self.oversample = oversample
+        self.layout = layout
+        self.hop = n_chans // oversample
+        self.n_taps = -(-h.size // n_chans)
+
+        # Reverse the zero-padded prototype so that each frame is a plain
+        # forward window of the input, and fold in the n_chans scaling so
+        # the inverse FFT gives the unnormalized channel sums.
+        h_full = np.zeros(self.n_taps * n_chans, h.dtype)
+        h_full[: h.size] = h
+        self._h = h_full[::-1] * n_chans
+        self._h_cache = {}
+
+        self.reset()
+
+    def reset(self):
+        """Clear the filter state."""
+        self._hist = None
+        self._frame = 0
+
+    def _taps(self, xp, dtype):
+        key = (xp.__name__, str(dtype))
+        h = self._h_cache.get(key)
+        if h is None:
+            h = xp.asarray(self._h.astype(dtype))
+            self._h_cache[key] = h
+        return h
+
+    def __call__(self, x):
+        """
+        Channelize the next block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of input samples, time along the last axis.
+
+        Returns
+        -------
+        y : ndarray
+            Channelized output. Only complete frames are returned; leftover
+            input samples are kept for the next call.
+        """
+        xp = cp.get_array_module(x)
+        x = xp.asarray(x)
+        # Precision follows the input; the taps are cast to match.
+        dtype = np.result_type(x.dtype, np.float32)
+        if self._h.dtype.kind == "c":
+            dtype = np.result_type(dtype, np.complex64)
+        out_dtype = np.result_type(dtype, np.complex64)
+
+        L = self.n_taps * self.n_chans
+        if (
+            self._hist is None
+            or self._hist.shape[:-1] != x.shape[:-1]
+            or cp.get_array_module(self._hist) is not xp
+        ):
+            self._hist = xp.zeros(x.shape[:-1] + (L - self.hop,), dtype)
+
+        xb = xp.concatenate((self._hist.astype(dtype), x.astype(dtype)), -1)
+        n_frames = max(0, (xb.shape[-1] - L) // self.hop + 1)
+        h = self._taps(xp, dtype)
+
+        if xp is cp:
+            v = cp.empty(x.shape[:-1] + (n_frames, self.n_chans), dtype)
+            if v.size:
+                _channelizer_fold_kernel(
+                    xb,
+                    h,
+                    self.n_chans,
+                    self.n_taps,
+                    self.hop,
+                    n_frames,
+                    xb.shape[-1],
+                    self._frame % self.oversample,
+                    v,
+                )
+        else:
+            v = _fold_numpy(
+                xb,
+                h,
+                self.n_chans,
+                self.n_taps,
+                self.hop,
+                n_frames,
+                self._frame % self.oversample,
+            )
+
+        self._hist = xb[..., n_frames * self.hop :].copy()
+        self._frame += n_frames
+
+        y = xp.fft.ifft(v, axis=-1).astype(out_dtype, copy=False)
+
+        if self.layout == "channel":
+            return xp.swapaxes(y, -1, -2)
+        return y
+
+
+_synthesizer_kernel = cp.ElementwiseKernel(
+    "raw T u, raw G g, int64 n_chans, int64 n_phases, int64 hop, \
+     int64 n_frames, int64 frame_offset, int64 phase",
+    "T y",
+    """
+    const long long per_row { n_frames * hop };
+    const long long row { i / per_row };
+    const long long q { ( i % per_row ) / hop };
+    const long long r { i % hop };
+
+    // Every frame contributing to this output sample reads the same bin
+    // of its inverse FFT, so the channel index is fixed for the sum.
+    const long long p {
+        ( ( q + frame_offset + 1 ) * hop + r + phase ) % n_chans
+    };
+    const long long frames { n_frames + n_phases - 1 };
+    const T *u_row { &u[( row * frames + q + n_phases - 1 ) * n_chans + p] };
+
+    T acc {};
+    for ( int j = 0; j < n_phases; j++ ) {
+        acc += g[r + j * hop] * u_row[-j * n_chans];
+    }
+    y = acc;
+    """,
+    "_synthesizer_kernel",
+    options=("-std=c++11",),
+)
+
+
+def _synthesize_numpy(
+    u, g, n_chans, n_phases, hop, n_frames, frame_offset, phase
+):
+    """NumPy reference of `_synthesizer_kernel`"""
+    i = np.arange(n_frames * hop)
+    q, r = np.divmod(i, hop)
+    p = ((q + frame_offset + 1) * hop + r + phase) % n_chans
+
+    y = np.zeros(u.shape[:-2] + (i.size,), u.dtype)
+    for j in range(n_phases):
+        y += g[r + j * hop] * u[..., q + n_phases - 1 - j, p]
+
+    return y
+
+
+class Synthesizer(object):
+    """
+    Stateful polyphase synthesis filter bank.
+
+    Reconstructs a wideband signal from channelized data, the inverse of
+    `Channelizer`. All channels are recombined in a single pass: one
+    inverse FFT per frame followed by a polyphase interpolation filter,
+    instead of resampling, frequency shifting and summing each channel
+    separately.
+
+    Parameters
+    ----------
+    g : array_like
+        1-D prototype low-pass synthesis filter, usually the same filter
+        used for analysis. It is zero-padded to a multiple of `n_chans`.
+    n_chans : int
+        Number of channels in the filter bank.
+    oversample : int, optional
+        Channel oversampling factor used for analysis. Each input frame
+        produces ``n_chans // oversample`` output samples. Must divide
+        `n_chans`. Default is 1.
+    channels : array_like of int, optional
+        Indices of the channels present in the input. Missing channels are
+        treated as zero. Default is all `n_chans` channels, in order.
+    layout : {'channel', 'time'}, optional
+        Layout of the input array: ``'channel'`` is
+        ``(..., n_channels, n_frames)`` and ``'time'`` is
+        ``(..., n_frames, n_channels)``, matching the layouts produced by
+        `Channelizer`. Default is ``'channel'``.
+
+    Attributes
+    ----------
+    n_taps : int
+        Number of taps per polyphase branch.
+    hop : int
+        Number of output samples produced per input frame.
+
+    Notes
+    -----
+    The synthesis filter is scaled by `hop` so that a prototype with unit
+    DC gain reconstructs signals with unit gain. The output is delayed by
+    the sum of the group delays of the analysis and synthesis filters less
+    ``hop - 1`` samples, i.e. ``len(g) - hop`` samples when both filters
+    have the same length.
+
+    Near-perfect reconstruction requires the shifted products of the
+    analysis and synthesis responses to sum to a constant. With
+    ``oversample=2`` this holds for an analysis prototype that is flat
+    over the synthesis passband, e.g. ``firwin(n, 1.5 / n_chans)``,
+    paired with a Nyquist synthesis prototype such as
+    ``firwin(n, 1.0 / n_chans)``.
+
+    Input of any dimensionality is accepted, with leading axes treated as
+    independent streams. NumPy inputs are processed on the host with an
+    equivalent NumPy implementation.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> h = cusignal.firwin(64 * 16, 1.5 / 64)
+    >>> g = cusignal.firwin(64 * 16, 1.0 / 64)
+    >>> chan = cusignal.Channelizer(h, 64, oversample=2)
+    >>> synth = cusignal.Synthesizer(g, 64, oversample=2)
+    >>> x = cp.random.randn(2 ** 16) + 1j * cp.random.randn(2 ** 16)
+    >>> y = synth(chan(x))
+
+    """
+
+    def __init__(
+        self, g, n_chans, oversample=1, channels=None, layout="channel"
+    ):
+        n_chans = int(n_chans)
+        oversample = int(oversample)
+        if n_chans < 1:
+            raise ValueError("n_chans must be >= 1")
+        if oversample < 1 or n_chans % oversample:
+            raise ValueError("oversample must be >= 1 and divide n_chans")
+        if layout not in ("channel", "time"):
+            raise ValueError("layout must be 'channel' or 'time'")
+
+        g = cp.asnumpy(g)
+        if g.ndim != 1 or g.size == 0:
+            raise ValueError("g must be 1-D with non-zero length")
+
+        if channels is not None:
+            channels = np.asarray(cp.asnumpy(channels), dtype=np.int64)
+            if channels.ndim != 1 or np.any(
+                (channels < 0) | (channels >= n_chans)
+            ):
+                raise ValueError(
+                    "channels must be 1-D indices in [0, n_chans)"
+                )
+
+        self.n_chans = n_chans
+        self.oversample = oversample
+        self.channels = channels
+        self.layout = layout
+        self.hop = n_chans // oversample
+        self.n_taps = -(-g.size // n_chans)
+        self._n_phases = self.n_taps * oversample
+
+        # Scale for unit-gain reconstruction and for the unnormalized
+        # inverse FFT over channels.
+        g_full = np.zeros(self.n_taps * n_chans, g.dtype)
+        g_full[: g.size] = g
+        self._g = g_full * (self.hop * n_chans)
+
+        # Modulate relative to the last tap, mirroring the time-reversed
+        # analysis filter, so the channel phases cancel on recombination.
+        self._phase = -(g.size - 1) % n_chans
+        self._g_cache = {}
+
+        self.reset()
+
+    def reset(self):
+        """Clear the filter state."""
+        self._hist = None
+        self._frame = 0
+
+    def _taps(self, xp, dtype):
+        key = (xp.__name__, str(dtype))
+        g = self._g_cache.get(key)
+        if g is None:
+            g = xp.asarray(self._g.astype(dtype))
+            self._g_cache[key] = g
+        return g
+
+    def __call__(self, y):
+        """
+        Synthesize the next block of frames.
+
+        Parameters
+        ----------
+        y : array_like
+            Next block of channelized frames in the configured layout.
+
+        Returns
+        -------
+        x : ndarray
+            Reconstructed complex samples, ``hop`` per input frame, with
+            time along the last axis.
+        """
+        xp = cp.get_array_module(y)
+        y = xp.asarray(y)
+        if y.ndim < 2:
+            raise ValueError("y must be at least 2-D")
+
+        n_in = self.n_chans if self.channels is None else self.channels.size
+        if self.layout == "channel":
+            y = xp.swapaxes(y, -1, -2)
+        if y.shape[-1] != n_in:
+            raise ValueError(
+                "Expected {} channels, got {}".format(n_in, y.shape[-1])
+            )
+
+        dtype = np.result_type(y.dtype, np.complex64)
+        g = self._taps(xp, np.finfo(dtype).dtype)
+
+        # Scatter the active channels into a full, time-major frame so a
+        # single batched inverse FFT handles every channel.
+        if self.channels is None:
+            frames = y
+        else:
+            frames = xp.zeros(y.shape[:-1] + (self.n_chans,), dtype)
+            frames[..., xp.asarray(self.channels)] = y
+        u = xp.fft.ifft(frames, axis=-1).astype(dtype, copy=False)
+
+        n_frames = u.shape[-2]
+        P = self._n_phases
+        if (
+            self._hist is None
+            or self._hist.shape[:-2] != u.shape[:-2]
+            or cp.get_array_module(self._hist) is not xp
+        ):
+            self._hist = xp.zeros(
+                u.shape[:-2] + (P - 1, self.n_chans), dtype
+            )
+
+        ub = xp.concatenate((self._hist.astype(dtype), u), -2)
+
+        if xp is cp:
+            ub = cp.ascontiguousarray(ub)
+            x = cp.empty(u.shape[:-2] + (n_frames * self.hop,), dtype)
+            if x.size:
+                _synthesizer_kernel(
+                    ub,
+                    g,
+                    self.n_chans,
+                    P,
+                    self.hop,
+                    n_frames,
+                    self._frame % self.oversample,
+                    self._phase,
+                    x,
+                )
+        else:
+            x = _synthesize_numpy(
+                ub,
+                g,
+                self.n_chans,
+                P,
+                self.hop,
+                n_frames,
+                self._frame % self.oversample,
+                self._phase,
+            )
+
+        self._hist = ub[..., ub.shape[-2] - (P - 1) :, :].copy()
+        self._frame += n_frames
+
+        return x
@@ -0,0 +1,268 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cupy as cp
+import numpy as np
+
+from numpy.lib.stride_tricks import as_strided
+
+from .nco import (
+    NCO,
+    _PHASE_BITS,
+    _get_lut,
+    _nco_exact_osc,
+    _nco_lut_osc,
+    _nco_lut_prep,
+    _osc_numpy,
+)
+from .resample import _design_lowpass
+
+
+def _ddc_kernel(osc, lut):
+    in_params = "raw T x, raw Y h, raw uint64 phase, raw uint64 inc, \
+        int64 n_taps, int64 q, int64 start, int64 n_tuners, int64 n_out, \
+        int64 row_len"
+    if lut:
+        in_params += ", raw complex64 lut"
+
+    return cp.ElementwiseKernel(
+        in_params,
+        "Y out",
+        """
+        const long long per_row { n_tuners * n_out };
+        const long long row { i / per_row };
+        const long long k { ( i % per_row ) / n_out };
+        const long long t { start + ( i % n_out ) * q };
+
+        // Only the kept output samples are filtered, with taps that were
+        // modulated up to the tuner frequency.
+        const T *xr { &x[row * row_len + t + n_taps - 1] };
+        const Y *hr { &h[k * n_taps] };
+
+        Y acc {};
+        for ( int j = 0; j < n_taps; j++ ) {
+            acc += hr[j] * xr[-j];
+        }
+
+        // Then mix the decimated sample down to baseband.
+        const unsigned long long ph { phase[k] + inc[k] * t };
+        """
+        + osc
+        + "out = acc * osc;",
+        "_ddc_{}".format("lut" if lut else "exact"),
+        options=("-std=c++11",),
+        loop_prep=_nco_lut_prep if lut else "",
+    )
+
+
+_ddc_kernels = {
+    True: _ddc_kernel(_nco_lut_osc, True),
+    False: _ddc_kernel(_nco_exact_osc, False),
+}
+
+
+class DDC(object):
+    """
+    Stateful digital down-converter.
+
+    Mixes a signal down from one or more tuner frequencies, low-pass
+    filters and decimates it by `q` in a single fused kernel. Mixing is
+    moved behind the filter by modulating the filter taps, so only the
+    samples kept after decimation are ever computed and no full-rate
+    intermediate is stored. Filter history, decimation phase and
+    oscillator phase are carried between calls.
+
+    Parameters
+    ----------
+    freq : float or array_like
+        Tuner frequency in Hz, shifted down to DC. An array of frequencies
+        extracts every channel from the same input in one pass.
+    fs : float
+        Sampling rate of the input signal.
+    q : int
+        Decimation factor.
+    h : array_like, optional
+        1-D low-pass filter applied at the input rate. Default is the
+        filter used by `decimate`: a Hamming-windowed FIR of ``20 * q + 1``
+        taps with cutoff ``1 / q``.
+    phase : float or array_like, optional
+        Initial oscillator phase in radians. Default is 0.
+    dtype : {complex64, complex128}, optional
+        Output precision. Inputs of higher precision are processed in their
+        own precision. Default is complex64.
+
+    Attributes
+    ----------
+    freq : float or ndarray
+        Tuner frequency in Hz. Assigning a new value retunes without a
+        phase discontinuity.
+    n_taps : int
+        Length of the low-pass filter.
+
+    Notes
+    -----
+    Output sample ``m`` of a stream is the filter output at input sample
+    ``m * q``, equal to::
+
+        np.convolve(freq_shift(x, freq, fs), h)[::q]
+
+    with zero initial conditions. The output is therefore delayed by the
+    group delay of `h`.
+
+    NumPy inputs are processed on the host with an equivalent NumPy
+    implementation.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> ddc = cusignal.DDC([-20e6, 5e6, 31e6], fs=100e6, q=50)
+    >>> x = cp.random.randn(2 ** 20).astype(cp.complex64)
+    >>> y = ddc(x)  # (3, 20972), one row per tuner
+
+    """
+
+    def __init__(self, freq, fs, q, h=None, phase=0.0, dtype=np.complex64):
+        q = int(q)
+        if q < 1:
+            raise ValueError("q must be >= 1")
+
+        if h is None:
+            h = _design_lowpass(20 * q + 1, 1.0 / q, "hamming", False)
+        h = cp.asnumpy(h)
+        if h.ndim != 1 or h.size == 0:
+            raise ValueError("h must be 1-D with non-zero length")
+
+        self.q = q
+        self.fs = float(fs)
+        self.n_taps = h.size
+        self._h = h
+        self._nco = NCO(freq, fs, phase, dtype)
+        self._retune()
+        self.reset()
+
+    def reset(self):
+        """Clear the filter state and restore the initial phase."""
+        self._nco.reset()
+        self._hist = None
+        self._start = 0
+
+    @property
+    def dtype(self):
+        return self._nco.dtype
+
+    @property
+    def freq(self):
+        return self._nco.freq
+
+    @freq.setter
+    def freq(self, freq):
+        self._nco.freq = freq
+        self._retune()
+
+    def _retune(self):
+        # Modulate the taps with the quantized tuner frequencies so the
+        # filter and the oscillator agree exactly.
+        turns = np.ldexp(self._nco._inc.astype(np.float64), -_PHASE_BITS)
+        j = np.arange(self.n_taps)
+        self._hk = self._h * np.exp(2j * np.pi * turns.reshape(-1, 1) * j)
+        self._hk_cache = {}
+
+    def _taps(self, xp, dtype):
+        key = (xp.__name__, str(dtype))
+        h = self._hk_cache.get(key)
+        if h is None:
+            h = xp.asarray(self._hk.astype(dtype))
+            self._hk_cache[key] = h
+        return h
+
+    def __call__(self, x):
+        """
+        Down-convert the next block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of input samples, time along the last axis. Leading
+            axes are independent streams.
+
+        Returns
+        -------
+        y : ndarray
+            Decimated baseband samples of shape
+            ``x.shape[:-1] + freq.shape + (n_out,)``.
+        """
+        xp = cp.get_array_module(x)
+        x = xp.asarray(x)
+
+        out_dtype = np.result_type(x.dtype, self.dtype)
+        x_dtype = out_dtype if x.dtype.kind == "c" else out_dtype.char.lower()
+        x = x.astype(x_dtype, copy=False)
+
+        n = x.shape[-1]
+        L = self.n_taps
+        if (
+            self._hist is None
+            or self._hist.shape[:-1] != x.shape[:-1]
+            or cp.get_array_module(self._hist) is not xp
+        ):
+            self._hist = xp.zeros(x.shape[:-1] + (L - 1,), x_dtype)
+
+        xb = xp.concatenate((self._hist.astype(x_dtype), x), -1)
+        start = self._start
+        n_out = max(0, -(-(n - start) // self.q))
+
+        phase = self._nco._phase.ravel()
+        inc = np.broadcast_to(self._nco._inc, self._nco._phase.shape).ravel()
+        tuners = self._nco._phase.shape
+        hk = self._taps(xp, out_dtype)
+
+        if xp is cp:
+            xb = cp.ascontiguousarray(xb)
+            y = cp.empty(x.shape[:-1] + (phase.size, n_out), out_dtype)
+            lut = out_dtype == np.complex64
+            args = (
+                xb,
+                hk,
+                cp.asarray(phase),
+                cp.asarray(inc),
+                L,
+                self.q,
+                start,
+                phase.size,
+                n_out,
+                xb.shape[-1],
+            )
+            if lut:
+                args += (_get_lut(),)
+            if y.size:
+                _ddc_kernels[lut](*args, y)
+        else:
+            s = xb.strides
+            frames = as_strided(
+                xb[..., start:],
+                shape=xb.shape[:-1] + (n_out, L),
+                strides=s[:-1] + (self.q * s[-1], s[-1]),
+                writeable=False,
+            )
+            y = np.einsum("...ml,kl->...km", frames, hk[:, ::-1])
+            t = (start + self.q * np.arange(n_out)).astype(np.uint64)
+            with np.errstate(over="ignore"):
+                ph = phase[:, None] + inc[:, None] * t
+            y = (y * _osc_numpy(ph)).astype(out_dtype)
+
+        self._hist = xb[..., n:].copy()
+        self._start = start + n_out * self.q - n
+        self._nco._advance(n)
+
+        return y.reshape(x.shape[:-1] + tuners + (n_out,))
@@ -12,31 +12,78 @@
 # limitations under the License.
 
 import cupy as cp
-from cupy import linalg
 
 import numpy as np
 
 from ._channelizer_cuda import _channelizer
-from ..convolution.correlate import correlate
+from .channelizer import Channelizer
 from ..filter_design.filter_design_utils import _validate_sos
 from ._sosfilt_cuda import _sosfilt
+from ._upfirdn_cuda import _UpFIRDn
 from ..convolution.convolve import fftconvolve
+from ..utils._caches import _detrend_cache, _hilbert_cache
+from ..utils.cost_model import _use_fft_filter
 from ..utils.helper_tools import _get_max_smem, _get_max_tpb
+from ..windows.windows import get_window
 
 
 _wiener_prep_kernel = cp.ElementwiseKernel(
-    "T iMean, T iVar, T prod",
+    "T s1, T s2, T prod, T shift, T frac",
     "T lMean, T lVar",
     """
-    // Estimate the local mean
-    T temp { iMean / prod };
-    lMean = temp;
-    lVar = iVar / prod - (temp * temp);
+    // Moments were accumulated about `shift`; `frac` is the fraction of
+    // the window inside the array, which is 1 away from the edges.
+    const T a { s1 / prod };
+    lMean = a + shift * frac;
+    lVar = s2 / prod - a * a + shift * ( 1 - frac ) * ( 2 * a + shift * frac );
     """,
     "_wiener_prep_kernel",
     options=("-std=c++11",),
 )
 
+_box_sum_kernel = cp.ElementwiseKernel(
+    "raw T csum, int64 n, int64 inner, int64 before, int64 after",
+    "T out",
+    """
+    // Windowed sum from a cumulative sum along the axis, so the cost does
+    // not depend on the window size.
+    const long long k { ( i / inner ) % n };
+    const long long base { i - k * inner };
+    const long long hi { min( k + after, n - 1 ) };
+    const long long lo { k - before - 1 };
+
+    T s { csum[base + hi * inner] };
+    if ( lo >= 0 ) {
+        s -= csum[base + lo * inner];
+    }
+    out = s;
+    """,
+    "_box_sum_kernel",
+    options=("-std=c++11",),
+)
+
+
+def _box_sum(x, axis, size):
+    """
+    Sum over a window of `size` along `axis` with zero padding, aligned
+    like ``correlate(x, ones(size), "same")``.
+    """
+    if size == 1:
+        return x
+    # The kernel indexes the running sum as C-contiguous memory
+    csum = cp.ascontiguousarray(cp.cumsum(x, axis=axis))
+    out = cp.empty(csum.shape, csum.dtype)
+    _box_sum_kernel(
+        csum,
+        x.shape[axis],
+        _prod(x.shape[axis + 1 :]),
+        size // 2,
+        (size - 1) // 2,
+        out,
+    )
+    return out
+
+
 _wiener_post_kernel = cp.ElementwiseKernel(
     "T im, T lMean, T lVar, T noise",
     "T out",
@@ -70,46 +117,77 @@ def wiener(im, mysize=None, noise=None):
         A scalar or an N-length list giving the size of the Wiener filter
         window in each dimension.  Elements of mysize should be odd.
         If mysize is a scalar, then this scalar is used as the size
-        in each dimension.
+        in each dimension. If it has fewer than N elements, it applies to
+        the trailing dimensions and `im` is treated as a stack of
+        independent arrays along the leading ones.
     noise : float, optional
         The noise-power to use. If None, then noise is estimated as the
-        average of the local variance of the input.
+        average of the local variance of the input, separately for each
+        array of a stack.
 
     Returns
     -------
     out : ndarray
         Wiener filtered result with the same shape as `im`.
 
+    Notes
+    -----
+    The local mean and variance are computed from running sums along each
+    dimension, so the cost does not depend on the window size. Single
+    precision inputs are filtered in single precision.
+
     """
     im = cp.asarray(im)
+    if im.dtype.char not in "fd":
+        im = im.astype(np.float64)
     if mysize is None:
         mysize = [3] * im.ndim
     mysize = np.asarray(mysize)
     if mysize.shape == ():
-        mysize = cp.repeat(mysize.item(), im.ndim)
-        mysize = np.asarray(mysize)
-
-    lprod = cp.prod(mysize, axis=0)
-    lMean = correlate(im, cp.ones(mysize), "same")
-    lVar = correlate(im ** 2, cp.ones(mysize), "same")
-
-    lMean, lVar = _wiener_prep_kernel(lMean, lVar, lprod)
+        mysize = np.repeat(mysize.item(), im.ndim)
+    if mysize.size > im.ndim:
+        raise ValueError("mysize has more dimensions than im")
+
+    # Leading axes without a window size are independent images
+    axes = tuple(range(im.ndim - mysize.size, im.ndim))
+    lprod = int(np.prod(mysize))
+
+    # Accumulate the local moments about the mean of each image to keep
+    # the running sums small.
+    shift = cp.mean(im, axis=axes, keepdims=True)
+    dev = im - shift
+    s1 = dev
+    s2 = dev * dev
+    frac = 1.0
+    for axis, size in zip(axes, mysize.tolist()):
+        s1 = _box_sum(s1, axis, size)
+        s2 = _box_sum(s2, axis, size)
+
+        n = im.shape[axis]
+        k = cp.arange(n)
+        count = cp.minimum(k + (size - 1) // 2, n - 1)
+        count -= cp.maximum(k - size // 2, 0) - 1
+        shape = [1] * im.ndim
+        shape[axis] = n
+        frac = frac * (count.astype(im.dtype) / size).reshape(shape)
+
+    lMean, lVar = _wiener_prep_kernel(s1, s2, lprod, shift, frac)
 
     # Estimate the noise power if needed.
     if noise is None:
-        noise = cp.mean(cp.ravel(lVar), axis=0)
+        noise = cp.mean(lVar, axis=axes, keepdims=True)
 
     return _wiener_post_kernel(im, lMean, lVar, noise)
 
 
-def firfilter(b, x, axis=None, zi=None):
+def firfilter(b, x, axis=None, zi=None, method="auto"):
     """
     Filter data along one-dimension with an FIR filter.
 
     Filter a data sequence, `x`, using a digital filter. This works for many
     fundamental data types (including Object type). Please note, cuSignal
-    doesn't support IIR filters presently, and this implementation is optimized
-    for large filtering operations (and inherently depends on fftconvolve)
+    doesn't support IIR filters presently. Filtering is done either directly
+    or with `fftconvolve`, whichever is expected to be faster.
 
     Parameters
     ----------
@@ -126,6 +204,12 @@ def firfilter(b, x, axis=None, zi=None):
         (or array of vectors for an N-dimensional input) of length
         ``max(len(a), len(b)) - 1``.  If `zi` is None or is not given then
         initial rest is assumed.  See `lfiltic` for more information.
+    method : {'auto', 'direct', 'fft'}, optional
+        'direct' evaluates the filter sum for every output sample and
+        requires a 1-D `b`. 'fft' uses `fftconvolve`. The default, 'auto',
+        picks whichever the cost model predicts to be faster for the
+        filter length, signal length and number of signals; see
+        `get_cost_model`.
 
     Returns
     -------
@@ -153,6 +237,30 @@ def firfilter(b, x, axis=None, zi=None):
             supported"
         )
 
+    b = cp.asarray(b)
+    x = cp.asarray(x)
+    if method not in ("auto", "direct", "fft"):
+        raise ValueError(
+            "Acceptable method flags are 'auto', 'direct', or 'fft'."
+        )
+
+    if method == "auto":
+        if b.ndim != 1 or x.ndim == 0:
+            method = "fft"
+        else:
+            n = x.shape[-1 if axis is None else axis]
+            fast = _use_fft_filter(b.size, n, x.size // max(n, 1))
+            method = "fft" if fast else "direct"
+
+    if method == "direct":
+        if b.ndim != 1:
+            raise ValueError("The direct method requires 1-D coefficients")
+        axis = -1 if axis is None else axis
+        y = _UpFIRDn(b, x.dtype, 1, 1).apply_filter(x, axis)
+        keep = [slice(None)] * x.ndim
+        keep[axis] = slice(0, x.shape[axis])
+        return y[tuple(keep)]
+
     y = fftconvolve(b, x, mode="full", axes=axis)
     return y[: len(x)]
 
@@ -249,7 +357,7 @@ def sosfilt(
     inputs = [sos, x]
 
     if zi is not None:
-        inputs.append(np.asarray(zi))
+        inputs.append(cp.asarray(zi))
 
     dtype = cp.result_type(*inputs)
 
@@ -325,35 +433,21 @@ def sosfilt(
     return out
 
 
-_hilbert_kernel = cp.ElementwiseKernel(
-    "",
-    "float64 h",
+def _hilbert_mask(N, dtype):
     """
-    if ( !odd ) {
-        if ( ( i == 0 ) || ( i == bend ) ) {
-            h = 1.0;
-        } else if ( i > 0 && i < bend ) {
-            h = 2.0;
-        } else {
-            h = 0.0;
-        }
-    } else {
-        if ( i == 0 ) {
-            h = 1.0;
-        } else if ( i > 0 && i < bend) {
-            h = 2.0;
-        } else {
-            h = 0.0;
-        }
-    }
-    """,
-    "_hilbert_kernel",
-    options=("-std=c++11",),
-    loop_prep="const bool odd { _ind.size() & 1 }; \
-               const int bend = odd ? \
-                   static_cast<int>( 0.5 * ( _ind.size()  + 1 ) ) : \
-                   static_cast<int>( 0.5 * _ind.size() );",
-)
+    Weights turning the ``N // 2 + 1`` bins of a real FFT into the
+    non-negative half of an analytic spectrum, cached by length and type.
+    """
+    key = (N, str(dtype))
+    h = _hilbert_cache.get(key)
+    if h is None:
+        h = np.full(N // 2 + 1, 2, dtype=dtype)
+        h[0] = 1
+        if N % 2 == 0:
+            h[-1] = 1
+        h = cp.asarray(h)
+        _hilbert_cache.put(key, h)
+    return h
 
 
 def hilbert(x, N=None, axis=-1):
@@ -390,6 +484,13 @@ def hilbert(x, N=None, axis=-1):
     transformed signal can be obtained from ``cp.imag(hilbert(x))``, and the
     original signal from ``cp.real(hilbert(x))``.
 
+    Only the non-negative frequencies are computed, with a real FFT, and
+    the weights applied to them are cached by length and data type. Single
+    precision input produces a ``complex64`` result; other real inputs
+    produce ``complex128``. Every 1-D array along `axis` is transformed in
+    one batched FFT. For data that arrives in blocks, see
+    `HilbertTransformer`.
+
     Examples
     ---------
     In this example we use the Hilbert transform to determine the amplitude
@@ -450,16 +551,175 @@ def hilbert(x, N=None, axis=-1):
         N = x.shape[axis]
     if N <= 0:
         raise ValueError("N must be positive.")
+    if x.dtype.kind != "f":
+        x = x.astype(np.float64)
+    elif x.dtype == np.float16:
+        x = x.astype(np.float32)
+
+    # Only the non-negative half of the spectrum is computed and weighted;
+    # the negative half of the analytic spectrum is zero.
+    axis = axis % x.ndim
+    Xf = cp.fft.rfft(x, N, axis=axis)
+    h = _hilbert_mask(N, x.dtype)
+    h = h.reshape((-1,) + (1,) * (x.ndim - 1 - axis))
+
+    shape = list(Xf.shape)
+    shape[axis] = N
+    Zf = cp.zeros(shape, Xf.dtype)
+    half = (slice(None),) * axis + (slice(0, Xf.shape[axis]),)
+    cp.multiply(Xf, h, out=Zf[half])
+
+    return cp.fft.ifft(Zf, axis=axis)
+
+
+_fir_hilbert_kernel = cp.ElementwiseKernel(
+    "raw T x, raw T g, int64 M, int64 n_half, int64 n_out, int64 row_len",
+    "C out",
+    """
+    // Centre of the filter for this output sample
+    const T *xc { &x[( i / n_out ) * row_len + ( i % n_out ) + M] };
+
+    // The transformer is antisymmetric with zero even taps, so each pair
+    // of odd taps costs one multiply.
+    T acc {};
+    for ( int j = 0; j < n_half; j++ ) {
+        const int k { 2 * j + 1 };
+        acc += g[j] * ( xc[-k] - xc[k] );
+    }
+    out = C( xc[0], acc );
+    """,
+    "_fir_hilbert_kernel",
+    options=("-std=c++11",),
+)
 
-    Xf = cp.fft.fft(x, N, axis=axis)
-    h = _hilbert_kernel(size=N)
 
-    if x.ndim > 1:
-        ind = [cp.newaxis] * x.ndim
-        ind[axis] = slice(None)
-        h = h[tuple(ind)]
-    x = cp.fft.ifft(Xf * h, axis=axis)
-    return x
+class HilbertTransformer(object):
+    """
+    Stateful FIR Hilbert transformer for streaming data.
+
+    Produces the analytic signal of a real signal that arrives in blocks.
+    The imaginary part is the output of a windowed type III FIR Hilbert
+    transformer and the real part is the input delayed by the same group
+    delay, so the output is continuous across blocks.
+
+    Parameters
+    ----------
+    numtaps : int, optional
+        Length of the transformer; must be odd. Lengths of the form
+        ``4 * k + 3`` have no zero taps at the ends. Default is 63.
+    window : string or tuple of string and parameter values, optional
+        Window applied to the ideal impulse response. See
+        `cusignal.get_window` for a list of windows and required
+        parameters. Default is 'hamming'.
+
+    Attributes
+    ----------
+    delay : int
+        Group delay of the output in samples, ``(numtaps - 1) // 2``.
+
+    Notes
+    -----
+    Unlike `hilbert`, the transformer is only accurate away from DC and
+    Nyquist; the width of the transition bands shrinks as `numtaps`
+    grows. Half of the taps of a Hilbert transformer are zero and the
+    others are antisymmetric, so each output sample costs
+    ``(numtaps + 1) // 4`` multiplies.
+
+    Single precision input produces ``complex64`` output and any other
+    real input ``complex128``. NumPy inputs are processed on the host with
+    an equivalent NumPy implementation.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> ht = cusignal.HilbertTransformer(127)
+    >>> x = cp.random.randn(1000, 4096).astype(cp.float32)
+    >>> env = cp.abs(ht(x))  # next block continues seamlessly
+
+    """
+
+    def __init__(self, numtaps=63, window="hamming"):
+        numtaps = int(numtaps)
+        if numtaps < 3 or numtaps % 2 == 0:
+            raise ValueError("numtaps must be odd and at least 3")
+
+        M = (numtaps - 1) // 2
+        k = np.arange(1, M + 1, 2)
+        win = cp.asnumpy(get_window(window, numtaps, fftbins=False))
+
+        self.numtaps = numtaps
+        self.delay = M
+        # Taps at offsets +k from the centre; those at -k are negated
+        self._g = 2.0 / (np.pi * k) * win[M + k]
+        self._cache = {}
+        self.reset()
+
+    def reset(self):
+        """Clear the filter history."""
+        self._hist = None
+
+    def _taps(self, xp, dtype):
+        key = (xp.__name__, str(dtype))
+        g = self._cache.get(key)
+        if g is None:
+            g = xp.asarray(self._g.astype(dtype))
+            self._cache[key] = g
+        return g
+
+    def __call__(self, x):
+        """
+        Transform the next block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of real input samples, time along the last axis.
+            Leading axes are independent streams.
+
+        Returns
+        -------
+        xa : ndarray
+            Analytic signal, delayed by `delay` samples.
+        """
+        xp = cp.get_array_module(x)
+        x = xp.asarray(x)
+        if xp.iscomplexobj(x):
+            raise ValueError("x must be real.")
+        if x.dtype != np.float32:
+            x = x.astype(np.float64, copy=False)
+
+        n = x.shape[-1]
+        M = self.delay
+        if (
+            self._hist is None
+            or self._hist.shape[:-1] != x.shape[:-1]
+            or cp.get_array_module(self._hist) is not xp
+        ):
+            self._hist = xp.zeros(x.shape[:-1] + (2 * M,), x.dtype)
+
+        xb = xp.concatenate((self._hist.astype(x.dtype), x), -1)
+        g = self._taps(xp, x.dtype)
+        out_dtype = np.result_type(x.dtype, np.complex64)
+
+        if xp is cp:
+            xb = cp.ascontiguousarray(xb)
+            y = cp.empty(x.shape, out_dtype)
+            if y.size:
+                _fir_hilbert_kernel(xb, g, M, g.size, n, xb.shape[-1], y)
+        else:
+            y = np.empty(x.shape, out_dtype)
+            y.real = xb[..., M : M + n]
+            y.imag = 0
+            for j, gj in enumerate(g):
+                k = 2 * j + 1
+                early = xb[..., M - k : M - k + n]
+                late = xb[..., M + k : M + k + n]
+                y.imag += gj * (early - late)
+
+        self._hist = xb[..., n:].copy()
+
+        return y
 
 
 _hilbert2_kernel = cp.ElementwiseKernel(
@@ -550,23 +810,54 @@ def hilbert2(x, N=None):
     return x
 
 
-_detrend_A_kernel = cp.ElementwiseKernel(
-    "",
-    "float64 A",
+_detrend_kernel = cp.ElementwiseKernel(
+    "T y, raw T coef, int32 seg, R r, int64 n, int64 n_coef",
+    "T out",
     """
-    if ( i & 1 ) {
-        const int new_i { i >> 1 };
-        A = new_i * den;
-    } else {
-        A = 1.0;
-    }
+    const T *c { &coef[( i / n ) * n_coef + 2 * seg] };
+    out = y - ( c[0] + c[1] * r );
     """,
-    "_detrend_A_kernel",
+    "_detrend_kernel",
     options=("-std=c++11",),
-    loop_prep="const double den { 1.0 / _ind.size() };",
 )
 
 
+def _detrend_regressors(N, bp, dtype):
+    """
+    Segment index and centered index of every sample for a piecewise
+    linear least-squares fit.
+
+    Within each segment the fit is expressed in terms of the centered
+    index ``r``, so the intercept and slope decouple into ``mean(y)`` and
+    ``sum(r * y) / sum(r ** 2)``. Both are recovered from segmented sums of
+    the data, so only these per-sample indices are kept.
+    """
+    key = (N, tuple(int(b) for b in bp), dtype.char)
+    regs = _detrend_cache.get(key)
+    if regs is None:
+        real = np.finfo(dtype).dtype
+        n = np.diff(bp)
+        seg = np.repeat(np.arange(n.size), n)
+        r = np.arange(N) - bp[seg] - (n[seg] - 1) / 2.0
+
+        regs = (
+            cp.asarray(seg, dtype=np.int32),
+            cp.asarray(r, dtype=real),
+        )
+        _detrend_cache.put(key, regs)
+    return regs
+
+
+def _segment_sums(x, bp, acc):
+    """
+    Sums of `x` over the segments between consecutive breakpoints along the
+    last axis, as differences of a running sum accumulated in `acc`.
+    """
+    csum = cp.zeros(x.shape[:-1] + (x.shape[-1] + 1,), acc)
+    cp.cumsum(x, axis=-1, dtype=acc, out=csum[..., 1:])
+    return csum[..., bp[1:]] - csum[..., bp[:-1]]
+
+
 def detrend(data, axis=-1, type="linear", bp=0, overwrite_data=False):
     """
     Remove linear trend along axis from data.
@@ -595,6 +886,15 @@ def detrend(data, axis=-1, type="linear", bp=0, overwrite_data=False):
     ret : ndarray
         The detrended input data.
 
+    Notes
+    -----
+    The linear fit of every segment and every 1-D slice is computed in
+    closed form from running sums of the data taken at the break points,
+    followed by a single pass that subtracts the fitted lines, so the work
+    is linear in the size of `data` regardless of the number of segments.
+    The segment and centered index of every sample are cached per data
+    length and set of break points.
+
     Examples
     --------
     >>> import cusignal
@@ -613,11 +913,12 @@ def detrend(data, axis=-1, type="linear", bp=0, overwrite_data=False):
     if dtype not in "dfDF":
         dtype = "d"
     if type in ["constant", "c"]:
-        ret = data - cp.expand_dims(cp.mean(data, axis), axis)
-        return ret
+        mean = cp.expand_dims(cp.mean(data, axis), axis)
+        if overwrite_data and data.dtype.char in "dfDF":
+            return cp.subtract(data, mean, out=data)
+        return data - mean
     else:
-        dshape = data.shape
-        N = dshape[axis]
+        N = data.shape[axis]
         bp = np.sort(np.unique(np.r_[0, bp, N]))
         if np.any(bp > N):
             raise ValueError(
@@ -625,39 +926,30 @@ def detrend(data, axis=-1, type="linear", bp=0, overwrite_data=False):
                 data along given axis."
             )
 
-        Nreg = len(bp) - 1
-        # Restructure data so that axis is along first dimension and
-        #  all other dimensions are collapsed into second dimension
-        rnk = len(dshape)
-        if axis < 0:
-            axis = axis + rnk
+        if data.dtype.char not in "dfDF":
+            data = data.astype(dtype)
+            overwrite_data = True
 
-        newdims = np.r_[axis, 0:axis, axis + 1 : rnk]
-        newdata = cp.reshape(
-            cp.transpose(data, tuple(newdims)), (N, _prod(dshape) // N)
-        )
+        # Fit every segment of every row from segmented sums of y and r * y,
+        # then subtract the fitted lines in one pass.
+        y = cp.moveaxis(data, axis, -1)
+        seg, r = _detrend_regressors(N, bp, y.dtype)
+        acc = "D" if y.dtype.kind == "c" else "d"
+
+        # sum(r ** 2) over a segment of n samples, in closed form
+        n = np.diff(bp)
+        r2 = n * (n * n - 1) / 12.0
+        inv_n = cp.asarray(1.0 / n)
+        inv_r2 = cp.asarray(np.where(r2 > 0, 1 / np.where(r2 > 0, r2, 1), 0))
+
+        coef = cp.empty(y.shape[:-1] + (n.size, 2), y.dtype)
+        coef[..., 0] = _segment_sums(y, bp, acc) * inv_n
+        coef[..., 1] = _segment_sums(y * r, bp, acc) * inv_r2
+
+        out = y if overwrite_data else cp.empty(y.shape, y.dtype)
+        _detrend_kernel(y, coef, seg, r, N, 2 * n.size, out)
 
-        if not overwrite_data:
-            newdata = newdata.copy()  # make sure we have a copy
-        if newdata.dtype.char not in "dfDF":
-            newdata = newdata.astype(dtype)
-
-        # Find leastsq fit and remove it for each piece
-        for m in range(Nreg):
-            Npts = int(bp[m + 1] - bp[m])
-            A = _detrend_A_kernel(size=Npts * 2)
-            A = cp.reshape(A, (Npts, 2))
-            sl = slice(bp[m], bp[m + 1])
-            coef, _, _, _ = linalg.lstsq(A, newdata[sl])
-            newdata[sl] = newdata[sl] - cp.dot(A, coef)
-
-        # Put data back in original shape.
-        tdshape = np.take(dshape, newdims, 0)
-        ret = cp.reshape(newdata, tuple(tdshape))
-        vals = list(range(1, rnk))
-        olddims = vals[:axis] + [0] + vals[axis:]
-        ret = cp.transpose(ret, tuple(olddims))
-        return ret
+        return data if overwrite_data else cp.moveaxis(out, -1, axis)
 
 
 _freq_shift_kernel = cp.ElementwiseKernel(
@@ -687,6 +979,10 @@ def freq_shift(x, freq, fs):
         Sampling rate of the signal
     domain : string
         freq or time
+
+    See Also
+    --------
+    NCO : Phase-continuous oscillator for shifting a signal block by block.
     """
     x = cp.asarray(x)
     return _freq_shift_kernel(x, freq, fs)
@@ -714,7 +1010,8 @@ def channelize_poly(x, h, n_chans):
     ----------
     Currently only supports simple channelizer where channel
     spacing is equivalent to the number of channels used (zero overlap).
-    Number of filter taps (len of filter / n_chans) must be <=32.
+    Filters with more than 32 taps per channel are handled by
+    `Channelizer`, which also supports oversampling and streaming.
 
     """
     dtype = cp.promote_types(x.dtype, h.dtype)
@@ -725,13 +1022,9 @@ def channelize_poly(x, h, n_chans):
     # number of taps in each h_n filter
     n_taps = int(len(h) / n_chans)
     if n_taps > 32:
-        raise NotImplementedError(
-            "The number of calculated taps ({}) in  \
-            each filter is currently capped at 32. Please reduce filter \
-                length or number of channels".format(
-                n_taps
-            )
-        )
+        # The fused kernel holds a branch in registers; longer filters go
+        # through the general channelizer instead.
+        return Channelizer(h[: n_taps * n_chans], n_chans)(x)
 
     # number of outputs
     n_pts = int(len(x) / n_chans)
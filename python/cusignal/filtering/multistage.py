@@ -0,0 +1,347 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cupy as cp
+import numpy as np
+
+from collections import namedtuple
+from numpy.lib.stride_tricks import as_strided
+
+from ..filter_design.fir_filter_design import firwin
+
+
+_sparse_fir_decimate_kernel = cp.ElementwiseKernel(
+    "raw T x, raw H h, raw int64 offs, int64 n_nz, int64 last, int64 q, \
+     int64 start, int64 n_out, int64 row_len",
+    "T out",
+    """
+    const long long row { i / n_out };
+    const long long t { start + ( i % n_out ) * q };
+    const T *xr { &x[row * row_len + t + last] };
+
+    // Only the non-zero taps are visited, which skips every other
+    // coefficient of a half-band filter.
+    T acc {};
+    for ( int j = 0; j < n_nz; j++ ) {
+        acc += h[j] * xr[-offs[j]];
+    }
+    out = acc;
+    """,
+    "_sparse_fir_decimate_kernel",
+    options=("-std=c++11",),
+)
+
+
+DecimationStage = namedtuple(
+    "DecimationStage", ["kind", "factor", "n_taps", "n_mults", "cost"]
+)
+DecimationStage.__doc__ = """\
+One stage of a `MultiStageDecimator`.
+
+kind : {'cic', 'halfband', 'fir'}
+factor : decimation factor of the stage
+n_taps : filter length
+n_mults : number of non-zero taps, i.e. multiplies per output sample
+cost : multiplies per sample at the input rate of the whole cascade
+"""
+
+
+def _smallest_factor(n):
+    f = 2
+    while f * f <= n:
+        if n % f == 0:
+            return f
+        f += 1
+    return n
+
+
+def _cic_taps(R, order):
+    """Impulse response of a CIC decimator, normalized to unit DC gain."""
+    h = np.ones(1)
+    for _ in range(order):
+        h = np.convolve(h, np.ones(R))
+    return h / R ** order
+
+
+def _halfband_taps(numtaps):
+    """Windowed-sinc half-band filter with its zero taps made exact."""
+    h = firwin(numtaps, 0.5, gpupath=False)
+    k = np.arange(numtaps) - (numtaps - 1) // 2
+    h[(k % 2 == 0) & (k != 0)] = 0.0
+    return h
+
+
+def _cic_compensator(numtaps, cutoff, cic_factor, cic_order, rate):
+    """
+    Low-pass FIR with cutoff `cutoff` (relative to Nyquist) whose passband
+    inverts the droop of a CIC decimator by `cic_factor` of order
+    `cic_order` that runs `rate` times faster than this filter.
+    """
+    nfft = 1 << (int(np.ceil(np.log2(numtaps))) + 4)
+    nu = np.arange(nfft // 2 + 1) / nfft
+
+    desired = np.zeros_like(nu)
+    band = nu <= cutoff / 2
+    f = nu[band] / rate
+    desired[band] = np.abs(np.sinc(f) / np.sinc(cic_factor * f)) ** cic_order
+
+    shift = np.exp(-1j * np.pi * nu * (numtaps - 1))
+    h = np.fft.irfft(desired * shift, nfft)[:numtaps] * np.hamming(numtaps)
+
+    return h / h.sum()
+
+
+class _FIRDecimator(object):
+    """Stateful FIR decimator that skips zero taps."""
+
+    def __init__(self, h, q):
+        h = np.asarray(h, dtype=np.float64)
+        nz = np.flatnonzero(h)
+        self.q = q
+        self.n_taps = h.size
+        self._h = h[nz]
+        self._offs = nz
+        self._cache = {}
+        self.reset()
+
+    def reset(self):
+        self._hist = None
+        self._start = 0
+
+    def _taps(self, xp, dtype):
+        key = (xp.__name__, str(dtype))
+        taps = self._cache.get(key)
+        if taps is None:
+            taps = (xp.asarray(self._h.astype(dtype)), xp.asarray(self._offs))
+            self._cache[key] = taps
+        return taps
+
+    def __call__(self, x):
+        xp = cp.get_array_module(x)
+        n = x.shape[-1]
+        last = self.n_taps - 1
+        if (
+            self._hist is None
+            or self._hist.shape[:-1] != x.shape[:-1]
+            or cp.get_array_module(self._hist) is not xp
+        ):
+            self._hist = xp.zeros(x.shape[:-1] + (last,), x.dtype)
+
+        xb = xp.concatenate((self._hist.astype(x.dtype), x), -1)
+        start = self._start
+        n_out = max(0, -(-(n - start) // self.q))
+        h, offs = self._taps(xp, np.finfo(x.dtype).dtype)
+
+        if xp is cp:
+            xb = cp.ascontiguousarray(xb)
+            y = cp.empty(x.shape[:-1] + (n_out,), x.dtype)
+            if y.size:
+                _sparse_fir_decimate_kernel(
+                    xb,
+                    h,
+                    offs,
+                    h.size,
+                    last,
+                    self.q,
+                    start,
+                    n_out,
+                    xb.shape[-1],
+                    y,
+                )
+        else:
+            s = xb.strides
+            frames = as_strided(
+                xb[..., start:],
+                shape=xb.shape[:-1] + (n_out, self.n_taps),
+                strides=s[:-1] + (self.q * s[-1], s[-1]),
+                writeable=False,
+            )
+            y = frames[..., last - offs].dot(h).astype(x.dtype, copy=False)
+
+        self._hist = xb[..., n:].copy()
+        self._start = start + n_out * self.q - n
+
+        return y
+
+
+class MultiStageDecimator(object):
+    """
+    Stateful multi-stage decimator for large rate changes.
+
+    Factors the decimation factor `q` into a CIC stage, up to
+    `max_halfbands` half-band stages and a final low-pass FIR that also
+    compensates the passband droop of the CIC::
+
+        q = cic_factor * 2 ** n_halfbands * fir_factor
+
+    The cascade needs far fewer multiplies than the single
+    ``20 * q + 1`` tap filter of `decimate`. Every stage keeps its filter
+    history and decimation phase between calls, computes only the samples
+    it keeps and skips the zero taps of the half-band filters.
+
+    Parameters
+    ----------
+    q : int
+        Total decimation factor.
+    cic_order : int, optional
+        Number of integrator/comb pairs of the CIC stage. Default is 4.
+    max_halfbands : int, optional
+        Maximum number of half-band stages. Default is 2.
+    halfband_taps : int, optional
+        Length of each half-band filter; must be of the form ``4 * k + 3``.
+        Default is 31.
+    fir_taps : int, optional
+        Length of the final compensating FIR. Default is
+        ``20 * fir_factor + 1``, as in `decimate`.
+
+    Attributes
+    ----------
+    stages : list of DecimationStage
+        The stages of the cascade, in processing order, with their cost in
+        multiplies per input sample.
+
+    Notes
+    -----
+    `q` is split as follows. If it is even, the final FIR decimates by 2
+    and up to `max_halfbands` further factors of 2 go to half-band
+    stages; otherwise the final FIR decimates by the smallest prime factor
+    of `q`. Whatever remains is decimated by the CIC, which is omitted if
+    the remainder is 1.
+
+    The CIC is evaluated in its non-recursive form, so floating point
+    inputs do not accumulate error in the integrators over long streams.
+
+    Output sample ``m`` corresponds to input sample ``m * q``; the output
+    is delayed by the sum of the group delays of the stages.
+
+    NumPy inputs are processed on the host with an equivalent NumPy
+    implementation.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> dec = cusignal.MultiStageDecimator(1000)
+    >>> [(s.kind, s.factor) for s in dec.stages]
+    [('cic', 125), ('halfband', 2), ('halfband', 2), ('fir', 2)]
+    >>> x = cp.random.randn(2 ** 22).astype(cp.float32)
+    >>> y = dec(x)  # 4195 samples
+
+    """
+
+    def __init__(
+        self,
+        q,
+        cic_order=4,
+        max_halfbands=2,
+        halfband_taps=31,
+        fir_taps=None,
+    ):
+        q = int(q)
+        if q < 1:
+            raise ValueError("q must be >= 1")
+        if halfband_taps % 4 != 3:
+            raise ValueError("halfband_taps must be of the form 4 * k + 3")
+
+        twos = 0
+        while (q >> twos) % 2 == 0:
+            twos += 1
+
+        if twos:
+            fir_factor = 2
+            n_halfbands = min(int(max_halfbands), twos - 1)
+        else:
+            fir_factor = _smallest_factor(q)
+            n_halfbands = 0
+        cic_factor = q // (fir_factor << n_halfbands)
+
+        if fir_taps is None:
+            fir_taps = 20 * fir_factor + 1
+
+        designs = []
+        if cic_factor > 1:
+            h = _cic_taps(cic_factor, cic_order)
+            designs.append(("cic", cic_factor, h))
+        for _ in range(n_halfbands):
+            designs.append(("halfband", 2, _halfband_taps(halfband_taps)))
+        if fir_factor > 1:
+            if cic_factor > 1:
+                h = _cic_compensator(
+                    fir_taps,
+                    1.0 / fir_factor,
+                    cic_factor,
+                    cic_order,
+                    cic_factor << n_halfbands,
+                )
+            else:
+                h = firwin(fir_taps, 1.0 / fir_factor, gpupath=False)
+            designs.append(("fir", fir_factor, h))
+
+        self.q = q
+        self._stages = []
+        self.stages = []
+        rate = 1
+        for kind, factor, h in designs:
+            stage = _FIRDecimator(h, factor)
+            n_mults = stage._h.size
+            self._stages.append(stage)
+            self.stages.append(
+                DecimationStage(
+                    kind, factor, h.size, n_mults, n_mults / (rate * factor)
+                )
+            )
+            rate *= factor
+
+    def cost(self):
+        """
+        Multiplies per input sample of the cascade.
+
+        Returns
+        -------
+        cost : float
+            Total multiplies per input sample. The single-stage filter of
+            `decimate` costs ``(20 * q + 1) / q``.
+        """
+        return sum(s.cost for s in self.stages)
+
+    def reset(self):
+        """Clear the state of every stage."""
+        for stage in self._stages:
+            stage.reset()
+
+    def __call__(self, x):
+        """
+        Decimate the next block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of input samples, time along the last axis. Leading
+            axes are independent streams.
+
+        Returns
+        -------
+        y : ndarray
+            Decimated samples.
+        """
+        xp = cp.get_array_module(x)
+        x = xp.asarray(x)
+        if x.dtype.kind not in "fc":
+            x = x.astype(np.float64)
+        elif x.dtype == np.float16:
+            x = x.astype(np.float32)
+
+        for stage in self._stages:
+            x = stage(x)
+
+        return x
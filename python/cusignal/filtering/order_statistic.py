@@ -0,0 +1,818 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cupy as cp
+import numpy as np
+
+from numba import njit, prange
+from numpy.lib.stride_tricks import as_strided
+
+from ..utils._caches import _cupy_kernel_cache
+
+# Windows up to this many elements are ordered with a sorting network held
+# in registers; larger ones are slid along an axis with a pair of heaps.
+_NETWORK_MAX = 32
+
+# Bound on the bytes of heap scratch space of one launch of the sliding
+# kernel; lines beyond it are filtered by further launches.
+_HEAP_SCRATCH_BYTES = 1 << 28
+
+# Number of threads the sliding kernel splits long lines into
+_HEAP_TARGET_THREADS = 1 << 15
+
+# Bound on the number of gathered window elements in the NumPy path
+_CHUNK_ELEMENTS = 1 << 24
+
+_order_filter_code = """
+    // Coordinates of this output sample
+    long long rem { i };
+    long long pos[MAX_NDIM];
+    for ( int d = ndim - 1; d >= 0; d-- ) {
+        pos[d] = rem % shape[d];
+        rem /= shape[d];
+    }
+
+    // Gather the window, zero padded at the edges
+    T v[K];
+    for ( int j = 0; j < K; j++ ) {
+        long long idx { 0 };
+        bool inside { true };
+        for ( int d = 0; d < ndim; d++ ) {
+            const long long c { pos[d] + offs[j * ndim + d] };
+            inside &= ( c >= 0 ) && ( c < shape[d] );
+            idx += c * strides[d];
+        }
+        v[j] = inside ? x[idx] : T( 0 );
+    }
+
+    // Odd-even transposition sorting network; fully unrolled, branch free
+#pragma unroll
+    for ( int p = 0; p < K; p++ ) {
+#pragma unroll
+        for ( int q = p & 1; q < K - 1; q += 2 ) {
+            const T a { v[q] };
+            const T b { v[q + 1] };
+            v[q] = min( a, b );
+            v[q + 1] = max( a, b );
+        }
+    }
+    out = v[RANK];
+"""
+
+_heap_ctypes = {
+    "int8": "signed char",
+    "uint8": "unsigned char",
+    "int16": "short",
+    "uint16": "unsigned short",
+    "int32": "int",
+    "uint32": "unsigned int",
+    "int64": "long long",
+    "uint64": "unsigned long long",
+    "float32": "float",
+    "float64": "double",
+}
+
+# Each thread slides the window along a segment of one line. The window is
+# held in two heaps sharing one array: a max-heap of the rank + 1 smallest
+# elements in [0, n_low) and a min-heap of the others in [n_low, n_elem),
+# so the output is the top of the first. Entries are interleaved across
+# threads, and `slot` maps every window position to its entry, so that an
+# element leaving the window is replaced by the one entering it with
+# O(log n_elem) work.
+_order_filter_heap_code = """
+#define HV( k ) hv[static_cast<long long>( k ) * n_tasks + tid]
+#define HS( k ) hs[static_cast<long long>( k ) * n_tasks + tid]
+#define SLOT( k ) slot[static_cast<long long>( k ) * n_tasks + tid]
+
+__device__ bool _first( const T a, const T b, const bool max_heap ) {
+    return max_heap ? b < a : a < b;
+}
+
+extern "C" __global__ void _cupy_order_filter_heap(
+        const T * __restrict__ x,
+        const long long * __restrict__ shape,
+        const int ndim,
+        const int * __restrict__ row_offs,
+        const int span,
+        const int * __restrict__ init_row,
+        const int * __restrict__ init_col,
+        const int n_elem,
+        const int rank,
+        const int * __restrict__ pair_row,
+        const int * __restrict__ pair_out,
+        const int * __restrict__ pair_in,
+        const int n_pairs,
+        const long long seg_len,
+        const long long n_seg,
+        const long long first,
+        const long long n_tasks,
+        T * __restrict__ hv,
+        int * __restrict__ hs,
+        int * __restrict__ slot,
+        T * __restrict__ out ) {
+
+    const long long tid { static_cast<long long>( blockIdx.x ) * blockDim.x
+        + threadIdx.x };
+    if ( tid >= n_tasks ) {
+        return;
+    }
+    const long long line { ( first + tid ) / n_seg };
+    const long long n { shape[ndim - 1] };
+    const long long x0 { ( ( first + tid ) % n_seg ) * seg_len };
+    const long long x1 { min( x0 + seg_len, n ) };
+    if ( x0 >= n ) {
+        return;
+    }
+
+    // Coordinates of the line along the leading axes
+    long long lead[32];
+    long long rem { line };
+    for ( int d = ndim - 2; d >= 0; d-- ) {
+        lead[d] = rem % shape[d];
+        rem /= shape[d];
+    }
+
+    // Element `c` along the line of window row `j`, zero outside the array
+    auto load = [&]( const int j, const long long c ) -> T {
+        if ( c < 0 || c >= n ) {
+            return T( 0 );
+        }
+        long long idx { 0 };
+        for ( int d = 0; d < ndim - 1; d++ ) {
+            const long long cd { lead[d] + row_offs[j * ( ndim - 1 ) + d] };
+            if ( cd < 0 || cd >= shape[d] ) {
+                return T( 0 );
+            }
+            idx = idx * shape[d] + cd;
+        }
+        return x[idx * n + c];
+    };
+    auto slot_of = [&]( const int j, const long long c ) -> int {
+        return j * span + static_cast<int>( ( ( c % span ) + span ) % span );
+    };
+
+    const int n_low { rank + 1 };
+    const int n_high { n_elem - n_low };
+
+    auto swap = [&]( const int a, const int b ) {
+        const T v { HV( a ) };
+        const int s { HS( a ) };
+        HV( a ) = HV( b );
+        HS( a ) = HS( b );
+        HV( b ) = v;
+        HS( b ) = s;
+        SLOT( HS( a ) ) = a;
+        SLOT( HS( b ) ) = b;
+    };
+    auto sift_up = [&]( const int base, int k, const bool max_heap ) {
+        while ( k > 0 ) {
+            const int p { ( k - 1 ) >> 1 };
+            if ( !_first( HV( base + k ), HV( base + p ), max_heap ) ) {
+                break;
+            }
+            swap( base + k, base + p );
+            k = p;
+        }
+    };
+    auto sift_down = [&]( const int base, const int size, int k,
+                          const bool max_heap ) {
+        while ( true ) {
+            int c { 2 * k + 1 };
+            if ( c >= size ) {
+                break;
+            }
+            if ( c + 1 < size
+                 && _first( HV( base + c + 1 ), HV( base + c ), max_heap ) ) {
+                c++;
+            }
+            if ( !_first( HV( base + c ), HV( base + k ), max_heap ) ) {
+                break;
+            }
+            swap( base + k, base + c );
+            k = c;
+        }
+    };
+
+    // Window of the first output of the segment
+    for ( int k = 0; k < n_elem; k++ ) {
+        const long long c { x0 + init_col[k] };
+        HV( k ) = load( init_row[k], c );
+        HS( k ) = slot_of( init_row[k], c );
+        SLOT( HS( k ) ) = k;
+    }
+    for ( int k = n_low / 2 - 1; k >= 0; k-- ) {
+        sift_down( 0, n_low, k, true );
+    }
+    for ( int k = n_high / 2 - 1; k >= 0; k-- ) {
+        sift_down( n_low, n_high, k, false );
+    }
+    while ( n_high > 0 && HV( n_low ) < HV( 0 ) ) {
+        swap( 0, n_low );
+        sift_down( 0, n_low, 0, true );
+        sift_down( n_low, n_high, 0, false );
+    }
+    out[line * n + x0] = HV( 0 );
+
+    // Slide: the first element of every run of the window leaves it and
+    // the one past its end enters
+    for ( long long c0 = x0; c0 < x1 - 1; c0++ ) {
+        for ( int p = 0; p < n_pairs; p++ ) {
+            const int j { pair_row[p] };
+            const int k { SLOT( slot_of( j, c0 + pair_out[p] ) ) };
+            const int s { slot_of( j, c0 + pair_in[p] ) };
+            const T v { load( j, c0 + pair_in[p] ) };
+            const T old { HV( k ) };
+            HV( k ) = v;
+            HS( k ) = s;
+            SLOT( s ) = k;
+            if ( k < n_low ) {
+                if ( old < v ) {
+                    sift_up( 0, k, true );
+                } else {
+                    sift_down( 0, n_low, k, true );
+                }
+            } else if ( v < old ) {
+                sift_up( n_low, k - n_low, false );
+            } else {
+                sift_down( n_low, n_high, k - n_low, false );
+            }
+
+            // Only one element changed, so swapping the tops is enough to
+            // restore the order between the heaps
+            if ( n_high > 0 && HV( n_low ) < HV( 0 ) ) {
+                swap( 0, n_low );
+                sift_down( 0, n_low, 0, true );
+                sift_down( n_low, n_high, 0, false );
+            }
+        }
+        out[line * n + c0 + 1] = HV( 0 );
+    }
+}
+"""
+
+
+def _get_order_filter_kernel(n_elem, rank, ndim):
+    key = ("order_filter", n_elem, rank, ndim)
+    kernel = _cupy_kernel_cache.get(key)
+    if kernel is None:
+        kernel = cp.ElementwiseKernel(
+            "raw T x, raw int64 shape, raw int64 strides, raw int64 offs, \
+             int32 ndim",
+            "T out",
+            _order_filter_code,
+            "_order_filter_{}_{}".format(n_elem, rank),
+            options=("-std=c++11",),
+            preamble="#define K {}\n#define RANK {}\n#define MAX_NDIM {}\n"
+            .format(n_elem, rank, ndim),
+        )
+        _cupy_kernel_cache[key] = kernel
+    return kernel
+
+
+def _get_order_filter_heap_kernel(dtype):
+    key = ("order_filter_heap", str(dtype))
+    kernel = _cupy_kernel_cache.get(key)
+    if kernel is None:
+        kernel = cp.RawKernel(
+            "typedef {} T;\n".format(_heap_ctypes[str(dtype)])
+            + _order_filter_heap_code,
+            "_cupy_order_filter_heap",
+            options=("-std=c++11",),
+        )
+        _cupy_kernel_cache[key] = kernel
+    return kernel
+
+
+def _count_runs(domain, axis):
+    """Number of runs of non-zero elements of `domain` along `axis`."""
+    d = np.moveaxis(domain != 0, axis, -1)
+    return int(
+        np.count_nonzero(d[..., 0])
+        + np.count_nonzero(d[..., 1:] & ~d[..., :-1])
+    )
+
+
+def _heap_tables(domain):
+    """
+    Tables of the sliding window for a window moving along the last axis.
+
+    The window is split into rows along the leading axes. Returns the
+    leading offsets of every row, the row and offset along the last axis of
+    every element, and, for every run of a row, the offsets of the element
+    that leaves the window and of the one that enters it in one step.
+    """
+    center = np.array(domain.shape) // 2
+    row_offs, init_row, init_col = [], [], []
+    pair_row, pair_out, pair_in = [], [], []
+    for j, idx in enumerate(np.ndindex(*domain.shape[:-1])):
+        row_offs.append(np.array(idx) - center[:-1])
+        cols = np.flatnonzero(domain[idx]) - center[-1]
+        init_row += [j] * cols.size
+        init_col += cols.tolist()
+
+        starts = [c for c in cols if c - 1 not in cols]
+        ends = [c + 1 for c in cols if c + 1 not in cols]
+        pair_row += [j] * len(starts)
+        pair_out += starts
+        pair_in += ends
+
+    return [
+        np.asarray(t, dtype=np.int32).ravel()
+        for t in (row_offs, init_row, init_col, pair_row, pair_out, pair_in)
+    ]
+
+
+def _heap_prepare(a, domain):
+    """
+    Input of the sliding window: `a` with the axis that crosses the fewest
+    runs of `domain` moved last, in a type the heaps can order.
+    """
+    xp = cp.get_array_module(a)
+    runs = [_count_runs(domain, d) for d in range(a.ndim)]
+    axis = a.ndim - 1 - int(np.argmin(runs[::-1]))
+    x = xp.ascontiguousarray(xp.moveaxis(a, axis, -1))
+    domain = np.moveaxis(domain, axis, -1)
+    if x.dtype.char == "?":
+        x = x.view(np.uint8)
+    elif x.dtype.char == "e":
+        x = x.astype(np.float32)
+    if str(x.dtype) not in _heap_ctypes:
+        raise TypeError("order filters do not support {}".format(a.dtype))
+    return x, domain, axis
+
+
+def _heap_finish(out, a, axis):
+    xp = cp.get_array_module(out)
+    if a.dtype.char == "?":
+        out = out.view(a.dtype)
+    else:
+        out = out.astype(a.dtype, copy=False)
+    return xp.ascontiguousarray(xp.moveaxis(out, -1, axis))
+
+
+def _order_filter_heap(a, domain, rank):
+    x, domain, axis = _heap_prepare(a, domain)
+    tables = [cp.asarray(t) for t in _heap_tables(domain)]
+    row_offs, init_row, init_col, pair_row, pair_out, pair_in = tables
+    n_elem = init_row.size
+    n_slots = domain.size
+    n = x.shape[-1]
+    n_lines = x.size // n
+
+    # Split lines into segments when there are few of them, keeping each
+    # long enough that building its first window is cheap next to sliding
+    min_seg = max(64, 4 * -(-n_elem // pair_row.size))
+    n_seg = max(1, min(-(-n // min_seg), _HEAP_TARGET_THREADS // n_lines))
+    seg_len = -(-n // n_seg)
+    n_tasks = n_lines * n_seg
+
+    per_task = n_elem * (x.itemsize + 4) + n_slots * 4
+    chunk = max(1, min(n_tasks, _HEAP_SCRATCH_BYTES // per_task))
+    hv = cp.empty((n_elem, chunk), x.dtype)
+    hs = cp.empty((n_elem, chunk), np.int32)
+    slot = cp.empty((n_slots, chunk), np.int32)
+
+    out = cp.empty_like(x)
+    shape = cp.asarray(x.shape, dtype=np.int64)
+    kernel = _get_order_filter_heap_kernel(x.dtype)
+    for first in range(0, n_tasks, chunk):
+        count = min(chunk, n_tasks - first)
+        kernel(
+            (-(-count // 128),),
+            (128,),
+            (
+                x,
+                shape,
+                np.int32(x.ndim),
+                row_offs,
+                np.int32(domain.shape[-1]),
+                init_row,
+                init_col,
+                np.int32(n_elem),
+                np.int32(rank),
+                pair_row,
+                pair_out,
+                pair_in,
+                np.int32(pair_row.size),
+                np.int64(seg_len),
+                np.int64(n_seg),
+                np.int64(first),
+                np.int64(count),
+                hv,
+                hs,
+                slot,
+                out,
+            ),
+        )
+
+    return _heap_finish(out, a, axis)
+
+
+def _order_filter_gpu(a, domain, rank):
+    a = cp.ascontiguousarray(a)
+    n_elem = int(np.count_nonzero(domain))
+    if a.size and n_elem > _NETWORK_MAX:
+        return _order_filter_heap(a, domain, rank)
+
+    offs = np.argwhere(domain) - np.array(domain.shape) // 2
+    strides = np.array(a.strides) // a.itemsize
+
+    out = cp.empty_like(a)
+    if out.size:
+        kernel = _get_order_filter_kernel(n_elem, rank, a.ndim)
+        kernel(
+            a,
+            cp.asarray(a.shape, dtype=np.int64),
+            cp.asarray(strides, dtype=np.int64),
+            cp.asarray(offs.ravel(), dtype=np.int64),
+            a.ndim,
+            out,
+        )
+    return out
+
+
+# The host sliding window, a port of `_cupy_order_filter_heap` in which
+# every line is slid whole by one thread, with heaps of its own.
+@njit
+def _heap_swap(hv, hs, slot, a, b):
+    v = hv[a]
+    s = hs[a]
+    hv[a] = hv[b]
+    hs[a] = hs[b]
+    hv[b] = v
+    hs[b] = s
+    slot[hs[a]] = a
+    slot[hs[b]] = b
+
+
+@njit
+def _heap_first(a, b, max_heap):
+    return b < a if max_heap else a < b
+
+
+@njit
+def _heap_sift_up(hv, hs, slot, base, k, max_heap):
+    while k > 0:
+        p = (k - 1) >> 1
+        if not _heap_first(hv[base + k], hv[base + p], max_heap):
+            break
+        _heap_swap(hv, hs, slot, base + k, base + p)
+        k = p
+
+
+@njit
+def _heap_sift_down(hv, hs, slot, base, size, k, max_heap):
+    while True:
+        c = 2 * k + 1
+        if c >= size:
+            break
+        if c + 1 < size and _heap_first(
+            hv[base + c + 1], hv[base + c], max_heap
+        ):
+            c += 1
+        if not _heap_first(hv[base + c], hv[base + k], max_heap):
+            break
+        _heap_swap(hv, hs, slot, base + k, base + c)
+        k = c
+
+
+@njit
+def _heap_load(x, base, n, c, zero):
+    if base < 0 or c < 0 or c >= n:
+        return zero
+    return x[base + c]
+
+
+@njit
+def _row_bases(line, shape, row_offs, n_rows):
+    """Offset of the start of every window row, -1 outside the array."""
+    ndim = shape.size
+    lead = np.empty(max(1, ndim - 1), np.int64)
+    rem = line
+    for d in range(ndim - 2, -1, -1):
+        lead[d] = rem % shape[d]
+        rem //= shape[d]
+
+    base = np.empty(n_rows, np.int64)
+    for j in range(n_rows):
+        idx = 0
+        for d in range(ndim - 1):
+            cd = lead[d] + row_offs[j * (ndim - 1) + d]
+            if cd < 0 or cd >= shape[d]:
+                idx = -1
+                break
+            idx = idx * shape[d] + cd
+        base[j] = idx * shape[ndim - 1] if idx >= 0 else -1
+    return base
+
+
+@njit(parallel=True)
+def _order_filter_slide(
+    x,
+    shape,
+    row_offs,
+    span,
+    init_row,
+    init_col,
+    rank,
+    pair_row,
+    pair_out,
+    pair_in,
+    zero,
+    out,
+):
+    ndim = shape.size
+    n = shape[ndim - 1]
+    n_lines = x.size // n
+    n_rows = row_offs.size // (ndim - 1) if ndim > 1 else 1
+    n_elem = init_row.size
+    n_low = rank + 1
+    n_high = n_elem - n_low
+
+    # Window positions are kept modulo `span`, at `r` for the current step
+    out_mod = pair_out % span
+    in_mod = pair_in % span
+
+    for line in prange(n_lines):
+        hv = np.empty(n_elem, x.dtype)
+        hs = np.empty(n_elem, np.int32)
+        slot = np.empty(n_rows * span, np.int32)
+
+        base = _row_bases(line, shape, row_offs, n_rows)
+
+        # Window of the first output of the line
+        for k in range(n_elem):
+            c = init_col[k]
+            hv[k] = _heap_load(x, base[init_row[k]], n, c, zero)
+            hs[k] = init_row[k] * span + c % span
+            slot[hs[k]] = k
+        for k in range(n_low // 2 - 1, -1, -1):
+            _heap_sift_down(hv, hs, slot, 0, n_low, k, True)
+        for k in range(n_high // 2 - 1, -1, -1):
+            _heap_sift_down(hv, hs, slot, n_low, n_high, k, False)
+        while n_high > 0 and hv[n_low] < hv[0]:
+            _heap_swap(hv, hs, slot, 0, n_low)
+            _heap_sift_down(hv, hs, slot, 0, n_low, 0, True)
+            _heap_sift_down(hv, hs, slot, n_low, n_high, 0, False)
+        out[line * n] = hv[0]
+
+        # Slide: the first element of every run of the window leaves it and
+        # the one past its end enters
+        r = 0
+        for c0 in range(n - 1):
+            for p in range(pair_row.size):
+                j = pair_row[p]
+                c_out = r + out_mod[p]
+                c_out -= span if c_out >= span else 0
+                c_in = r + in_mod[p]
+                c_in -= span if c_in >= span else 0
+                k = slot[j * span + c_out]
+                s = j * span + c_in
+                v = _heap_load(x, base[j], n, c0 + pair_in[p], zero)
+                old = hv[k]
+                hv[k] = v
+                hs[k] = s
+                slot[s] = k
+                if k < n_low:
+                    if old < v:
+                        _heap_sift_up(hv, hs, slot, 0, k, True)
+                    else:
+                        _heap_sift_down(hv, hs, slot, 0, n_low, k, True)
+                elif v < old:
+                    _heap_sift_up(hv, hs, slot, n_low, k - n_low, False)
+                else:
+                    _heap_sift_down(
+                        hv, hs, slot, n_low, n_high, k - n_low, False
+                    )
+
+                # Only one element changed, so swapping the tops is enough
+                # to restore the order between the heaps
+                if n_high > 0 and hv[n_low] < hv[0]:
+                    _heap_swap(hv, hs, slot, 0, n_low)
+                    _heap_sift_down(hv, hs, slot, 0, n_low, 0, True)
+                    _heap_sift_down(hv, hs, slot, n_low, n_high, 0, False)
+            out[line * n + c0 + 1] = hv[0]
+            r = r + 1 if r + 1 < span else 0
+
+
+def _order_filter_cpu(a, domain, rank):
+    out = np.empty_like(a)
+    if a.ndim == 0 or out.size == 0:
+        return out
+
+    if np.count_nonzero(domain) > _NETWORK_MAX:
+        x, domain, axis = _heap_prepare(a, domain)
+        row_offs, init_row, init_col, pair_row, pair_out, pair_in = (
+            _heap_tables(domain)
+        )
+        out = np.empty_like(x)
+        _order_filter_slide(
+            x.ravel(),
+            np.asarray(x.shape, dtype=np.int64),
+            row_offs,
+            domain.shape[-1],
+            init_row,
+            init_col,
+            rank,
+            pair_row,
+            pair_out,
+            pair_in,
+            x.dtype.type(0),
+            out.ravel(),
+        )
+        return _heap_finish(out, a, axis)
+
+    half = np.array(domain.shape) // 2
+    padded = np.pad(a, [(h, h) for h in half], mode="constant")
+    windows = as_strided(
+        padded,
+        shape=a.shape + domain.shape,
+        strides=padded.strides * 2,
+        writeable=False,
+    )
+    mask = domain.ravel().nonzero()[0]
+
+    # Gather and partition a bounded number of rows at a time
+    rows = max(1, _CHUNK_ELEMENTS // max(1, mask.size * out[0].size))
+    for start in range(0, a.shape[0], rows):
+        w = windows[start : start + rows]
+        w = w.reshape(w.shape[: a.ndim] + (-1,))[..., mask]
+        out[start : start + rows] = np.partition(w, rank, axis=-1)[..., rank]
+    return out
+
+
+def _check_odd(sizes, name):
+    if np.any(np.asarray(sizes) % 2 != 1):
+        raise ValueError("Each element of {} should be odd.".format(name))
+
+
+def order_filter(a, domain, rank):
+    """
+    Perform an order filter on an N-D array.
+
+    Perform an order filter on the array in. The domain argument acts as a
+    mask centered over each pixel. The non-zero elements of domain are
+    used to select elements surrounding each input pixel which are placed
+    in a list. The list is sorted, and the output for that pixel is the
+    element corresponding to rank in the sorted list.
+
+    Parameters
+    ----------
+    a : ndarray
+        The N-dimensional input array.
+    domain : array_like
+        A mask array with the same number of dimensions as `a`.
+        Each dimension should have an odd number of elements. If it has
+        fewer dimensions than `a`, it applies to the trailing dimensions
+        and `a` is filtered as a stack of independent arrays.
+    rank : int
+        A non-negative integer which selects the element from the
+        sorted list (0 corresponds to the smallest element, 1 is the
+        next smallest element, etc.).
+
+    Returns
+    -------
+    out : ndarray
+        The results of the order filter in an array with the same
+        shape as `a`.
+
+    Notes
+    -----
+    Elements outside `a` are treated as zero. Windows of up to 32 elements
+    are ordered whole, with a sorting network held in registers on the GPU
+    and by partitioning on the host. Larger windows slide along the axis
+    that crosses the fewest runs of `domain`, held in a max-heap of the
+    `rank` + 1 smallest elements and a min-heap of the others. Every step
+    replaces one element per run, so the work per output grows with the
+    number of runs and the logarithm of the window size, not with its
+    area; a full ``k x k`` window costs ``O(k log k)``. NumPy inputs are
+    slid on the host, one line per thread.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> x = cp.arange(25).reshape(5, 5)
+    >>> domain = cp.identity(3)
+    >>> cusignal.order_filter(x, domain, 0)
+    array([[ 0,  0,  0,  0,  0],
+           [ 0,  0,  1,  2,  0],
+           [ 0,  5,  6,  7,  0],
+           [ 0, 10, 11, 12,  0],
+           [ 0,  0,  0,  0,  0]])
+
+    """
+    xp = cp.get_array_module(a)
+    a = xp.asarray(a)
+    domain = cp.asnumpy(domain)
+    if domain.ndim > a.ndim:
+        raise ValueError("domain has more dimensions than a")
+    _check_odd(domain.shape, "domain.shape")
+    domain = domain.reshape((1,) * (a.ndim - domain.ndim) + domain.shape)
+
+    n_elem = int(np.count_nonzero(domain))
+    rank = int(rank)
+    if not 0 <= rank < n_elem:
+        raise ValueError("rank must be in [0, number of non-zero elements)")
+
+    if xp is cp:
+        return _order_filter_gpu(a, domain, rank)
+    return _order_filter_cpu(a, domain, rank)
+
+
+def medfilt(volume, kernel_size=None):
+    """
+    Perform a median filter on an N-dimensional array.
+
+    Apply a median filter to the input array using a local window-size
+    given by `kernel_size`. The array will automatically be zero-padded.
+
+    Parameters
+    ----------
+    volume : array_like
+        An N-dimensional input array.
+    kernel_size : array_like, optional
+        A scalar or an N-length list giving the size of the median filter
+        window in each dimension.  Elements of `kernel_size` should be odd.
+        If `kernel_size` is a scalar, then this scalar is used as the size
+        in each dimension. If it has fewer than N elements, it applies to
+        the trailing dimensions and `volume` is filtered as a stack of
+        independent arrays. Default size is 3 for each dimension.
+
+    Returns
+    -------
+    out : ndarray
+        An array the same size as input containing the median filtered
+        result.
+
+    See Also
+    --------
+    order_filter, medfilt2d
+
+    """
+    xp = cp.get_array_module(volume)
+    volume = xp.asarray(volume)
+    if kernel_size is None:
+        kernel_size = [3] * volume.ndim
+    kernel_size = np.asarray(kernel_size)
+    if kernel_size.shape == ():
+        kernel_size = np.repeat(kernel_size.item(), volume.ndim)
+    _check_odd(kernel_size, "kernel_size")
+
+    domain = np.ones(tuple(kernel_size.tolist()), dtype=bool)
+    return order_filter(volume, domain, domain.size // 2)
+
+
+def medfilt2d(input, kernel_size=3):
+    """
+    Median filter a 2-dimensional array.
+
+    Apply a median filter to the `input` array using a local window-size
+    given by `kernel_size` (must be odd). The array is zero-padded
+    automatically.
+
+    Parameters
+    ----------
+    input : array_like
+        A 2-dimensional input array, or a stack of them with the image
+        dimensions last.
+    kernel_size : array_like, optional
+        A scalar or a list of length 2, giving the size of the
+        median filter window in each dimension.  Elements of
+        `kernel_size` should be odd.  If `kernel_size` is a scalar,
+        then this scalar is used as the size in each dimension.
+        Default is a kernel of size (3, 3).
+
+    Returns
+    -------
+    out : ndarray
+        An array the same size as input containing the median filtered
+        result.
+
+    See Also
+    --------
+    medfilt
+
+    """
+    xp = cp.get_array_module(input)
+    input = xp.asarray(input)
+    if input.ndim < 2:
+        raise ValueError("input must be at least 2-D")
+
+    kernel_size = np.asarray(kernel_size)
+    if kernel_size.shape == ():
+        kernel_size = np.repeat(kernel_size.item(), 2)
+    if kernel_size.size != 2:
+        raise ValueError("kernel_size must be a scalar or have length 2")
+
+    return medfilt(input, kernel_size)
@@ -19,6 +19,63 @@ from math import gcd
 from ..windows.windows import get_window
 from ._upfirdn_cuda import _UpFIRDn, _output_len
 from ..filter_design.fir_filter_design import firwin
+from ..utils._caches import _filter_design_cache, _hashable_key
+from ..utils.cost_model import _use_gpu_design
+
+
+def filter_cache_info():
+    """
+    Report statistics of the designed filter cache.
+
+    `resample_poly` and `decimate` memoize the prototype low-pass filters
+    they design, along with the polyphase (transposed and flipped) form
+    handed to `upfirdn`, keyed by the resampling factors, window, data type
+    and design backend. `savgol_coeffs` and `savgol_filter` store their
+    coefficients and edge fitting matrices in the same cache.
+
+    Returns
+    -------
+    info : CacheInfo
+        Named tuple of ``(hits, misses, maxsize, currsize)``.
+
+    See Also
+    --------
+    filter_cache_clear : Empty the designed filter cache.
+    filter_cache_resize : Change the capacity of the designed filter cache.
+    """
+    return _filter_design_cache.info()
+
+
+def filter_cache_clear():
+    """
+    Empty the designed filter cache and reset its statistics.
+    """
+    _filter_design_cache.clear()
+
+
+def filter_cache_resize(maxsize):
+    """
+    Change the number of designs held by the designed filter cache.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries. Least recently used entries are evicted
+        first. A value of 0 disables caching.
+    """
+    _filter_design_cache.resize(maxsize)
+
+
+def _read_only(h):
+    # CuPy arrays have no writeable flag; cached device arrays are only ever
+    # consumed internally and must not be modified in place.
+    if isinstance(h, np.ndarray):
+        h.flags.writeable = False
+    return h
+
+
+def _backend(gpupath):
+    return "cupy" if gpupath else "numpy"
 
 
 def _design_resample_poly(up, down, window, gpupath=True):
@@ -59,6 +116,9 @@ def _design_resample_poly(up, down, window, gpupath=True):
     filter operations, this array should be converted to the desired
     data type before providing it to `cusignal.resample_poly`.
 
+    Designs are memoized per ``(up, down, window, backend)``; the returned
+    array is shared with the cache and must not be modified in place.
+
     """
 
     # Determine our up and down factors
@@ -75,11 +135,80 @@ def _design_resample_poly(up, down, window, gpupath=True):
     # reasonable cutoff for our sinc-like function
     half_len = 10 * max_rate
 
-    h = firwin(2 * half_len + 1, f_c, window=window, gpupath=gpupath)
+    return _design_lowpass(2 * half_len + 1, f_c, window, gpupath)
+
+
+def _design_lowpass(numtaps, cutoff, window, gpupath):
+    """Cached `firwin` low-pass design"""
+    win_key = _hashable_key(window)
+    if win_key is None:
+        return firwin(numtaps, cutoff, window=window, gpupath=gpupath)
+
+    key = ("firwin", numtaps, cutoff, win_key, _backend(gpupath))
+    h = _filter_design_cache.get(key)
+    if h is None:
+        h = _read_only(
+            firwin(numtaps, cutoff, window=window, gpupath=gpupath)
+        )
+        _filter_design_cache.put(key, h)
     return h
 
 
-def decimate(x, q, n=None, axis=-1, zero_phase=True, gpupath=True):
+def _get_poly_filter(x_len, x_dtype, up, down, h, h_len, key, gpupath):
+    """
+    Return the prepared polyphase filter used by `resample_poly`, the
+    number of leading output samples to discard and the output length.
+
+    `h` is either the `h_len` filter coefficients or a callable producing
+    them. If `key` is not None the prepared filter is memoized together
+    with the padding that depends on the input length and data type.
+    """
+    pp = cp if gpupath else np
+    half_len = (h_len - 1) // 2
+
+    # Zero-pad our filter to put the output samples at the center
+    n_pre_pad = down - half_len % down
+    n_post_pad = 0
+    n_pre_remove = (half_len + n_pre_pad) // down
+    n_out = x_len * up
+    n_out = n_out // down + bool(n_out % down)
+    # We should rarely need to do this given our filter lengths...
+    while (
+        _output_len(h_len + n_pre_pad + n_post_pad, x_len, up, down)
+        < n_out + n_pre_remove
+    ):
+        n_post_pad += 1
+
+    if key is not None:
+        key = key + (n_post_pad, str(x_dtype))
+        ufd = _filter_design_cache.get(key)
+        if ufd is not None:
+            return ufd, n_pre_remove, n_out
+
+    if callable(h):
+        h = h()
+    h = up * h
+    h = pp.concatenate(
+        (pp.zeros(n_pre_pad, h.dtype), h, pp.zeros(n_post_pad, h.dtype))
+    )
+    ufd = _UpFIRDn(h, x_dtype, up, down)
+
+    if key is not None:
+        _filter_design_cache.put(key, ufd)
+
+    return ufd, n_pre_remove, n_out
+
+
+def _apply_poly_filter(x, ufd, n_pre_remove, n_out, axis):
+    # filter then remove excess
+    y = ufd.apply_filter(x, axis)
+    keep = [slice(None)] * x.ndim
+    keep[axis] = slice(n_pre_remove, n_pre_remove + n_out)
+
+    return y[tuple(keep)]
+
+
+def decimate(x, q, n=None, axis=-1, zero_phase=True, gpupath=None):
     """
     Downsample the signal after applying an anti-aliasing filter.
     Parameters
@@ -98,9 +227,10 @@ def decimate(x, q, n=None, axis=-1, zero_phase=True, gpupath=True):
         Prevent shifting the outputs back by the filter's
         group delay when using an FIR filter. The default value of ``True`` is
         recommended, since a phase shift is generally not desired.
-    gpupath : bool, Optional
-        Optional path for filter design. gpupath == False may be desirable if
-        filter sizes are small.
+    gpupath : bool or None, optional
+        Where to design the low-pass filter: on the GPU (True) or the host
+        (False). The default, None, picks whichever the cost model predicts
+        to be faster for the filter length; see `get_cost_model`.
 
     Returns
     -------
@@ -113,37 +243,163 @@ def decimate(x, q, n=None, axis=-1, zero_phase=True, gpupath=True):
     Notes
     -----
     Only FIR filter types are currently supported in cuSignal.
+
+    When `n` is not given as filter coefficients, the designed filter and
+    its polyphase form are memoized; see `filter_cache_info`.
     """
 
     x = cp.asarray(x)
-    if gpupath:
-        pp = cp
-    else:
-        pp = np
+    q = int(q)
 
-    if isinstance(n, (list, pp.ndarray)):
-        b = pp.asarray(n)
+    if isinstance(n, (list, np.ndarray, cp.ndarray)):
+        b = cp.asarray(n)
+        key = None
     else:
         if n is None:
             half_len = 10 * q  # reasonable cutoff for our sinc-like function
             n = 2 * half_len
+        n = int(n)
+        if gpupath is None:
+            gpupath = _use_gpu_design(n + 1)
+
+        def b():
+            return _design_lowpass(n + 1, 1.0 / q, "hamming", gpupath)
 
-        b = firwin(n + 1, 1.0 / q, window="hamming", gpupath=gpupath)
+        key = ("decimate", q, n, _backend(gpupath))
 
     sl = [slice(None)] * x.ndim
 
     if zero_phase:
-        y = resample_poly(x, 1, q, axis=axis, window=b, gpupath=gpupath)
+        if key is None:
+            y = resample_poly(x, 1, q, axis=axis, window=b, gpupath=gpupath)
+        else:
+            ufd, n_pre_remove, n_out = _get_poly_filter(
+                x.shape[axis], x.dtype, 1, q, b, n + 1, key, gpupath
+            )
+            y = _apply_poly_filter(x, ufd, n_pre_remove, n_out, axis)
     else:
         # upfirdn is generally faster than lfilter by a factor equal to the
         # downsampling factor, since it only calculates the needed outputs
         n_out = x.shape[axis] // q + bool(x.shape[axis] % q)
-        y = upfirdn(b, x, 1, q, axis)
+        if key is None:
+            y = upfirdn(b, x, 1, q, axis)
+        else:
+            key = key + ("upfirdn", str(x.dtype))
+            ufd = _filter_design_cache.get(key)
+            if ufd is None:
+                ufd = _UpFIRDn(b(), x.dtype, 1, q)
+                _filter_design_cache.put(key, ufd)
+            y = ufd.apply_filter(x, axis)
         sl[axis] = slice(None, n_out, None)
 
     return y[tuple(sl)]
 
 
+_resample_spectrum_kernel = cp.ElementwiseKernel(
+    "raw T X, raw int64 src, raw R gain, int64 n_in, int64 n_out",
+    "T Y",
+    """
+    const long long k { i % n_out };
+    const T *xr { &X[( i / n_out ) * n_in] };
+
+    // Each output bin is a weighted sum of up to two input bins; bins that
+    // are only padding have no source.
+    T acc {};
+    for ( long long j = 2 * k; j < 2 * k + 2; j++ ) {
+        if ( src[j] >= 0 ) {
+            acc += xr[src[j]] * gain[j];
+        }
+    }
+    Y = acc;
+    """,
+    "_resample_spectrum_kernel",
+    options=("-std=c++11",),
+)
+
+
+def _resample_window(window, Nx, real_input):
+    """Fourier-domain window of `resample`, in the layout of the spectrum."""
+    if callable(window):
+        W = cp.asnumpy(window(cp.fft.fftfreq(Nx)))
+    elif isinstance(window, (np.ndarray, cp.ndarray)):
+        if window.shape != (Nx,):
+            raise ValueError("window must have the same length as data")
+        W = cp.asnumpy(window)
+    else:
+        W = np.fft.ifftshift(cp.asnumpy(get_window(window, Nx)))
+
+    if real_input:
+        # Fold the window back on itself to mimic complex behavior
+        W = W.astype(np.float64, copy=True)
+        W[1:] += W[-1:0:-1]
+        W[1:] *= 0.5
+        W = W[: Nx // 2 + 1]
+    return W
+
+
+def _resample_spectrum_map(Nx, num, real_input, window, dtype):
+    """
+    Source bins and gains building the output spectrum of `resample` from
+    the input spectrum: the window, the truncation or zero padding, the
+    splitting or merging of the Nyquist bin and the ``num / Nx`` scaling
+    are all folded into one table. Tables are memoized unless `window` is
+    a callable or an array.
+    """
+    key = None
+    if window is None or not (
+        callable(window) or isinstance(window, (np.ndarray, cp.ndarray))
+    ):
+        win_key = _hashable_key(window)
+        if win_key is not None or window is None:
+            key = ("resample", Nx, num, real_input, win_key, str(dtype))
+            table = _filter_design_cache.get(key)
+            if table is not None:
+                return table
+
+    n_in = Nx // 2 + 1 if real_input else Nx
+    n_out = num // 2 + 1 if real_input else num
+    if window is None:
+        W = np.ones(n_in)
+    else:
+        W = _resample_window(window, Nx, real_input)
+
+    src = np.full((n_out, 2), -1, dtype=np.int64)
+    gain = np.zeros((n_out, 2))
+
+    # Positive frequencies (and Nyquist, if present)
+    N = min(num, Nx)
+    nyq = N // 2 + 1
+    src[:nyq, 0] = np.arange(nyq)
+    gain[:nyq, 0] = W[:nyq]
+
+    # Negative frequencies
+    m = N - nyq
+    if not real_input and m > 0:
+        src[num - m :, 0] = np.arange(Nx - m, Nx)
+        gain[num - m :, 0] = W[Nx - m :]
+
+    # Split or join the Nyquist component(s), if present
+    if N % 2 == 0:
+        h = N // 2
+        if num < Nx:
+            if real_input:
+                gain[h, 0] *= 2.0
+            else:
+                src[h, 1] = Nx - h
+                gain[h, 1] = W[Nx - h]
+        elif Nx < num:
+            gain[h, 0] *= 0.5
+            if not real_input:
+                src[num - h] = src[h]
+                gain[num - h] = gain[h]
+
+    gain *= float(num) / float(Nx)
+    table = (cp.asarray(src.ravel()), cp.asarray(gain.ravel().astype(dtype)))
+    if key is not None:
+        _filter_design_cache.put(key, table)
+    return table
+
+
 def resample(x, num, t=None, axis=0, window=None, domain="time"):
     """
     Resample `x` to `num` samples using Fourier method along the given axis.
@@ -215,6 +471,17 @@ def resample(x, num, t=None, axis=0, window=None, domain="time"):
     slow if the number of input or output samples is large and prime;
     see `scipy.fftpack.fft`.
 
+    Real time-domain inputs are transformed with `rfft` and `irfft`; a
+    real frequency-domain input holds the full spectrum, like a complex
+    one, and the real part of the result is returned. Single precision
+    inputs stay in single precision. The output spectrum is gathered from
+    the input spectrum in one pass that also applies the window and the
+    ``num / Nx`` scaling, so no zero-filled spectrum is allocated. The
+    gather tables, including the window, are memoized per
+    ``(Nx, num, window, dtype)`` unless `window` is a callable or an
+    array; see `filter_cache_info`. Every 1-D array along `axis` is
+    resampled in one batched transform.
+
     Examples
     --------
     Note that the end of the resampled data rises to meet the first
@@ -234,42 +501,42 @@ def resample(x, num, t=None, axis=0, window=None, domain="time"):
     >>> plt.legend(['data', 'resampled'], loc='best')
     >>> plt.show()
     """
+    if domain not in ("time", "freq"):
+        raise NotImplementedError("domain should be 'time' or 'freq'")
+
     x = cp.asarray(x)
+    if x.dtype == np.float16:
+        x = x.astype(np.float32)
+    axis = axis % x.ndim
     Nx = x.shape[axis]
+    num = int(num)
+    real_input = not cp.iscomplexobj(x)
+
+    # Only real signals have a half spectrum; a spectrum given in `x` holds
+    # all Nx bins even when it is real
+    half = real_input and domain == "time"
 
+    # Transform along a contiguous last axis so every row is one batch entry
+    X = cp.moveaxis(x, axis, -1)
     if domain == "time":
-        X = cp.fft.fft(x, axis=axis)
-    elif domain == "freq":
-        X = x
+        X = cp.fft.rfft(X) if half else cp.fft.fft(X)
+    elif real_input:
+        X = X.astype(cp.result_type(X.dtype, np.complex64))
+    X = cp.ascontiguousarray(X)
+
+    src, gain = _resample_spectrum_map(Nx, num, half, window, X.real.dtype)
+    n_out = src.size // 2
+    Y = cp.empty(X.shape[:-1] + (n_out,), X.dtype)
+    if Y.size:
+        _resample_spectrum_kernel(X, src, gain, X.shape[-1], n_out, Y)
+
+    if half:
+        y = cp.fft.irfft(Y, num)
     else:
-        raise NotImplementedError("domain should be 'time' or 'freq'")
-
-    if window is not None:
-        if callable(window):
-            W = window(cp.fft.fftfreq(Nx))
-        elif isinstance(window, cp.ndarray):
-            if window.shape != (Nx,):
-                raise ValueError("window must have the same length as data")
-            W = window
-        else:
-            W = cp.fft.ifftshift(get_window(window, Nx))
-        newshape = [1] * x.ndim
-        newshape[axis] = len(W)
-        W.shape = newshape
-        X = X * W
-    sl = [slice(None)] * x.ndim
-    newshape = list(x.shape)
-    newshape[axis] = num
-    N = int(np.minimum(num, Nx))
-    Y = cp.zeros(newshape, "D")
-    sl[axis] = slice(0, (N + 1) // 2)
-    Y[sl] = X[sl]
-    sl[axis] = slice(-(N - 1) // 2, None)
-    Y[sl] = X[sl]
-    y = cp.fft.ifft(Y, axis=axis) * (float(num) / float(Nx))
-
-    if x.dtype.char not in ["F", "D"]:
-        y = y.real
+        y = cp.fft.ifft(Y)
+        if real_input:
+            y = y.real
+    y = cp.moveaxis(y, -1, axis)
 
     if t is None:
         return y
@@ -278,7 +545,9 @@ def resample(x, num, t=None, axis=0, window=None, domain="time"):
         return y, new_t
 
 
-def resample_poly(x, up, down, axis=0, window=("kaiser", 5.0), gpupath=True):
+def resample_poly(
+    x, up, down, axis=0, window=("kaiser", 5.0), gpupath=None
+):
     """
     Resample `x` along the given axis using polyphase filtering.
 
@@ -301,9 +570,10 @@ def resample_poly(x, up, down, axis=0, window=("kaiser", 5.0), gpupath=True):
     window : string, tuple, or array_like, optional
         Desired window to use to design the low-pass filter, or the FIR filter
         coefficients to employ. See below for details.
-    gpupath : bool, Optional
-        Optional path for filter design. gpupath == False may be desirable if
-        filter sizes are small.
+    gpupath : bool or None, optional
+        Where to design the low-pass filter: on the GPU (True) or the host
+        (False). The default, None, picks whichever the cost model predicts
+        to be faster for the filter length; see `get_cost_model`.
 
     Returns
     -------
@@ -337,7 +607,8 @@ def resample_poly(x, up, down, axis=0, window=("kaiser", 5.0), gpupath=True):
 
     For any other type of `window`, the functions `cusignal.get_window`
     and `cusignal.firwin` are called to generate the appropriate filter
-    coefficients.
+    coefficients. The designed filter and its polyphase form are memoized
+    per ``(up, down, window, dtype, gpupath)``; see `filter_cache_info`.
 
     The first sample of the returned vector is the same as the first
     sample of the input vector. The spacing between samples is changed
@@ -381,49 +652,35 @@ def resample_poly(x, up, down, axis=0, window=("kaiser", 5.0), gpupath=True):
     down //= g_
     if up == down == 1:
         return x.copy()
-    n_out = x.shape[axis] * up
-    n_out = n_out // down + bool(n_out % down)
-
-    # If the window size is greater than 8192, use GPU
-    if gpupath:
-        pp = cp
-    else:
-        pp = np
 
-    # print("window", window.size)
-
-    if isinstance(window, (list, pp.ndarray)):
-        window = pp.asarray(window)
+    if isinstance(window, (list, np.ndarray, cp.ndarray)):
+        window = cp.asarray(window)
         if window.ndim > 1:
             raise ValueError("window must be 1-D")
-        half_len = (window.size - 1) // 2
-        h = up * window
+        h = window
+        h_len = window.size
+        key = None
+        gpupath = True
     else:
-        half_len = 10 * max(up, down)
-        h = up * _design_resample_poly(up, down, window, gpupath)
+        h_len = 2 * 10 * max(up, down) + 1
+        # Short filters are cheaper to design on the host
+        if gpupath is None:
+            gpupath = _use_gpu_design(h_len)
 
-    # Zero-pad our filter to put the output samples at the center
-    n_pre_pad = down - half_len % down
-    n_post_pad = 0
-    n_pre_remove = (half_len + n_pre_pad) // down
-    # We should rarely need to do this given our filter lengths...
-    while (
-        _output_len(len(h) + n_pre_pad + n_post_pad, x.shape[axis], up, down)
-        < n_out + n_pre_remove
-    ):
-        n_post_pad += 1
+        def h():
+            return _design_resample_poly(up, down, window, gpupath)
 
-    h = pp.concatenate(
-        (pp.zeros(n_pre_pad, h.dtype), h, pp.zeros(n_post_pad, h.dtype))
-    )
-    n_pre_remove_end = n_pre_remove + n_out
+        win_key = _hashable_key(window)
+        if win_key is None:
+            key = None
+        else:
+            key = ("resample_poly", up, down, win_key, _backend(gpupath))
 
-    # filter then remove excess
-    y = upfirdn(h, x, up, down, axis)
-    keep = [slice(None)] * x.ndim
-    keep[axis] = slice(n_pre_remove, n_pre_remove_end)
+    ufd, n_pre_remove, n_out = _get_poly_filter(
+        x.shape[axis], x.dtype, up, down, h, h_len, key, gpupath
+    )
 
-    return y[tuple(keep)]
+    return _apply_poly_filter(x, ufd, n_pre_remove, n_out, axis)
 
 
 def upfirdn(
@@ -441,7 +698,8 @@ def upfirdn(
     h : array_like
         1-dimensional FIR (finite-impulse response) filter coefficients.
     x : array_like
-        Input signal array.
+        Input signal array. May be of any dimensionality; all axes other
+        than `axis` are treated as a batch.
     up : int, optional
         Upsampling rate. Default is 1.
     down : int, optional
@@ -468,6 +726,10 @@ def upfirdn(
     O(N*Q) per output sample. The polyphase implementation used here is
     O(N/P).
 
+    N-dimensional inputs are filtered in place along `axis`, without moving
+    it to the end of the array, by indexing the other axes as a flattened
+    batch.
+
     References
     ----------
     .. [1] P. P. Vaidyanathan, Multirate Systems and Filter Banks,
@@ -519,3 +781,284 @@ def upfirdn(
     ufd = _UpFIRDn(h, x.dtype, up, down)
     # This is equivalent to (but faster than) using cp.apply_along_axis
     return ufd.apply_filter(x, axis)
+
+
+# Farrow coefficient matrices, rows are powers of the fractional delay mu
+# and columns the taps at input offsets -(L // 2 - 1), ..., L // 2
+_farrow_coeffs = {
+    1: ((1.0, 0.0), (-1.0, 1.0)),
+    3: (
+        (0.0, 1.0, 0.0, 0.0),
+        (-1.0 / 3.0, -0.5, 1.0, -1.0 / 6.0),
+        (0.5, -1.0, 0.5, 0.0),
+        (-1.0 / 6.0, 0.5, -0.5, 1.0 / 6.0),
+    ),
+}
+
+
+class FarrowResampler(object):
+    """
+    Streaming arbitrary-ratio resampler using a Farrow structure.
+
+    Each output sample is computed by evaluating a polynomial in the
+    fractional input position ``mu`` whose coefficients are fixed FIR
+    combinations of neighbouring input samples. Any positive real ratio is
+    supported, including ratios that change from sample to sample, without
+    building a polyphase bank of ``up`` branches.
+
+    Parameters
+    ----------
+    ratio : float
+        Output sample rate divided by input sample rate.
+    order : int, optional
+        Order of the built-in Lagrange interpolation polynomial, either
+        1 (linear) or 3 (cubic). Default is 3. Ignored if `coeffs` is given.
+    coeffs : array_like, optional
+        Custom Farrow coefficient matrix of shape ``(P + 1, L)`` with `L`
+        even. Row ``p`` holds the taps applied to the input samples at
+        offsets ``-(L // 2 - 1), ..., L // 2`` around the integer position
+        to form the coefficient of ``mu ** p``.
+    axis : int, optional
+        The axis of the input data that is resampled. All other axes are
+        treated as independent channels. Default is -1.
+
+    Attributes
+    ----------
+    ratio : float
+        Current output to input sample rate ratio.
+    coeffs : ndarray
+        Farrow coefficient matrix in use.
+
+    Notes
+    -----
+    State (the input samples still needed by future outputs and the
+    fractional position of the next output) is carried between calls, so
+    consecutive blocks produce exactly the output of one call on their
+    concatenation. The first output is aligned with the first input sample.
+
+    Both NumPy and CuPy inputs are accepted; the computation stays on the
+    device of the input.
+
+    Lagrange interpolation has no anti-aliasing stop band. When ``ratio``
+    is well below one the input should be low-pass filtered (for example
+    with `resample_poly` or `decimate`) before fractional resampling.
+
+    Examples
+    --------
+    Correct a 10 ppm sample clock offset on 4 channels, block by block:
+
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> rs = cusignal.FarrowResampler(1.00001)
+    >>> x = cp.random.randn(4, 2 ** 16)
+    >>> y1 = rs(x)
+    >>> y2 = rs(x)
+
+    """
+
+    def __init__(self, ratio, order=3, coeffs=None, axis=-1):
+        if coeffs is None:
+            if order not in _farrow_coeffs:
+                raise ValueError("order must be 1 or 3")
+            coeffs = _farrow_coeffs[order]
+        coeffs = np.atleast_2d(np.asarray(coeffs, dtype=np.float64))
+        if coeffs.ndim != 2 or coeffs.shape[1] % 2:
+            raise ValueError("coeffs must be 2-D with an even number of taps")
+
+        self.coeffs = coeffs
+        self.ratio = self._check_ratio(ratio)
+        self.axis = axis
+
+        self._n_taps = coeffs.shape[1]
+        self._offsets = np.arange(coeffs.shape[1]) - (coeffs.shape[1] // 2 - 1)
+        self.reset()
+
+    @staticmethod
+    def _check_ratio(ratio):
+        ratio = float(ratio)
+        if not ratio > 0:
+            raise ValueError("ratio must be positive")
+        return ratio
+
+    def reset(self):
+        """Discard the carried input history and restart at position 0."""
+        self._hist = None
+        self._hist_ratio = None
+        self._t = float(self._n_taps // 2 - 1)
+
+    def __call__(self, x, ratio=None):
+        """
+        Resample a block of input samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Next block of input samples.
+        ratio : float or array_like, optional
+            New output to input sample rate ratio. A scalar updates `ratio`
+            for this and subsequent blocks. A 1-D array with one value per
+            input sample of `x` gives a time-varying ratio; the last value
+            becomes the new `ratio`.
+
+        Returns
+        -------
+        y : ndarray
+            Resampled block. The number of output samples depends on the
+            carried state and is not necessarily constant between blocks.
+        """
+        xp = cp.get_array_module(x)
+        x = xp.moveaxis(xp.asarray(x), self.axis, -1)
+
+        if ratio is None:
+            ratio = self.ratio
+        if np.ndim(ratio) == 0:
+            ratio = self._check_ratio(ratio)
+        else:
+            ratio = xp.asarray(ratio, dtype=xp.float64)
+            if ratio.shape != x.shape[-1:]:
+                raise ValueError(
+                    "a time-varying ratio needs one value per input sample"
+                )
+
+        y = self._process(xp, x, ratio)
+
+        return xp.moveaxis(y, -1, self.axis)
+
+    def _process(self, xp, x, ratio):
+        half = self._n_taps // 2
+        if (
+            self._hist is None
+            or self._hist.shape[:-1] != x.shape[:-1]
+            or cp.get_array_module(self._hist) is not xp
+        ):
+            self._hist = xp.zeros(x.shape[:-1] + (half - 1,), x.dtype)
+            self._hist_ratio = xp.full(half - 1, self.ratio)
+
+        xb = xp.concatenate((self._hist, x.astype(self._hist.dtype)), -1)
+        M = xb.shape[-1]
+        limit = M - half  # positions must satisfy floor(p) + half <= M - 1
+        t = self._t
+
+        if isinstance(ratio, float):
+            r_buf = None
+            n_out = max(0, int(np.ceil((limit - t) * ratio)))
+            if n_out and t + (n_out - 1) / ratio >= limit:
+                n_out -= 1
+            pos = t + xp.arange(n_out, dtype=xp.float64) / ratio
+            t_next = t + n_out / ratio
+            self.ratio = ratio
+        else:
+            r_buf = xp.concatenate((self._hist_ratio, ratio))
+            pos, n_out, t_next = self._varying_positions(xp, r_buf, t, limit)
+            self.ratio = float(r_buf[-1])
+
+        real = np.finfo(np.result_type(x.dtype, np.float32)).dtype
+        n = xp.floor(pos).astype(xp.int64)
+        mu = (pos - n).astype(real)
+
+        # Evaluate each polynomial coefficient as an FIR over the taps, then
+        # combine them with Horner's rule in the fractional delay
+        coeffs = self.coeffs
+        branches = [0] * coeffs.shape[0]
+        for tap, off in enumerate(self._offsets):
+            samp = xb[..., n + int(off)]
+            for p in range(coeffs.shape[0]):
+                c = coeffs[p, tap]
+                if c != 0.0:
+                    branches[p] = branches[p] + c * samp
+        y = branches[-1]
+        for p in range(coeffs.shape[0] - 2, -1, -1):
+            y = y * mu + branches[p]
+        if isinstance(y, int):
+            y = xp.zeros(x.shape[:-1] + (n_out,), xb.dtype)
+        y = y.astype(xp.result_type(xb.dtype, real), copy=False)
+
+        # Keep every sample still needed by the next output
+        start = min(max(int(np.floor(t_next)) - (half - 1), 0), M)
+        self._hist = xb[..., start:].copy()
+        if r_buf is None:
+            self._hist_ratio = xp.full(M - start, ratio)
+        else:
+            self._hist_ratio = r_buf[start:].copy()
+        self._t = t_next - start
+
+        return y
+
+    @staticmethod
+    def _varying_positions(xp, r_buf, t, limit):
+        # Accumulated output phase at integer input positions from floor(t);
+        # output k sits where the phase crosses k.
+        j0 = int(np.floor(t))
+        seg = r_buf[j0:]
+        C = xp.concatenate((xp.zeros(1), xp.cumsum(seg)))
+        C -= (t - j0) * seg[0]
+
+        n_out = 0
+        if limit > j0:
+            n_out = max(0, int(np.ceil(float(C[limit - j0]))))
+
+        k = xp.arange(n_out, dtype=xp.float64)
+        j = xp.searchsorted(C, k, side="right") - 1
+        j = xp.minimum(j, seg.size - 1)
+        pos = j0 + j + (k - C[j]) / seg[j]
+
+        C_end = float(C[-1])
+        if n_out >= C_end:
+            t_next = j0 + seg.size + (n_out - C_end) / float(seg[-1])
+        else:
+            jn = xp.searchsorted(C, xp.asarray([n_out]), side="right")
+            jn = int(jn[0]) - 1
+            t_next = j0 + jn + (n_out - float(C[jn])) / float(seg[jn])
+
+        return pos, n_out, t_next
+
+
+def resample_farrow(x, ratio, axis=-1, order=3):
+    """
+    Resample `x` along `axis` by an arbitrary real ratio.
+
+    Parameters
+    ----------
+    x : array_like
+        The data to be resampled. NumPy and CuPy arrays are accepted.
+    ratio : float or array_like
+        Output sample rate divided by input sample rate, either a scalar
+        or one value per input sample for a time-varying ratio.
+    axis : int, optional
+        The axis of `x` that is resampled. Default is -1.
+    order : int, optional
+        Lagrange interpolation order, 1 or 3. Default is 3.
+
+    Returns
+    -------
+    resampled_x : array
+        The resampled array. For a scalar ratio it holds
+        ``ceil(x.shape[axis] * ratio)`` samples.
+
+    See Also
+    --------
+    FarrowResampler : Streaming version with state carried between blocks.
+    resample_poly : Resample by a rational factor using polyphase filtering.
+
+    Notes
+    -----
+    As in `resample_poly`, values beyond the boundary of the signal are
+    assumed to be zero.
+    """
+    xp = cp.get_array_module(x)
+    x = xp.moveaxis(xp.asarray(x), axis, -1)
+    n_in = x.shape[-1]
+
+    rs = FarrowResampler(ratio if np.ndim(ratio) == 0 else 1.0, order=order)
+    pad = xp.zeros(x.shape[:-1] + (rs._n_taps // 2,), x.dtype)
+
+    if np.ndim(ratio) == 0:
+        y = rs(xp.concatenate((x, pad), -1))
+        n_out = int(np.ceil(n_in * float(ratio)))
+    else:
+        ratio = xp.asarray(ratio, dtype=xp.float64)
+        ratio = xp.concatenate((ratio, xp.full(pad.shape[-1], ratio[-1])))
+        y = rs(xp.concatenate((x, pad), -1), ratio)
+        n_out = int(np.ceil(float(xp.sum(ratio[:n_in]))))
+
+    return xp.moveaxis(y[..., :n_out], -1, axis)
@@ -0,0 +1,364 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+
+import cupy as cp
+import numpy as np
+
+from ..convolution.convolve import convolve
+from ..utils._caches import _filter_design_cache
+from ..utils.arraytools import _const_ext, _even_ext, _zero_ext
+
+_modes = ("mirror", "constant", "nearest", "wrap", "interp")
+
+
+def _savgol_design(window_length, polyorder, deriv, delta, pos, use):
+    """Least-squares design of the coefficients, in float64 on the host."""
+    if deriv > polyorder:
+        return np.zeros(window_length)
+
+    # Powers of a centred and scaled abscissa keep the normal equations well
+    # conditioned for long windows and high orders.
+    x = np.arange(-pos, window_length - pos, dtype=np.float64)
+    if use == "conv":
+        x = x[::-1]
+    scale = max(1.0, window_length / 2.0)
+    A = (x / scale) ** np.arange(polyorder + 1).reshape(-1, 1)
+
+    y = np.zeros(polyorder + 1)
+    y[deriv] = math.factorial(deriv) / (delta * scale) ** deriv
+    coeffs, _, _, _ = np.linalg.lstsq(A, y, rcond=None)
+    return coeffs
+
+
+def _savgol_edges(window_length, polyorder, deriv, delta):
+    """
+    Matrices mapping the first and last `window_length` samples of a signal
+    to the derivative of the polynomial fitted to them, evaluated at the
+    first and last ``window_length // 2`` samples.
+    """
+    half = window_length // 2
+    centre = (window_length - 1) / 2.0
+    scale = max(1.0, window_length / 2.0)
+    t = (np.arange(window_length) - centre) / scale
+
+    order = np.arange(polyorder + 1)
+    fit = np.linalg.pinv(t.reshape(-1, 1) ** order)
+
+    # Derivative of each monomial, evaluated at every position of the window
+    power = np.maximum(order - deriv, 0)
+    gain = np.array(
+        [
+            math.factorial(k) // math.factorial(k - deriv) if k >= deriv else 0
+            for k in order
+        ],
+        dtype=np.float64,
+    )
+    D = gain * t.reshape(-1, 1) ** power / (delta * scale) ** deriv
+    M = D.dot(fit)
+
+    return M[:half], M[window_length - half :]
+
+
+def _get_savgol(kind, dtype, gpupath, *args):
+    """Cached Savitzky-Golay design, converted to `dtype` on one backend."""
+    key = ("savgol", kind, args, str(dtype), gpupath)
+    value = _filter_design_cache.get(key)
+    if value is None:
+        if kind == "coeffs":
+            value = (_savgol_design(*args),)
+        else:
+            value = _savgol_edges(*args)
+        xp = cp if gpupath else np
+        value = tuple(xp.asarray(v.astype(dtype)) for v in value)
+        for v in value:
+            if isinstance(v, np.ndarray):
+                v.flags.writeable = False
+        _filter_design_cache.put(key, value)
+    return value
+
+
+def _check_design(window_length, polyorder, pos, use):
+    if polyorder >= window_length:
+        raise ValueError("polyorder must be less than window_length.")
+    if use not in ["conv", "dot"]:
+        raise ValueError("`use` must be 'conv' or 'dot'")
+    if pos is None:
+        half, rem = divmod(window_length, 2)
+        pos = half if rem else half - 0.5
+    if not (0 <= pos < window_length):
+        raise ValueError(
+            "pos must be nonnegative and less than window_length."
+        )
+    return pos
+
+
+def savgol_coeffs(
+    window_length,
+    polyorder,
+    deriv=0,
+    delta=1.0,
+    pos=None,
+    use="conv",
+    gpupath=True,
+):
+    """Compute the coefficients for a 1-D Savitzky-Golay FIR filter.
+
+    Parameters
+    ----------
+    window_length : int
+        The length of the filter window (i.e., the number of coefficients).
+    polyorder : int
+        The order of the polynomial used to fit the samples.
+        `polyorder` must be less than `window_length`.
+    deriv : int, optional
+        The order of the derivative to compute. This must be a
+        nonnegative integer. The default is 0, which means to filter
+        the data without differentiating.
+    delta : float, optional
+        The spacing of the samples to which the filter will be applied.
+        This is only used if deriv > 0.
+    pos : int or None, optional
+        If pos is not None, it specifies evaluation position within the
+        window. The default is the middle of the window.
+    use : str, optional
+        Either 'conv' or 'dot'. This argument chooses the order of the
+        coefficients. The default is 'conv', which means that the
+        coefficients are ordered to be used in a convolution. With
+        use='dot', the order is reversed, so the filter is applied by
+        dotting the coefficients with the data set.
+    gpupath : bool, optional
+        Optional path for filter design. gpupath == False may be desirable
+        if filter sizes are small.
+
+    Returns
+    -------
+    coeffs : ndarray
+        The filter coefficients.
+
+    See Also
+    --------
+    savgol_filter
+
+    Notes
+    -----
+    Designs are memoized in the designed filter cache, keyed by
+    ``(window_length, polyorder, deriv, delta, pos, use)``; see
+    `filter_cache_info`.
+
+    Examples
+    --------
+    >>> import cusignal
+    >>> cusignal.savgol_coeffs(5, 2)
+    array([-0.08571429,  0.34285714,  0.48571429,  0.34285714, -0.08571429])
+
+    """
+    window_length = int(window_length)
+    polyorder = int(polyorder)
+    pos = _check_design(window_length, polyorder, pos, use)
+
+    (coeffs,) = _get_savgol(
+        "coeffs",
+        np.float64,
+        gpupath,
+        window_length,
+        polyorder,
+        int(deriv),
+        float(delta),
+        float(pos),
+        use,
+    )
+    return coeffs.copy()
+
+
+def _extend(x, n, mode, cval):
+    if mode == "mirror":
+        return _even_ext(x, n)
+    if mode == "nearest":
+        return _const_ext(x, n)
+    if mode == "wrap":
+        idx = cp.arange(-n, x.shape[-1] + n) % x.shape[-1]
+        return cp.take(x, idx, axis=-1)
+    ext = _zero_ext(x, n)
+    if cval != 0:
+        ext[..., :n] = cval
+        ext[..., ext.shape[-1] - n :] = cval
+    return ext
+
+
+def _convolve_rows(x, coeffs):
+    """
+    'valid' convolution of every row of `x` with `coeffs`, done as a single
+    1-D convolution of the flattened rows. Returns an array of row length
+    ``x.shape[-1]``; its last ``len(coeffs) - 1`` columns mix adjacent rows
+    and must be discarded.
+    """
+    flat = convolve(x.ravel(), coeffs, mode="valid")
+    out = cp.empty(x.shape, flat.dtype)
+    out.ravel()[: flat.size] = flat
+    out.ravel()[flat.size :] = 0
+    return out
+
+
+def savgol_filter(
+    x,
+    window_length,
+    polyorder,
+    deriv=0,
+    delta=1.0,
+    axis=-1,
+    mode="interp",
+    cval=0.0,
+):
+    """Apply a Savitzky-Golay filter to an array.
+
+    This is a 1-D filter. If `x` has dimension greater than 1, `axis`
+    determines the axis along which the filter is applied.
+
+    Parameters
+    ----------
+    x : array_like
+        The data to be filtered. If `x` is not a single or double precision
+        floating point array, it will be converted to type ``numpy.float64``
+        before filtering.
+    window_length : int
+        The length of the filter window (i.e., the number of coefficients).
+        If `mode` is 'interp', `window_length` must be less than or equal
+        to the size of `x`.
+    polyorder : int
+        The order of the polynomial used to fit the samples.
+        `polyorder` must be less than `window_length`.
+    deriv : int, optional
+        The order of the derivative to compute. This must be a
+        nonnegative integer. The default is 0, which means to filter
+        the data without differentiating.
+    delta : float, optional
+        The spacing of the samples to which the filter will be applied.
+        This is only used if deriv > 0. Default is 1.0.
+    axis : int, optional
+        The axis of the array `x` along which the filter is to be applied.
+        Default is -1.
+    mode : str, optional
+        Must be 'mirror', 'constant', 'nearest', 'wrap' or 'interp'. This
+        determines the type of extension to use for the padded signal to
+        which the filter is applied.  When `mode` is 'constant', the padding
+        value is given by `cval`.
+        When the 'interp' mode is selected (the default), no extension
+        is used.  Instead, a degree `polyorder` polynomial is fit to the
+        last `window_length` values of the edges, and this polynomial is
+        used to evaluate the last `window_length // 2` output values.
+    cval : scalar, optional
+        Value to fill past the edges of the input if `mode` is 'constant'.
+        Default is 0.0.
+
+    Returns
+    -------
+    y : ndarray, same shape as `x`
+        The filtered data.
+
+    See Also
+    --------
+    savgol_coeffs
+
+    Notes
+    -----
+    Details on the `mode` options:
+
+        'mirror':
+            Repeats the values at the edges in reverse order. The value
+            closest to the edge is not included.
+        'nearest':
+            The extension contains the nearest input value.
+        'constant':
+            The extension contains the value given by the `cval` argument.
+        'wrap':
+            The extension contains the values from the other end of the array.
+
+    Every line of `x` along `axis` is filtered by one convolution of all
+    lines laid end to end, so a large batch of short traces costs a single
+    call of `convolve` whatever the number of traces. The polynomial fits
+    of the 'interp' mode are precomputed as small matrices applied to the
+    first and last `window_length` samples of every line at once. Both the
+    coefficients and the edge matrices are memoized in the designed filter
+    cache.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> import cusignal
+    >>> x = cp.array([2, 2, 5, 2, 1, 0, 1, 4, 9])
+    >>> cusignal.savgol_filter(x, 5, 2)
+    array([1.66, 3.17, 3.54, 2.86, 0.66, 0.17, 1.  , 4.  , 9.  ])
+    >>> cusignal.savgol_filter(x, 5, 2, mode='nearest')
+    array([1.74, 3.03, 3.54, 2.86, 0.66, 0.17, 1.  , 4.6 , 7.97])
+
+    Smoothed first derivatives of a batch of traces:
+
+    >>> traces = cp.random.randn(100000, 64).astype(cp.float32)
+    >>> d = cusignal.savgol_filter(traces, 11, 3, deriv=1)
+
+    """
+    if mode not in _modes:
+        raise ValueError(
+            "mode must be 'mirror', 'constant', 'nearest' 'wrap' or 'interp'."
+        )
+
+    x = cp.asarray(x)
+    if x.dtype not in (np.float32, np.float64):
+        x = x.astype(np.float64)
+
+    window_length = int(window_length)
+    polyorder = int(polyorder)
+    deriv = int(deriv)
+    delta = float(delta)
+    pos = _check_design(window_length, polyorder, None, "conv")
+    (coeffs,) = _get_savgol(
+        "coeffs",
+        x.dtype,
+        True,
+        window_length,
+        polyorder,
+        deriv,
+        delta,
+        float(pos),
+        "conv",
+    )
+
+    xt = cp.ascontiguousarray(cp.moveaxis(x, axis, -1))
+    n = xt.shape[-1]
+    if xt.size == 0:
+        return cp.moveaxis(cp.empty_like(xt), -1, axis)
+    half = window_length // 2
+    # Even windows are centred half a sample to the left
+    off = 2 * half - window_length + 1
+
+    if mode == "interp":
+        if window_length > n:
+            raise ValueError(
+                "If mode is 'interp', window_length must be less "
+                "than or equal to the size of x."
+            )
+        y = _convolve_rows(xt, coeffs)
+        y[..., half - off :] = y[..., : n - half + off].copy()
+
+        left, right = _get_savgol(
+            "edges", x.dtype, True, window_length, polyorder, deriv, delta
+        )
+        y[..., :half] = cp.matmul(xt[..., :window_length], left.T)
+        y[..., n - half :] = cp.matmul(xt[..., n - window_length :], right.T)
+    else:
+        y = _convolve_rows(_extend(xt, half, mode, cval), coeffs)
+        y = y[..., off : off + n]
+
+    return cp.moveaxis(y, -1, axis)
@@ -13,6 +13,7 @@
 
 import cupy as cp
 import cusignal
+import numpy as np
 import pytest
 
 from cusignal.test.utils import array_equal, _check_rapids_pytest_benchmark
@@ -76,6 +77,59 @@ class TestConvolution:
             key = self.cpu_version(cpu_sig, cpu_filt, mode, method)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="CorrelateMaxLag")
+    @pytest.mark.parametrize("num_samps", [2 ** 14, 2 ** 16 + 1])
+    @pytest.mark.parametrize("max_lag", [8, 2000])
+    @pytest.mark.parametrize("num_channels", [1, 4])
+    @pytest.mark.parametrize("method", ["direct", "fft", "auto"])
+    class TestCorrelateMaxLag:
+        def cpu_version(self, x, y, max_lag):
+            full = signal.fftconvolve(
+                x[:, None, :], y[None, :, ::-1].conj(), axes=-1
+            )
+            mid = y.shape[-1] - 1
+            return full[..., mid - max_lag : mid + max_lag + 1]
+
+        def gpu_version(self, x, y, max_lag, method):
+            with cp.cuda.Stream.null:
+                out = cusignal.correlate(
+                    x[:, None, :],
+                    y[None, :, :],
+                    method=method,
+                    max_lag=max_lag,
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_correlate_max_lag_cpu(
+            self, benchmark, num_samps, max_lag, num_channels, method
+        ):
+            x = np.random.randn(num_channels, num_samps)
+            y = np.random.randn(num_channels, num_samps)
+            benchmark(self.cpu_version, x, y, max_lag)
+
+        def test_correlate_max_lag_gpu(
+            self, gpubenchmark, num_samps, max_lag, num_channels, method
+        ):
+            x = np.random.randn(num_channels, num_samps)
+            y = np.random.randn(num_channels, num_samps)
+            output = gpubenchmark(
+                self.gpu_version,
+                cp.asarray(x),
+                cp.asarray(y),
+                max_lag,
+                method,
+            )
+
+            key = self.cpu_version(x, y, max_lag)
+            array_equal(output, key)
+
+            lags = cusignal.correlation_lags(
+                num_samps, num_samps, max_lag=max_lag
+            )
+            array_equal(lags, np.arange(-max_lag, max_lag + 1))
+
     @pytest.mark.benchmark(group="Convolve")
     @pytest.mark.parametrize("num_samps", [2 ** 7, 2 ** 10 + 1, 2 ** 13])
     @pytest.mark.parametrize("num_taps", [125, 2 ** 8, 2 ** 13])
@@ -126,6 +180,57 @@ class TestConvolution:
             key = self.cpu_version(cpu_sig, cpu_win, mode, method)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="ConvolveExactInt")
+    @pytest.mark.parametrize("num_samps", [2 ** 14, 2 ** 16])
+    @pytest.mark.parametrize("num_taps", [2 ** 10, 2 ** 13])
+    @pytest.mark.parametrize("max_value", [2 ** 20, 2 ** 40, 2 ** 62])
+    @pytest.mark.parametrize("fill", ["random", "max"])
+    @pytest.mark.parametrize("mode", ["full", "valid", "same"])
+    class TestConvolveExactInt:
+        def cpu_version(self, sig, win, mode):
+            return np.convolve(sig, win, mode=mode)
+
+        def gpu_version(self, sig, win, mode):
+            with cp.cuda.Stream.null:
+                out = cusignal.convolve(sig, win, mode=mode, method="fft")
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def _gen(self, num_samps, num_taps, max_value, fill):
+            # All-positive inputs of the largest magnitude make every sum
+            # add up, the worst case for the rounding of the transforms
+            if fill == "max":
+                return (
+                    np.full(num_samps, max_value - 1, np.int64),
+                    np.full(num_taps, max_value - 1, np.int64),
+                )
+            return (
+                np.random.randint(-max_value, max_value, num_samps),
+                np.random.randint(-max_value, max_value, num_taps),
+            )
+
+        @pytest.mark.cpu
+        def test_convolve_exact_int_cpu(
+            self, benchmark, num_samps, num_taps, max_value, fill, mode
+        ):
+            cpu_sig, cpu_win = self._gen(num_samps, num_taps, max_value, fill)
+            benchmark(self.cpu_version, cpu_sig, cpu_win, mode)
+
+        def test_convolve_exact_int_gpu(
+            self, gpubenchmark, num_samps, num_taps, max_value, fill, mode
+        ):
+            cpu_sig, cpu_win = self._gen(num_samps, num_taps, max_value, fill)
+            output = gpubenchmark(
+                self.gpu_version,
+                cp.asarray(cpu_sig),
+                cp.asarray(cpu_win),
+                mode,
+            )
+
+            key = self.cpu_version(cpu_sig, cpu_win, mode)
+            assert output.dtype == key.dtype
+            assert (cp.asnumpy(output) == key).all()
+
     @pytest.mark.benchmark(group="FFTConvolve")
     @pytest.mark.parametrize("num_samps", [2 ** 15])
     @pytest.mark.parametrize("mode", ["full", "valid", "same"])
@@ -156,6 +261,270 @@ class TestConvolution:
             key = self.cpu_version(cpu_sig, mode)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="OAConvolve")
+    @pytest.mark.parametrize("num_samps", [2 ** 15, 2 ** 20])
+    @pytest.mark.parametrize("num_taps", [31, 255, 2 ** 10 + 1])
+    @pytest.mark.parametrize("num_chans", [1, 16])
+    @pytest.mark.parametrize("mode", ["full", "valid", "same"])
+    class TestOAConvolve:
+        def cpu_version(self, sig, win, mode):
+            return signal.oaconvolve(sig, win, mode=mode, axes=-1)
+
+        def gpu_version(self, sig, win, mode):
+            with cp.cuda.Stream.null:
+                out = cusignal.oaconvolve(sig, win, mode=mode, axes=-1)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_oaconvolve_cpu(
+            self, benchmark, num_samps, num_taps, num_chans, mode
+        ):
+            cpu_sig = np.random.randn(num_chans, num_samps)
+            cpu_win = signal.windows.hann(num_taps)[None, :]
+            benchmark(self.cpu_version, cpu_sig, cpu_win, mode)
+
+        def test_oaconvolve_gpu(
+            self, gpubenchmark, num_samps, num_taps, num_chans, mode
+        ):
+            cpu_sig = np.random.randn(num_chans, num_samps)
+            cpu_win = signal.windows.hann(num_taps)[None, :]
+            gpu_sig = cp.asarray(cpu_sig)
+            gpu_win = cp.asarray(cpu_win)
+            output = gpubenchmark(self.gpu_version, gpu_sig, gpu_win, mode)
+
+            key = self.cpu_version(cpu_sig, cpu_win, mode)
+            array_equal(output, key)
+            array_equal(
+                cusignal.oaconvolve(cpu_sig, cpu_win, mode=mode, axes=-1),
+                key,
+            )
+
+        def test_oaconvolve_broadcast_gpu(
+            self, num_samps, num_taps, num_chans, mode
+        ):
+            cpu_sig = np.random.randn(1, num_samps)
+            cpu_win = np.random.randn(3, num_taps)
+            output = self.gpu_version(
+                cp.asarray(cpu_sig), cp.asarray(cpu_win), mode
+            )
+
+            key = self.cpu_version(cpu_sig, cpu_win, mode)
+            assert output.shape == key.shape
+            array_equal(output, key)
+            array_equal(
+                cusignal.oaconvolve(cpu_sig, cpu_win, mode=mode, axes=-1),
+                key,
+            )
+
+        def test_oaconvolve_choose(self, num_samps, num_taps, num_chans, mode):
+            sig = cp.random.randn(num_samps)
+            win = cp.random.randn(num_taps)
+            method = cusignal.choose_conv_method(sig, win, mode=mode)
+            assert method in ("direct", "oa")
+
+        def test_oaconvolve_measure(
+            self, num_samps, num_taps, num_chans, mode
+        ):
+            sig = cp.random.randn(num_samps)
+            win = cp.random.randn(num_taps)
+            method, times = cusignal.choose_conv_method(
+                sig, win, mode=mode, measure=True
+            )
+            assert set(times) == {"direct", "fft", "oa"}
+            assert method == min(times, key=times.get)
+
+            # Measurements are memoized per device, shapes, types and mode
+            again = cusignal.choose_conv_method(
+                cp.random.randn(num_samps),
+                cp.random.randn(num_taps),
+                mode=mode,
+                measure=True,
+            )
+            assert again == (method, times)
+
+    @pytest.mark.benchmark(group="Convolver")
+    @pytest.mark.parametrize("num_samps", [2 ** 13, 2 ** 15 + 1])
+    @pytest.mark.parametrize("num_taps", [127, 2 ** 10])
+    @pytest.mark.parametrize("num_pulses", [1, 64])
+    @pytest.mark.parametrize("mode", ["full", "valid", "same"])
+    class TestConvolver:
+        def cpu_version(self, sig, h, mode):
+            return signal.fftconvolve(sig, h[None, :], mode=mode, axes=-1)
+
+        def gpu_version(self, sig, mf):
+            with cp.cuda.Stream.null:
+                out = mf.apply(sig)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_convolver_cpu(
+            self, benchmark, num_samps, num_taps, num_pulses, mode
+        ):
+            cpu_sig = np.random.randn(num_pulses, num_samps)
+            cpu_h = np.random.randn(num_taps)
+            benchmark(self.cpu_version, cpu_sig, cpu_h, mode)
+
+        def test_convolver_gpu(
+            self, gpubenchmark, num_samps, num_taps, num_pulses, mode
+        ):
+            cpu_sig = np.random.randn(num_pulses, num_samps)
+            cpu_h = np.random.randn(num_taps) + 1j * np.random.randn(num_taps)
+            gpu_sig = cp.asarray(cpu_sig)
+
+            mf = cusignal.Convolver(cp.asarray(cpu_h), num_samps, mode=mode)
+            output = gpubenchmark(self.gpu_version, gpu_sig, mf)
+
+            key = self.cpu_version(cpu_sig, cpu_h, mode)
+            array_equal(output, key)
+            array_equal(mf(gpu_sig[0]), key[0])
+            array_equal(mf(cpu_sig[-1]), key[-1])
+
+    @pytest.mark.benchmark(group="ConvolveBank")
+    @pytest.mark.parametrize("num_samps", [2 ** 12])
+    @pytest.mark.parametrize("num_taps", [31, 2 ** 11])
+    @pytest.mark.parametrize("num_signals", [1, 16])
+    @pytest.mark.parametrize("num_kernels", [16])
+    @pytest.mark.parametrize("mode", ["full", "valid", "same"])
+    @pytest.mark.parametrize("method", ["direct", "fft"])
+    class TestConvolveBank:
+        def cpu_version(self, sig, h, mode):
+            return signal.fftconvolve(
+                sig[:, None, :], h[None, :, :], mode=mode, axes=-1
+            )
+
+        def gpu_version(self, sig, h, mode, method):
+            with cp.cuda.Stream.null:
+                out = cusignal.convolve_bank(sig, h, mode=mode, method=method)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_convolve_bank_cpu(
+            self,
+            benchmark,
+            num_samps,
+            num_taps,
+            num_signals,
+            num_kernels,
+            mode,
+            method,
+        ):
+            cpu_sig = np.random.randn(num_signals, num_samps)
+            cpu_h = np.random.randn(num_kernels, num_taps)
+            benchmark(self.cpu_version, cpu_sig, cpu_h, mode)
+
+        def test_convolve_bank_gpu(
+            self,
+            gpubenchmark,
+            num_samps,
+            num_taps,
+            num_signals,
+            num_kernels,
+            mode,
+            method,
+        ):
+            if method == "direct" and num_taps > 1024:
+                pytest.skip("direct method is limited to 1024 taps")
+
+            cpu_sig = np.random.randn(num_signals, num_samps)
+            cpu_h = np.random.randn(num_kernels, num_taps)
+            gpu_sig = cp.asarray(cpu_sig)
+            gpu_h = cp.asarray(cpu_h)
+            output = gpubenchmark(
+                self.gpu_version, gpu_sig, gpu_h, mode, method
+            )
+
+            key = self.cpu_version(cpu_sig, cpu_h, mode)
+            array_equal(output, key)
+
+            paired = cusignal.convolve_bank(
+                gpu_sig, gpu_h[:num_signals], mode, method, paired=True
+            )
+            idx = np.arange(num_signals)
+            array_equal(paired, key[idx, idx])
+
+    @pytest.mark.benchmark(group="Volterra")
+    @pytest.mark.parametrize("num_samps", [2 ** 12])
+    @pytest.mark.parametrize("num_pulses", [1, 32])
+    @pytest.mark.parametrize("order, num_taps", [(2, 8), (2, 64), (3, 16)])
+    @pytest.mark.parametrize("mode", ["full", "valid", "same"])
+    @pytest.mark.parametrize("method", ["direct", "fft", "auto"])
+    class TestVolterra:
+        def cpu_version(self, sig, kernel, mode, method):
+            # Sums over an explicitly padded lag matrix,
+            # X[b, n, i] = x[b, n + M - 1 - i]
+            M = kernel.shape[0]
+            pad = {
+                "full": (M - 1, M - 1),
+                "same": (M // 2, (M - 1) // 2),
+                "valid": (0, 0),
+            }[mode]
+            x = np.pad(sig, ((0, 0), pad), mode="constant")
+            n_out = x.shape[-1] - M + 1
+            X = np.stack(
+                [x[:, M - 1 - i : M - 1 - i + n_out] for i in range(M)],
+                axis=-1,
+            )
+            if kernel.ndim == 2:
+                return np.einsum(
+                    "ij,bni,bnj->bn", kernel, X, X, optimize=True
+                )
+            return np.einsum(
+                "ijk,bni,bnj,bnk->bn", kernel, X, X, X, optimize=True
+            )
+
+        def gpu_version(self, sig, kernel, mode, method):
+            with cp.cuda.Stream.null:
+                if kernel.ndim == 2:
+                    out = cusignal.convolve1d2o(sig, kernel, mode, method)
+                else:
+                    out = cusignal.convolve1d3o(sig, kernel, mode, method)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_volterra_cpu(
+            self,
+            benchmark,
+            num_samps,
+            num_pulses,
+            order,
+            num_taps,
+            mode,
+            method,
+        ):
+            cpu_sig = np.random.randn(num_pulses, num_samps)
+            cpu_kernel = np.random.randn(*(num_taps,) * order)
+            benchmark(self.cpu_version, cpu_sig, cpu_kernel, mode, method)
+
+        def test_volterra_gpu(
+            self,
+            gpubenchmark,
+            num_samps,
+            num_pulses,
+            order,
+            num_taps,
+            mode,
+            method,
+        ):
+            cpu_sig = np.random.randn(num_pulses, num_samps)
+            cpu_kernel = np.random.randn(*(num_taps,) * order)
+            output = gpubenchmark(
+                self.gpu_version,
+                cp.asarray(cpu_sig),
+                cp.asarray(cpu_kernel),
+                mode,
+                method,
+            )
+
+            key = self.cpu_version(cpu_sig, cpu_kernel, mode, method)
+            array_equal(output, key)
+            array_equal(
+                self.gpu_version(cpu_sig, cpu_kernel, mode, method), key
+            )
+
     @pytest.mark.benchmark(group="Convolve2d")
     @pytest.mark.parametrize("num_samps", [2 ** 8])
     @pytest.mark.parametrize("num_taps", [5, 100])
@@ -210,6 +579,107 @@ class TestConvolution:
             key = self.cpu_version(cpu_sig, cpu_filt, boundary, mode)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="ConvolveND")
+    @pytest.mark.parametrize("shape", [(2 ** 10, 2 ** 10), (64, 64, 64)])
+    @pytest.mark.parametrize("num_taps", [5, 15])
+    @pytest.mark.parametrize("separable", [True, False])
+    @pytest.mark.parametrize("mode", ["full", "valid", "same"])
+    class TestConvolveND:
+        def _kernel(self, ndim, num_taps, separable):
+            if not separable:
+                return np.random.randn(*(num_taps,) * ndim)
+            g = signal.windows.gaussian(num_taps, num_taps / 4)
+            k = g
+            for _ in range(ndim - 1):
+                k = np.multiply.outer(k, g)
+            return k
+
+        def cpu_version(self, sig, filt, mode):
+            return signal.convolve(sig, filt, mode=mode, method="fft")
+
+        def gpu_version(self, sig, filt, mode):
+            with cp.cuda.Stream.null:
+                out = cusignal.convolve(sig, filt, mode=mode, method="direct")
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_convolve_nd_cpu(
+            self, benchmark, shape, num_taps, separable, mode
+        ):
+            cpu_sig = np.random.randn(*shape)
+            cpu_filt = self._kernel(len(shape), num_taps, separable)
+            benchmark(self.cpu_version, cpu_sig, cpu_filt, mode)
+
+        def test_convolve_nd_gpu(
+            self, gpubenchmark, shape, num_taps, separable, mode
+        ):
+            cpu_sig = np.random.randn(*shape)
+            cpu_filt = self._kernel(len(shape), num_taps, separable)
+            gpu_sig = cp.asarray(cpu_sig)
+            gpu_filt = cp.asarray(cpu_filt)
+            output = gpubenchmark(self.gpu_version, gpu_sig, gpu_filt, mode)
+
+            key = self.cpu_version(cpu_sig, cpu_filt, mode)
+            array_equal(output, key)
+
+            if len(shape) == 2:
+                for boundary in ["fill", "wrap", "symm"]:
+                    array_equal(
+                        cusignal.convolve2d(
+                            gpu_sig, gpu_filt, mode=mode, boundary=boundary
+                        ),
+                        signal.convolve2d(
+                            cpu_sig, cpu_filt, mode=mode, boundary=boundary
+                        ),
+                    )
+
+    @pytest.mark.benchmark(group="TiledFFTConvolve")
+    @pytest.mark.parametrize("shape", [(2 ** 11, 2 ** 9)])
+    @pytest.mark.parametrize("num_taps", [5, 33])
+    @pytest.mark.parametrize("tile_shape", [None, (300, 200)])
+    @pytest.mark.parametrize("mode", ["full", "valid", "same"])
+    class TestTiledFFTConvolve:
+        def cpu_version(self, sig, filt, mode):
+            return signal.fftconvolve(sig, filt, mode=mode)
+
+        def gpu_version(self, sig, filt, mode, out, tile_shape):
+            with cp.cuda.Stream.null:
+                out = cusignal.tiled_fftconvolve(
+                    sig, filt, mode, out=out, tile_shape=tile_shape
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_tiled_fftconvolve_cpu(
+            self, benchmark, shape, num_taps, tile_shape, mode
+        ):
+            cpu_sig = np.random.randn(*shape)
+            cpu_filt = np.random.randn(num_taps, num_taps)
+            benchmark(self.cpu_version, cpu_sig, cpu_filt, mode)
+
+        def test_tiled_fftconvolve_gpu(
+            self, tmpdir, gpubenchmark, shape, num_taps, tile_shape, mode
+        ):
+            cpu_sig = np.random.randn(*shape)
+            cpu_filt = np.random.randn(num_taps, num_taps)
+            key = self.cpu_version(cpu_sig, cpu_filt, mode)
+
+            path = str(tmpdir.join("sig.bin"))
+            sig = np.memmap(path, cpu_sig.dtype, "w+", shape=shape)
+            sig[:] = cpu_sig
+            sig.flush()
+            sig = np.memmap(path, cpu_sig.dtype, "r", shape=shape)
+            out = np.memmap(
+                str(tmpdir.join("out.bin")), key.dtype, "w+", shape=key.shape
+            )
+            output = gpubenchmark(
+                self.gpu_version, sig, cpu_filt, mode, out, tile_shape
+            )
+
+            array_equal(output, key)
+
     @pytest.mark.benchmark(group="Correlate2d")
     @pytest.mark.parametrize("num_samps", [2 ** 8])
     @pytest.mark.parametrize("num_taps", [5, 100])
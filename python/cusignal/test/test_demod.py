@@ -0,0 +1,140 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cupy as cp
+import cusignal
+import numpy as np
+import pytest
+
+from cusignal.test.utils import array_equal, _check_rapids_pytest_benchmark
+from scipy import signal
+
+gpubenchmark = _check_rapids_pytest_benchmark()
+
+
+def _fm_signal(num_chans, num_samps, dtype):
+    msg = np.random.randn(num_chans, num_samps).cumsum(-1) * 0.05
+    return np.exp(1j * (msg.cumsum(-1) + 10 * msg)).astype(dtype)
+
+
+class TestDemod:
+    @pytest.mark.benchmark(group="FMDemodulator")
+    @pytest.mark.parametrize("num_chans", [1, 64])
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    @pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+    class TestFMDemodulator:
+        def cpu_version(self, sig, fs):
+            d = np.angle(sig[..., 1:] * sig[..., :-1].conj())
+            d = np.concatenate((np.zeros(sig.shape[:-1] + (1,)), d), -1)
+            return d * fs / (2 * np.pi)
+
+        def gpu_version(self, sig, fs):
+            demod = cusignal.FMDemodulator(fs)
+            with cp.cuda.Stream.null:
+                n = sig.shape[-1] // 3
+                out = cp.concatenate(
+                    (demod(sig[..., :n]), demod(sig[..., n:])), -1
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_fm_demodulator_gpu(
+            self, gpubenchmark, num_chans, num_samps, dtype
+        ):
+            cpu_sig = _fm_signal(num_chans, num_samps, dtype)
+
+            output = gpubenchmark(self.gpu_version, cp.asarray(cpu_sig), 1e6)
+
+            key = self.cpu_version(cpu_sig, 1e6)
+            assert output.dtype == cpu_sig.real.dtype
+            array_equal(output, key)
+
+    @pytest.mark.benchmark(group="PMDemodulator")
+    @pytest.mark.parametrize("num_chans", [1, 64])
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    @pytest.mark.parametrize("unwrap", [False, True])
+    class TestPMDemodulator:
+        def cpu_version(self, sig, unwrap):
+            phase = np.angle(sig)
+            return np.unwrap(phase) if unwrap else phase
+
+        def gpu_version(self, sig, unwrap):
+            demod = cusignal.PMDemodulator(unwrap)
+            with cp.cuda.Stream.null:
+                n = sig.shape[-1] // 3
+                out = cp.concatenate(
+                    (demod(sig[..., :n]), demod(sig[..., n:])), -1
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_pm_demodulator_gpu(
+            self, gpubenchmark, num_chans, num_samps, unwrap
+        ):
+            cpu_sig = _fm_signal(num_chans, num_samps, np.complex128)
+
+            output = gpubenchmark(
+                self.gpu_version, cp.asarray(cpu_sig), unwrap
+            )
+
+            key = self.cpu_version(cpu_sig, unwrap)
+            array_equal(output, key)
+
+    @pytest.mark.benchmark(group="AMDemod")
+    @pytest.mark.parametrize("num_chans", [1, 64])
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    class TestAMDemod:
+        def cpu_version(self, sig):
+            return np.abs(sig)
+
+        def gpu_version(self, sig):
+            with cp.cuda.Stream.null:
+                out = cusignal.am_demod(sig)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_am_demod_gpu(self, gpubenchmark, num_chans, num_samps):
+            cpu_sig = _fm_signal(num_chans, num_samps, np.complex64)
+            cpu_sig *= 1 + 0.5 * np.random.rand(num_chans, num_samps)
+
+            output = gpubenchmark(self.gpu_version, cp.asarray(cpu_sig))
+
+            key = self.cpu_version(cpu_sig)
+            array_equal(output, key)
+
+    @pytest.mark.benchmark(group="Deemphasis")
+    @pytest.mark.parametrize("num_chans", [1, 64])
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    @pytest.mark.parametrize("tau", [50e-6, 75e-6])
+    class TestDeemphasis:
+        def cpu_version(self, sig, fs, tau):
+            a = np.exp(-1.0 / (tau * fs))
+            return signal.lfilter([1 - a], [1, -a], sig)
+
+        def gpu_version(self, sig, fs, tau):
+            de = cusignal.Deemphasis(fs, tau)
+            with cp.cuda.Stream.null:
+                n = sig.shape[-1] // 3
+                out = cp.concatenate((de(sig[..., :n]), de(sig[..., n:])), -1)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_deemphasis_gpu(self, gpubenchmark, num_chans, num_samps, tau):
+            cpu_sig = np.random.randn(num_chans, num_samps)
+
+            output = gpubenchmark(
+                self.gpu_version, cp.asarray(cpu_sig), 240e3, tau
+            )
+
+            key = self.cpu_version(cpu_sig, 240e3, tau)
+            array_equal(output, key)
@@ -26,18 +26,21 @@ class TestFilterDesign:
     @pytest.mark.parametrize("num_samps", [2 ** 15])
     @pytest.mark.parametrize("f1", [0.1, 0.15])
     @pytest.mark.parametrize("f2", [0.2, 0.4])
+    @pytest.mark.parametrize("gpupath", [True, None])
     class TestFirWin:
         def cpu_version(self, num_samps, f1, f2):
             return signal.firwin(num_samps, [f1, f2], pass_zero=False)
 
-        def gpu_version(self, num_samps, f1, f2):
+        def gpu_version(self, num_samps, f1, f2, gpupath):
             with cp.cuda.Stream.null:
-                out = cusignal.firwin(num_samps, [f1, f2], pass_zero=False)
+                out = cusignal.firwin(
+                    num_samps, [f1, f2], pass_zero=False, gpupath=gpupath
+                )
             cp.cuda.Stream.null.synchronize()
             return out
 
         @pytest.mark.cpu
-        def test_firwin_cpu(self, benchmark, num_samps, f1, f2):
+        def test_firwin_cpu(self, benchmark, num_samps, f1, f2, gpupath):
             benchmark(
                 self.cpu_version,
                 num_samps,
@@ -45,18 +48,62 @@ class TestFilterDesign:
                 f2,
             )
 
-        def test_firwin_gpu(self, gpubenchmark, num_samps, f1, f2):
+        def test_firwin_gpu(self, gpubenchmark, num_samps, f1, f2, gpupath):
 
             output = gpubenchmark(
                 self.gpu_version,
                 num_samps,
                 f1,
                 f2,
+                gpupath,
             )
 
             key = self.cpu_version(num_samps, f1, f2)
+            assert isinstance(output, cp.ndarray)
             array_equal(output, key)
 
+    class TestCostModel:
+        def test_cost_model_override(self):
+            try:
+                cusignal.set_cost_model(design_device_overhead=float("inf"))
+                assert cusignal.get_cost_model()[
+                    "design_device_overhead"
+                ] == float("inf")
+                h = cusignal.firwin(2 ** 16 + 1, 0.1)
+                assert isinstance(h, cp.ndarray)
+                array_equal(h, signal.firwin(2 ** 16 + 1, 0.1))
+
+                with pytest.raises(ValueError):
+                    cusignal.set_cost_model(fft_per_mac=1.0)
+                with pytest.raises(ValueError):
+                    cusignal.set_cost_model(direct_per_mac=-1.0)
+            finally:
+                cusignal.reset_cost_model()
+
+        def test_cost_model_calibrate(self):
+            try:
+                costs = cusignal.calibrate_cost_model(repeat=1)
+                assert costs == cusignal.get_cost_model()
+                assert all(v >= 0 for v in costs.values())
+            finally:
+                cusignal.reset_cost_model()
+
+        def test_cost_model_save_load(self, tmpdir):
+            path = str(tmpdir.join("cost_model.json"))
+            try:
+                cusignal.set_cost_model(conv_direct_per_mac=1.0)
+                cusignal.save_cost_model(path)
+                cusignal.reset_cost_model()
+                assert cusignal.get_cost_model()["conv_direct_per_mac"] < 1.0
+
+                assert cusignal.load_cost_model(path)
+                assert cusignal.get_cost_model()["conv_direct_per_mac"] == 1.0
+                assert not cusignal.load_cost_model(
+                    str(tmpdir.join("missing.json"))
+                )
+            finally:
+                cusignal.reset_cost_model()
+
     # Not passing anything to cupy, faster in numba
     @pytest.mark.parametrize("a", [5, 25, 100])
     @pytest.mark.benchmark(group="KaiserBeta")
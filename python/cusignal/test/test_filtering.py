@@ -120,6 +120,219 @@ class TestFilter:
             key = self.cpu_version(cpu_sig)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="WienerBatched")
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    @pytest.mark.parametrize("mysize", [3, 15, [9, 4]])
+    @pytest.mark.parametrize("num_images", [1, 4])
+    class TestWienerBatched:
+        def cpu_version(self, sig, mysize):
+            return np.stack(
+                [signal.wiener(im.astype(np.float64), mysize) for im in sig]
+            )
+
+        def gpu_version(self, sig, mysize):
+            with cp.cuda.Stream.null:
+                out = cusignal.wiener(sig, np.broadcast_to(mysize, 2))
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_wiener_batched_gpu(
+            self, rand_data_gen, gpubenchmark, dtype, mysize, num_images
+        ):
+            cpu_sig, _ = rand_data_gen(num_images * 128 * 96, 1, dtype)
+            cpu_sig = cpu_sig.reshape(num_images, 128, 96) + 10
+            gpu_sig = cp.asarray(cpu_sig)
+
+            output = gpubenchmark(self.gpu_version, gpu_sig, mysize)
+            assert output.dtype == dtype
+
+            key = self.cpu_version(cpu_sig, mysize)
+            array_equal(output, key)
+
+    @pytest.mark.benchmark(group="Wiener2d")
+    @pytest.mark.parametrize("shape", [(200, 120), (96, 257)])
+    @pytest.mark.parametrize("mysize", [[7, 3], [3, 11]])
+    class TestWiener2d:
+        def cpu_version(self, sig, mysize):
+            return signal.wiener(sig, mysize)
+
+        def gpu_version(self, sig, mysize):
+            with cp.cuda.Stream.null:
+                out = cusignal.wiener(sig, mysize)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_wiener2d_cpu(self, benchmark, shape, mysize):
+            cpu_sig = np.random.rand(*shape)
+            benchmark(self.cpu_version, cpu_sig, mysize)
+
+        def test_wiener2d_gpu(self, gpubenchmark, shape, mysize):
+            cpu_sig = np.random.rand(*shape)
+            output = gpubenchmark(
+                self.gpu_version, cp.asarray(cpu_sig), mysize
+            )
+
+            key = self.cpu_version(cpu_sig, mysize)
+            array_equal(output, key)
+
+    @pytest.mark.benchmark(group="Medfilt")
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    @pytest.mark.parametrize(
+        "shape, kernel_size",
+        [
+            ((2 ** 14,), 5),
+            ((2 ** 14,), 51),
+            ((256, 256), 3),
+            ((256, 256), 9),
+            ((256, 256), 31),
+        ],
+    )
+    class TestMedfilt:
+        def cpu_version(self, sig, kernel_size):
+            return signal.medfilt(sig, kernel_size)
+
+        def gpu_version(self, sig, kernel_size):
+            with cp.cuda.Stream.null:
+                out = cusignal.medfilt(sig, kernel_size)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.cpu
+        def test_medfilt_cpu(self, benchmark, dtype, shape, kernel_size):
+            cpu_sig = np.random.randn(*shape).astype(dtype)
+            benchmark(self.cpu_version, cpu_sig, kernel_size)
+
+        def test_medfilt_gpu(self, gpubenchmark, dtype, shape, kernel_size):
+            cpu_sig = np.random.randn(*shape).astype(dtype)
+            gpu_sig = cp.asarray(cpu_sig)
+
+            output = gpubenchmark(self.gpu_version, gpu_sig, kernel_size)
+
+            key = self.cpu_version(cpu_sig, kernel_size)
+            array_equal(output, key)
+            array_equal(cusignal.medfilt(cpu_sig, kernel_size), key)
+
+    @pytest.mark.benchmark(group="Medfilt2d")
+    @pytest.mark.parametrize("dtype", [np.uint8, np.float32, np.float64])
+    @pytest.mark.parametrize("num_images", [1, 3])
+    @pytest.mark.parametrize("kernel_size", [3, [5, 3], [11, 7]])
+    class TestMedfilt2d:
+        def cpu_version(self, sig, kernel_size):
+            return np.stack([signal.medfilt2d(im, kernel_size) for im in sig])
+
+        def gpu_version(self, sig, kernel_size):
+            with cp.cuda.Stream.null:
+                out = cusignal.medfilt2d(sig, kernel_size)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_medfilt2d_gpu(
+            self, gpubenchmark, dtype, num_images, kernel_size
+        ):
+            cpu_sig = (np.random.rand(num_images, 128, 96) * 200).astype(dtype)
+            gpu_sig = cp.asarray(cpu_sig)
+
+            output = gpubenchmark(self.gpu_version, gpu_sig, kernel_size)
+
+            key = self.cpu_version(cpu_sig, kernel_size)
+            array_equal(output, key)
+            array_equal(cusignal.medfilt2d(cpu_sig, kernel_size), key)
+
+    @pytest.mark.benchmark(group="OrderFilter")
+    @pytest.mark.parametrize("rank", [0, 1, 4])
+    @pytest.mark.parametrize(
+        "domain",
+        [
+            np.ones((3, 3)),
+            np.identity(3),
+            np.ones((1, 5)),
+            np.ones((9, 5)),
+            np.indices((9, 9)).sum(0) % 2 == 0,
+        ],
+        ids=["box", "diagonal", "row", "tall", "checker"],
+    )
+    class TestOrderFilter:
+        def cpu_version(self, sig, domain, rank):
+            return signal.order_filter(sig, domain, rank)
+
+        def gpu_version(self, sig, domain, rank):
+            with cp.cuda.Stream.null:
+                out = cusignal.order_filter(sig, domain, rank)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_order_filter_gpu(self, gpubenchmark, domain, rank):
+            if rank >= np.count_nonzero(domain):
+                pytest.skip("rank outside of the domain")
+            cpu_sig = np.random.randn(200, 300)
+
+            output = gpubenchmark(
+                self.gpu_version, cp.asarray(cpu_sig), domain, rank
+            )
+
+            key = self.cpu_version(cpu_sig, domain, rank)
+            array_equal(output, key)
+            array_equal(cusignal.order_filter(cpu_sig, domain, rank), key)
+
+    @pytest.mark.benchmark(group="SavgolFilter")
+    @pytest.mark.parametrize("window_length", [5, 8, 31])
+    @pytest.mark.parametrize("polyorder", [2, 3])
+    @pytest.mark.parametrize("deriv", [0, 1])
+    @pytest.mark.parametrize(
+        "mode", ["mirror", "constant", "nearest", "wrap", "interp"]
+    )
+    class TestSavgolFilter:
+        def cpu_version(self, sig, window_length, polyorder, deriv, mode):
+            return signal.savgol_filter(
+                sig, window_length, polyorder, deriv, 0.5, mode=mode, cval=1.0
+            )
+
+        def gpu_version(self, sig, window_length, polyorder, deriv, mode):
+            with cp.cuda.Stream.null:
+                out = cusignal.savgol_filter(
+                    sig,
+                    window_length,
+                    polyorder,
+                    deriv,
+                    0.5,
+                    mode=mode,
+                    cval=1.0,
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_savgol_coeffs_gpu(
+            self, window_length, polyorder, deriv, mode
+        ):
+            pos = 0 if mode == "interp" else None
+            output = cusignal.savgol_coeffs(
+                window_length, polyorder, deriv, 0.5, pos=pos
+            )
+            key = signal.savgol_coeffs(
+                window_length, polyorder, deriv, 0.5, pos=pos
+            )
+            array_equal(output, key)
+
+        def test_savgol_filter_gpu(
+            self, gpubenchmark, window_length, polyorder, deriv, mode
+        ):
+            cpu_sig = np.random.randn(1000, 64)
+
+            output = gpubenchmark(
+                self.gpu_version,
+                cp.asarray(cpu_sig),
+                window_length,
+                polyorder,
+                deriv,
+                mode,
+            )
+
+            key = self.cpu_version(
+                cpu_sig, window_length, polyorder, deriv, mode
+            )
+            array_equal(output, key)
+
     @pytest.mark.benchmark(group="SOSFilt")
     @pytest.mark.parametrize("order", [32, 64])
     @pytest.mark.parametrize("num_samps", [2 ** 15, 2 ** 20])
@@ -177,6 +390,22 @@ class TestFilter:
             key = self.cpu_version(cpu_sos, cpu_sig)
             array_equal(output, key)
 
+        def test_sosfilt_zi_gpu(self, num_signals, num_samps, order, dtype):
+            cpu_sos = signal.ellip(order, 0.009, 80, 0.05, output="sos")
+            cpu_sos = np.array(cpu_sos, dtype=dtype)
+            cpu_sig = np.random.random((num_signals, num_samps))
+            cpu_sig = np.array(cpu_sig, dtype=dtype)
+            cpu_zi = np.random.random((cpu_sos.shape[0], num_signals, 2))
+            cpu_zi = np.array(cpu_zi, dtype=dtype)
+
+            output, zf = cusignal.sosfilt(
+                cp.asarray(cpu_sos), cp.asarray(cpu_sig), zi=cp.asarray(cpu_zi)
+            )
+
+            key, key_zf = signal.sosfilt(cpu_sos, cpu_sig, zi=cpu_zi)
+            array_equal(output, key)
+            array_equal(zf, key_zf)
+
     @pytest.mark.benchmark(group="Hilbert")
     @pytest.mark.parametrize("dim, num_samps", [(1, 2 ** 15), (2, 2 ** 8)])
     class TestHilbert:
@@ -204,6 +433,71 @@ class TestFilter:
             key = self.cpu_version(cpu_sig)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="HilbertBatched")
+    @pytest.mark.parametrize("num_rows", [1000])
+    @pytest.mark.parametrize("num_samps", [255, 2 ** 10])
+    @pytest.mark.parametrize("N", [None, 300])
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    class TestHilbertBatched:
+        def cpu_version(self, sig, N):
+            return signal.hilbert(sig, N, axis=0)
+
+        def gpu_version(self, sig, N):
+            with cp.cuda.Stream.null:
+                out = cusignal.hilbert(sig, N, axis=0)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_hilbert_batched_gpu(
+            self, gpubenchmark, num_rows, num_samps, N, dtype
+        ):
+            cpu_sig = np.random.randn(num_samps, num_rows).astype(dtype)
+
+            output = gpubenchmark(self.gpu_version, cp.asarray(cpu_sig), N)
+
+            key = self.cpu_version(cpu_sig, N)
+            assert output.dtype == np.result_type(dtype, np.complex64)
+            array_equal(output, key)
+
+    @pytest.mark.benchmark(group="HilbertTransformer")
+    @pytest.mark.parametrize("numtaps", [3, 63, 65])
+    @pytest.mark.parametrize("num_samps", [2 ** 12])
+    @pytest.mark.parametrize("num_rows", [1, 100])
+    class TestHilbertTransformer:
+        def cpu_version(self, sig, numtaps):
+            M = (numtaps - 1) // 2
+            k = np.arange(numtaps) - M
+            h = np.zeros(numtaps)
+            h[k % 2 == 1] = 2.0 / (np.pi * k[k % 2 == 1])
+            h *= signal.get_window("hamming", numtaps, fftbins=False)
+
+            n = sig.shape[-1]
+            imag = signal.lfilter(h, 1, sig)
+            real = np.concatenate((np.zeros(sig.shape[:-1] + (M,)), sig), -1)
+            return real[..., :n] + 1j * imag
+
+        def gpu_version(self, sig, numtaps):
+            ht = cusignal.HilbertTransformer(numtaps)
+            with cp.cuda.Stream.null:
+                n = sig.shape[-1] // 3
+                out = cp.concatenate(
+                    (ht(sig[..., :n]), ht(sig[..., n:])), axis=-1
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_hilbert_transformer_gpu(
+            self, gpubenchmark, numtaps, num_samps, num_rows
+        ):
+            cpu_sig = np.random.randn(num_rows, num_samps)
+
+            output = gpubenchmark(
+                self.gpu_version, cp.asarray(cpu_sig), numtaps
+            )
+
+            key = self.cpu_version(cpu_sig, numtaps)
+            array_equal(output, key)
+
     @pytest.mark.benchmark(group="Hilbert2")
     @pytest.mark.parametrize("dim, num_samps", [(2, 2 ** 8)])
     class TestHilbert2:
@@ -256,6 +550,41 @@ class TestFilter:
             key = self.cpu_version(cpu_sig)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="DetrendBatched")
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64, np.complex128])
+    @pytest.mark.parametrize("shape, axis", [((64, 4096), -1), ((500, 8), 0)])
+    @pytest.mark.parametrize(
+        "bp", [0, [100, 101, 377], list(range(3, 500, 7))]
+    )
+    class TestDetrendBatched:
+        def cpu_version(self, sig, axis, bp):
+            return signal.detrend(sig, axis=axis, bp=bp)
+
+        def gpu_version(self, sig, axis, bp, overwrite_data):
+            with cp.cuda.Stream.null:
+                out = cusignal.detrend(
+                    sig, axis=axis, bp=bp, overwrite_data=overwrite_data
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_detrend_batched_gpu(
+            self, rand_data_gen, gpubenchmark, dtype, shape, axis, bp
+        ):
+            cpu_sig, gpu_sig = rand_data_gen(shape[0] * shape[1], 1, dtype)
+            trend = np.expand_dims(np.arange(shape[axis]), 1 + axis)
+            cpu_sig = (cpu_sig.reshape(shape) + 0.01 * trend).astype(dtype)
+            gpu_sig = cp.asarray(cpu_sig)
+
+            output = gpubenchmark(self.gpu_version, gpu_sig, axis, bp, False)
+
+            key = self.cpu_version(cpu_sig, axis, bp)
+            array_equal(output, key)
+
+            output = self.gpu_version(gpu_sig, axis, bp, True)
+            assert output is gpu_sig
+            array_equal(gpu_sig, key)
+
     @pytest.mark.benchmark(group="FreqShift")
     @pytest.mark.parametrize("dtype", [np.float64, np.complex128])
     @pytest.mark.parametrize("num_samps", [2 ** 8])
@@ -287,11 +616,107 @@ class TestFilter:
             key = self.cpu_version(cpu_sig, freq, fs)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="NCO")
+    @pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    @pytest.mark.parametrize("freq", [1.5e3, [-2e3, 0.0, 3.7e4]])
+    @pytest.mark.parametrize("fs", [1e5])
+    class TestNCO:
+        def cpu_version(self, x, freq, fs):
+            freq = np.asarray(freq)[..., None]
+            return np.exp(-2j * np.pi * freq / fs * np.arange(x.size)) * x
+
+        def gpu_version(self, x, nco, splits):
+            with cp.cuda.Stream.null:
+                out = cp.concatenate(
+                    [nco(x[a:b]) for a, b in zip(splits[:-1], splits[1:])],
+                    axis=-1,
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_nco_gpu(
+            self, rand_data_gen, gpubenchmark, dtype, num_samps, freq, fs
+        ):
+            cpu_sig, gpu_sig = rand_data_gen(num_samps, 1, dtype)
+            splits = [0, 1000, 1001, num_samps // 2, num_samps]
+
+            def run():
+                nco = cusignal.NCO(freq, fs, dtype=dtype)
+                return self.gpu_version(gpu_sig, nco, splits)
+
+            output = gpubenchmark(run)
+            assert output.dtype == dtype
+
+            key = self.cpu_version(cpu_sig, freq, fs)
+            array_equal(output, key)
+
+        def test_nco_generate_gpu(self, dtype, num_samps, freq, fs):
+            nco = cusignal.NCO(freq, fs, phase=0.25, dtype=dtype)
+            output = cp.concatenate(
+                [nco.generate(7), nco.generate(num_samps - 7)], axis=-1
+            )
+
+            key = self.cpu_version(np.ones(num_samps), freq, fs)
+            array_equal(output, key * np.exp(-0.25j))
+
+            cpu_out = cusignal.NCO(freq, fs, phase=0.25, dtype=dtype)(
+                np.ones(num_samps, dtype)
+            )
+            array_equal(output, cpu_out)
+
+    @pytest.mark.benchmark(group="DDC")
+    @pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    @pytest.mark.parametrize("freq", [1.5e3, [-2e4, 0.0, 3.7e4]])
+    @pytest.mark.parametrize("q", [4, 25])
+    class TestDDC:
+        def cpu_version(self, x, freq, fs, q, h):
+            freq = np.atleast_1d(freq)
+            n = np.arange(x.size)
+            out = [
+                np.convolve(x * np.exp(-2j * np.pi * f / fs * n), h)[
+                    : x.size : q
+                ]
+                for f in freq
+            ]
+            return np.squeeze(np.array(out))
+
+        def gpu_version(self, x, ddc, splits):
+            with cp.cuda.Stream.null:
+                out = cp.concatenate(
+                    [ddc(x[a:b]) for a, b in zip(splits[:-1], splits[1:])],
+                    axis=-1,
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_ddc_gpu(
+            self, rand_data_gen, gpubenchmark, dtype, num_samps, freq, q
+        ):
+            fs = 1e5
+            cpu_sig, gpu_sig = rand_data_gen(num_samps, 1, dtype)
+            cpu_h = signal.firwin(10 * q + 1, 1.0 / q)
+            splits = [0, 1000, 1001, num_samps // 2, num_samps]
+
+            def run():
+                ddc = cusignal.DDC(freq, fs, q, h=cpu_h, dtype=dtype)
+                return self.gpu_version(gpu_sig, ddc, splits)
+
+            output = gpubenchmark(run)
+            assert output.dtype == dtype
+
+            key = self.cpu_version(cpu_sig, freq, fs, q, cpu_h)
+            array_equal(output, key)
+
+            ddc = cusignal.DDC(freq, fs, q, h=cpu_h, dtype=dtype)
+            array_equal(output, ddc(cpu_sig))
+
     @pytest.mark.benchmark(group="Decimate")
     @pytest.mark.parametrize("num_samps", [2 ** 14, 2 ** 18])
     @pytest.mark.parametrize("downsample_factor", [2, 3, 4, 8, 64])
     @pytest.mark.parametrize("zero_phase", [True, False])
-    @pytest.mark.parametrize("gpupath", [True, False])
+    @pytest.mark.parametrize("gpupath", [True, False, None])
     class TestDecimate:
         def cpu_version(self, sig, downsample_factor, zero_phase):
             return signal.decimate(
@@ -345,6 +770,52 @@ class TestFilter:
             key = self.cpu_version(cpu_sig, downsample_factor, zero_phase)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="MultiStageDecimator")
+    @pytest.mark.parametrize("dtype", [np.float32, np.complex128])
+    @pytest.mark.parametrize("num_samps", [2 ** 18])
+    @pytest.mark.parametrize("q", [6, 15, 1000])
+    class TestMultiStageDecimator:
+        def cpu_version(self, x, dec):
+            for s, stage in zip(dec.stages, dec._stages):
+                taps = np.zeros(s.n_taps)
+                taps[stage._offs] = stage._h
+                x = np.convolve(x, taps)[: x.size : s.factor]
+            return x
+
+        def gpu_version(self, x, dec, splits):
+            with cp.cuda.Stream.null:
+                out = cp.concatenate(
+                    [dec(x[a:b]) for a, b in zip(splits[:-1], splits[1:])]
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_multistage_decimator_gpu(
+            self, rand_data_gen, gpubenchmark, dtype, num_samps, q
+        ):
+            cpu_sig, gpu_sig = rand_data_gen(num_samps, 1, dtype)
+            splits = [0, 1000, 1001, num_samps // 2, num_samps]
+
+            def run():
+                dec = cusignal.MultiStageDecimator(q)
+                return self.gpu_version(gpu_sig, dec, splits)
+
+            output = gpubenchmark(run)
+
+            dec = cusignal.MultiStageDecimator(q)
+            key = self.cpu_version(cpu_sig, dec)
+            array_equal(output, key)
+            array_equal(output, dec(cpu_sig))
+
+        def test_multistage_decimator_cost(self, q):
+            dec = cusignal.MultiStageDecimator(q)
+            assert np.prod([s.factor for s in dec.stages]) == q
+            assert dec.cost() < (20 * q + 1) / q
+
+            for s in dec.stages:
+                if s.kind == "halfband":
+                    assert s.n_mults == (s.n_taps + 1) // 2 + 1
+
     @pytest.mark.benchmark(group="Resample")
     @pytest.mark.parametrize("num_samps", [2 ** 14])
     @pytest.mark.parametrize("resample_num_samps", [2 ** 12, 2 ** 16])
@@ -395,6 +866,69 @@ class TestFilter:
             key = self.cpu_version(cpu_sig, resample_num_samps, window)
             array_equal(cp.asnumpy(output), key, atol=1e-4)
 
+    @pytest.mark.benchmark(group="ResampleBatched")
+    @pytest.mark.parametrize("dtype", [np.float32, np.complex64, np.float64])
+    @pytest.mark.parametrize("shape", [(2 ** 12, 16), (64, 2 ** 10)])
+    @pytest.mark.parametrize("resample_num_samps", [2 ** 9, 2 ** 11 + 1])
+    @pytest.mark.parametrize("window", [None, ("kaiser", 0.5)])
+    class TestResampleBatched:
+        def cpu_version(self, sig, resample_num_samps, window):
+            return signal.resample(sig, resample_num_samps, window=window)
+
+        def gpu_version(self, sig, resample_num_samps, window):
+            with cp.cuda.Stream.null:
+                out = cusignal.resample(sig, resample_num_samps, window=window)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_resample_batched_gpu(
+            self, gpubenchmark, dtype, shape, resample_num_samps, window
+        ):
+            cpu_sig = np.random.randn(*shape)
+            if np.iscomplexobj(dtype(0)):
+                cpu_sig = cpu_sig + 1j * np.random.randn(*shape)
+            cpu_sig = cpu_sig.astype(dtype)
+            gpu_sig = cp.asarray(cpu_sig)
+
+            output = gpubenchmark(
+                self.gpu_version, gpu_sig, resample_num_samps, window
+            )
+            assert output.dtype == dtype
+
+            key = self.cpu_version(
+                cpu_sig.astype(np.result_type(dtype, np.float64)),
+                resample_num_samps,
+                window,
+            )
+            array_equal(cp.asnumpy(output), key, atol=1e-4)
+
+        def test_resample_freq_gpu(
+            self, dtype, shape, resample_num_samps, window
+        ):
+            # A spectrum holds all of its bins even when it is real
+            cpu_spec = np.random.randn(*shape)
+            if np.iscomplexobj(dtype(0)):
+                cpu_spec = cpu_spec + 1j * np.random.randn(*shape)
+            cpu_spec = cpu_spec.astype(dtype)
+
+            output = cusignal.resample(
+                cp.asarray(cpu_spec),
+                resample_num_samps,
+                window=window,
+                domain="freq",
+            )
+            assert output.dtype == dtype
+
+            key = signal.resample(
+                cpu_spec.astype(np.complex128),
+                resample_num_samps,
+                window=window,
+                domain="freq",
+            )
+            if not np.iscomplexobj(cpu_spec):
+                key = key.real
+            array_equal(cp.asnumpy(output), key, atol=1e-4)
+
     @pytest.mark.benchmark(group="ResamplePoly")
     @pytest.mark.parametrize("num_samps", [2 ** 14])
     @pytest.mark.parametrize("up", [2, 3, 7])
@@ -447,6 +981,90 @@ class TestFilter:
             key = self.cpu_version(cpu_sig, up, down, window)
             array_equal(output, key)
 
+    @pytest.mark.parametrize("num_samps", [2 ** 12])
+    @pytest.mark.parametrize("up, down", [(2, 3), (1, 8), (3, 2)])
+    class TestFilterCache:
+        def test_resample_poly_cache_gpu(
+            self, linspace_data_gen, num_samps, up, down
+        ):
+            cpu_sig, gpu_sig = linspace_data_gen(
+                0, 10, num_samps, endpoint=False
+            )
+            cusignal.filter_cache_clear()
+            first = cusignal.resample_poly(gpu_sig, up, down)
+            misses = cusignal.filter_cache_info().misses
+            second = cusignal.resample_poly(gpu_sig, up, down)
+            info = cusignal.filter_cache_info()
+
+            assert info.hits > 0
+            assert info.misses == misses
+            array_equal(first, second)
+
+            key = signal.resample_poly(cpu_sig, up, down)
+            array_equal(second, key)
+
+        @pytest.mark.parametrize("zero_phase", [True, False])
+        def test_decimate_cache_gpu(
+            self, linspace_data_gen, num_samps, up, down, zero_phase
+        ):
+            cpu_sig, gpu_sig = linspace_data_gen(
+                0, 10, num_samps, endpoint=False
+            )
+            cusignal.filter_cache_clear()
+            for _ in range(2):
+                output = cusignal.decimate(
+                    gpu_sig, down, zero_phase=zero_phase
+                )
+            assert cusignal.filter_cache_info().hits > 0
+
+            key = signal.decimate(
+                cpu_sig, down, ftype="fir", zero_phase=zero_phase
+            )
+            array_equal(output, key)
+
+    @pytest.mark.benchmark(group="ResampleFarrow")
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    @pytest.mark.parametrize("ratio", [0.37, 1.00001, 3.3])
+    @pytest.mark.parametrize("num_blocks", [1, 7])
+    class TestResampleFarrow:
+        def cpu_version(self, sig, ratio):
+            return cusignal.resample_farrow(sig, ratio)
+
+        def gpu_version(self, sig, ratio):
+            with cp.cuda.Stream.null:
+                out = cusignal.resample_farrow(sig, ratio)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_resample_farrow_gpu(
+            self, gpubenchmark, num_samps, ratio, num_blocks
+        ):
+            cpu_sig = np.random.random((4, num_samps))
+            gpu_sig = cp.asarray(cpu_sig)
+            output = gpubenchmark(self.gpu_version, gpu_sig, ratio)
+
+            key = self.cpu_version(cpu_sig, ratio)
+            array_equal(output, key)
+
+        def test_farrow_streaming_gpu(self, num_samps, ratio, num_blocks):
+            gpu_sig = cp.random.random((4, num_samps))
+            key = cusignal.resample_farrow(gpu_sig, ratio)
+
+            # Streaming blocks must match one pass over the whole signal
+            rs = cusignal.FarrowResampler(ratio)
+            padded = cp.concatenate((gpu_sig, cp.zeros((4, 2))), -1)
+            blocks = cp.array_split(padded, num_blocks, axis=-1)
+            output = cp.concatenate([rs(b) for b in blocks], -1)
+            array_equal(output[:, : key.shape[-1]], key)
+
+        def test_farrow_interpolation_cpu(self, num_samps, ratio, num_blocks):
+            # Cubic Lagrange reproduces a slow sinusoid to high accuracy
+            t = np.arange(num_samps)
+            sig = np.sin(2 * np.pi * 0.01 * t)
+            output = cusignal.resample_farrow(sig, ratio)
+            key = np.sin(2 * np.pi * 0.01 * np.arange(output.size) / ratio)
+            array_equal(output[8:-8], key[8:-8], atol=1e-4)
+
     @pytest.mark.benchmark(group="UpFirDn")
     @pytest.mark.parametrize("dim, num_samps", [(1, 2 ** 14), (2, 2 ** 8)])
     @pytest.mark.parametrize("up", [2, 3, 7])
@@ -498,16 +1116,49 @@ class TestFilter:
             key = self.cpu_version(cpu_sig, up, down, axis)
             array_equal(output, key)
 
+    @pytest.mark.benchmark(group="UpFirDnND")
+    @pytest.mark.parametrize("shape", [(8, 16, 256), (4, 3, 5, 64)])
+    @pytest.mark.parametrize("up, down", [(2, 3), (7, 2)])
+    @pytest.mark.parametrize("axis", [-1, 0, 1])
+    class TestUpFirDnND:
+        def cpu_version(self, sig, up, down, axis):
+            return signal.upfirdn([1, 2, 1], sig, up, down, axis)
+
+        def gpu_version(self, sig, up, down, axis):
+            with cp.cuda.Stream.null:
+                out = cusignal.upfirdn([1, 2, 1], sig, up, down, axis)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_upfirdn_nd_gpu(self, gpubenchmark, shape, up, down, axis):
+            cpu_sig = np.random.random(shape)
+            gpu_sig = cp.asarray(cpu_sig)
+            output = gpubenchmark(
+                self.gpu_version, gpu_sig, up, down, axis
+            )
+
+            key = self.cpu_version(cpu_sig, up, down, axis)
+            array_equal(output, key)
+
+        def test_resample_poly_nd_gpu(self, shape, up, down, axis):
+            cpu_sig = np.random.random(shape)
+            gpu_sig = cp.asarray(cpu_sig)
+            output = cusignal.resample_poly(gpu_sig, up, down, axis=axis)
+
+            key = signal.resample_poly(cpu_sig, up, down, axis=axis)
+            array_equal(output, key)
+
     @pytest.mark.benchmark(group="Firfilter")
     @pytest.mark.parametrize("num_samps", [2 ** 14, 2 ** 18])
     @pytest.mark.parametrize("filter_len", [8, 32, 128])
+    @pytest.mark.parametrize("method", ["auto", "direct", "fft"])
     class TestFirfilter:
         def cpu_version(self, sig, filt):
             return signal.lfilter(filt, 1, sig)
 
-        def gpu_version(self, sig, filt):
+        def gpu_version(self, sig, filt, method):
             with cp.cuda.Stream.null:
-                out = cusignal.firfilter(filt, sig)
+                out = cusignal.firfilter(filt, sig, method=method)
             cp.cuda.Stream.null.synchronize()
             return out
 
@@ -518,6 +1169,7 @@ class TestFilter:
             linspace_data_gen,
             num_samps,
             filter_len,
+            method,
         ):
             cpu_sig, _ = linspace_data_gen(0, 10, num_samps, endpoint=False)
             cpu_filter, _ = signal.butter(filter_len, 0.5)
@@ -529,6 +1181,7 @@ class TestFilter:
             linspace_data_gen,
             num_samps,
             filter_len,
+            method,
         ):
             cpu_sig, gpu_sig = linspace_data_gen(
                 0, 10, num_samps, endpoint=False
@@ -539,6 +1192,7 @@ class TestFilter:
                 self.gpu_version,
                 gpu_sig,
                 gpu_filter,
+                method,
             )
 
             key = self.cpu_version(cpu_sig, cpu_filter)
@@ -593,3 +1247,122 @@ class TestFilter:
 
             key = self.cpu_version(cpu_sig, cpu_filt, n_chan)
             array_equal(output, key)
+
+    @pytest.mark.benchmark(group="Channelizer")
+    @pytest.mark.parametrize("dtype", [np.float32, np.complex128])
+    @pytest.mark.parametrize("num_samps", [2 ** 14])
+    @pytest.mark.parametrize("n_chan", [64, 128])
+    @pytest.mark.parametrize("n_taps", [16, 48])
+    class TestChannelizer:
+        def gpu_version(self, x, h, n_chan, oversample, layout):
+            with cp.cuda.Stream.null:
+                out = cusignal.Channelizer(h, n_chan, oversample, layout)(x)
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        def test_channelizer_gpu(
+            self, gpubenchmark, rand_data_gen, dtype, num_samps, n_chan, n_taps
+        ):
+            cpu_sig, gpu_sig = rand_data_gen(num_samps, 1, dtype)
+            cpu_filt, gpu_filt = rand_data_gen(n_taps * n_chan, 1, dtype)
+
+            output = gpubenchmark(
+                self.gpu_version, gpu_sig, gpu_filt, n_chan, 1, "channel"
+            )
+
+            key = channelize_poly_cpu(cpu_sig, cpu_filt, n_chan)
+            array_equal(output, key)
+
+        def test_channelizer_streaming_gpu(
+            self, rand_data_gen, dtype, num_samps, n_chan, n_taps
+        ):
+            _, gpu_sig = rand_data_gen(num_samps, 1, dtype)
+            _, gpu_filt = rand_data_gen(n_taps * n_chan - 5, 1, dtype)
+
+            for oversample in [1, 2]:
+                key = self.gpu_version(
+                    gpu_sig, gpu_filt, n_chan, oversample, "time"
+                )
+
+                chan = cusignal.Channelizer(
+                    gpu_filt, n_chan, oversample, "time"
+                )
+                splits = [0, 100, 101, num_samps // 2, num_samps]
+                output = cp.concatenate(
+                    [
+                        chan(gpu_sig[a:b])
+                        for a, b in zip(splits[:-1], splits[1:])
+                    ]
+                )
+                array_equal(output, key)
+
+                cpu_out = cusignal.Channelizer(
+                    cp.asnumpy(gpu_filt), n_chan, oversample, "time"
+                )(cp.asnumpy(gpu_sig))
+                array_equal(output, cpu_out)
+
+    @pytest.mark.benchmark(group="Synthesizer")
+    @pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+    @pytest.mark.parametrize("n_chan", [32, 64])
+    @pytest.mark.parametrize("oversample", [1, 2])
+    class TestSynthesizer:
+        def cpu_version(self, y, g, n_chan, oversample, channels):
+            return cusignal.Synthesizer(g, n_chan, oversample, channels)(y)
+
+        def gpu_version(self, y, g, n_chan, oversample, channels):
+            with cp.cuda.Stream.null:
+                out = cusignal.Synthesizer(g, n_chan, oversample, channels)(
+                    y
+                )
+            cp.cuda.Stream.null.synchronize()
+            return out
+
+        @pytest.mark.parametrize("channels", [None, [0, 3, 5]])
+        def test_synthesizer_gpu(
+            self, gpubenchmark, dtype, n_chan, oversample, channels
+        ):
+            n_in = n_chan if channels is None else len(channels)
+            cpu_y = (
+                np.random.randn(n_in, 256) + 1j * np.random.randn(n_in, 256)
+            ).astype(dtype)
+            cpu_g = signal.firwin(n_chan * 12, 1.0 / n_chan)
+
+            output = gpubenchmark(
+                self.gpu_version,
+                cp.asarray(cpu_y),
+                cp.asarray(cpu_g),
+                n_chan,
+                oversample,
+                channels,
+            )
+
+            key = self.cpu_version(cpu_y, cpu_g, n_chan, oversample, channels)
+            array_equal(output, key)
+
+        def test_synthesizer_reconstruction_gpu(
+            self, dtype, n_chan, oversample
+        ):
+            if oversample == 1:
+                pytest.skip("critically sampled banks alias at band edges")
+
+            num_samps = n_chan * 512
+            x = cp.asarray(
+                np.random.randn(num_samps) + 1j * np.random.randn(num_samps)
+            ).astype(dtype)
+            x = cusignal.firfilter(cusignal.firwin(255, 0.8), x)
+
+            n = n_chan * 24
+            chan = cusignal.Channelizer(
+                cusignal.firwin(n, 1.5 / n_chan), n_chan, oversample
+            )
+            synth = cusignal.Synthesizer(
+                cusignal.firwin(n, 1.0 / n_chan), n_chan, oversample
+            )
+            y = cp.concatenate(
+                [synth(chan(x[: x.size // 2])), synth(chan(x[x.size // 2 :]))]
+            )
+
+            delay = n - n_chan // oversample
+            seg = slice(4 * n, x.size - 4 * n)
+            err = y[seg.start + delay : seg.stop + delay] - x[seg]
+            assert float(cp.linalg.norm(err) / cp.linalg.norm(x[seg])) < 1e-2
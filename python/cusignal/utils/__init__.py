@@ -18,3 +18,11 @@ from cusignal.utils.arraytools import (
     get_pinned_mem,
     from_pycuda,
 )
+from cusignal.utils.cost_model import (
+    get_cost_model,
+    set_cost_model,
+    reset_cost_model,
+    calibrate_cost_model,
+    save_cost_model,
+    load_cost_model,
+)
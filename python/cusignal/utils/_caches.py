@@ -11,5 +11,94 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
+from collections import OrderedDict, namedtuple
+
 # Kernel caches
 _cupy_kernel_cache = {}
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _LRUCache(object):
+    """
+    Bounded, thread-safe least-recently-used cache.
+
+    Used to memoize filter designs and other precomputed arrays that are
+    expensive to build but repeat across many calls with identical
+    parameters. Keys must be hashable; values are stored as-is, so callers
+    are responsible for never modifying a cached array in place.
+    """
+
+    def __init__(self, maxsize=128):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = int(maxsize)
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._data)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def resize(self, maxsize):
+        with self._lock:
+            self._maxsize = int(maxsize)
+            while len(self._data) > max(self._maxsize, 0):
+                self._data.popitem(last=False)
+
+
+def _hashable_key(obj):
+    """
+    Return `obj` if it can be used as part of a cache key, otherwise None.
+    Array-valued parameters (e.g. user supplied taps) are never cached.
+    """
+    try:
+        hash(obj)
+    except TypeError:
+        return None
+    return obj
+
+
+# Designed filter caches (prototype taps and prepared polyphase filters)
+_filter_design_cache = _LRUCache(maxsize=128)
+
+# Per-sample segment indices used by `detrend`, keyed by length and breakpoints
+_detrend_cache = _LRUCache(maxsize=32)
+
+# Spectral weights of `hilbert`, keyed by FFT length and data type
+_hilbert_cache = _LRUCache(maxsize=32)
+
+# Measured choices of `choose_conv_method`, keyed by device, shapes, types
+# and mode
+_conv_method_cache = _LRUCache(maxsize=256)
@@ -0,0 +1,385 @@
+# Copyright (c) 2019-2020, NVIDIA CORPORATION.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import threading
+import time
+import warnings
+
+import cupy as cp
+import numpy as np
+
+# Every cost is modelled as ``overhead + rate * work`` seconds. The defaults
+# put the crossover of host and device filter design near 8192 taps.
+_DEFAULT_COSTS = {
+    # Host design: NumPy sinc and window, then the copy to the device
+    "design_host_overhead": 2e-5,
+    "design_host_per_tap": 2.2e-8,
+    # Device design: a handful of kernel launches and a reduction
+    "design_device_overhead": 2e-4,
+    "design_device_per_tap": 1e-11,
+    # Direct FIR filtering, per multiply-accumulate
+    "direct_overhead": 1e-5,
+    "direct_per_mac": 2e-12,
+    # FFT filtering and convolution, per ``L * log2(L)`` of each transform
+    "fft_overhead": 6e-5,
+    "fft_per_point": 3e-11,
+    # Direct N-dimensional convolution, per multiply-accumulate
+    "conv_direct_overhead": 1e-5,
+    "conv_direct_per_mac": 4e-12,
+}
+
+_costs = dict(_DEFAULT_COSTS)
+_costs_lock = threading.Lock()
+
+# Whether the constants saved for the current device have been looked for
+_loaded = False
+
+_DEFAULT_PATH = os.path.join("~", ".cusignal", "cost_model.json")
+
+
+def get_cost_model():
+    """
+    Return the constants of the cost model used for automatic backend and
+    algorithm selection.
+
+    Functions that accept ``gpupath=None`` design their filter on the host
+    or the device, and functions that accept ``method='auto'`` filter or
+    convolve directly or with FFTs, whichever the model predicts to be
+    faster. Every cost is modelled as ``overhead + rate * work`` seconds.
+
+    The first call loads the constants saved for the current device by
+    `save_cost_model`, if any.
+
+    Returns
+    -------
+    costs : dict
+        ``design_host_overhead``, ``design_host_per_tap``
+            Designing a filter on the host and copying it to the device.
+        ``design_device_overhead``, ``design_device_per_tap``
+            Designing a filter on the device.
+        ``direct_overhead``, ``direct_per_mac``
+            Direct filtering, per multiply-accumulate.
+        ``fft_overhead``, ``fft_per_point``
+            FFT filtering and convolution, per ``L * log2(L)`` of each
+            transform of length ``L``.
+        ``conv_direct_overhead``, ``conv_direct_per_mac``
+            Direct convolution and correlation, per multiply-accumulate.
+
+    See Also
+    --------
+    set_cost_model, reset_cost_model, calibrate_cost_model,
+    save_cost_model, load_cost_model
+    """
+    global _loaded
+    if not _loaded:
+        _loaded = True
+        try:
+            load_cost_model()
+        except (OSError, ValueError) as e:
+            warnings.warn("Ignoring saved cost model: {}".format(e))
+    with _costs_lock:
+        return dict(_costs)
+
+
+def set_cost_model(**costs):
+    """
+    Override constants of the cost model.
+
+    Parameters
+    ----------
+    **costs : float
+        New values of any of the constants returned by `get_cost_model`.
+
+    Examples
+    --------
+    Always design filters on the host:
+
+    >>> import cusignal
+    >>> cusignal.set_cost_model(design_device_overhead=float("inf"))
+
+    """
+    unknown = set(costs) - set(_DEFAULT_COSTS)
+    if unknown:
+        raise ValueError(
+            "Unknown cost model constants: {}".format(sorted(unknown))
+        )
+    for name, value in costs.items():
+        if not value >= 0:
+            raise ValueError("{} must be non-negative".format(name))
+    with _costs_lock:
+        _costs.update((k, float(v)) for k, v in costs.items())
+
+
+def reset_cost_model():
+    """
+    Restore the default constants of the cost model.
+
+    Constants saved by `save_cost_model` are left in place; use
+    `load_cost_model` to restore them.
+    """
+    global _loaded
+    with _costs_lock:
+        _costs.clear()
+        _costs.update(_DEFAULT_COSTS)
+        _loaded = True
+
+
+def _cost_model_path(path):
+    if path is None:
+        path = os.environ.get("CUSIGNAL_COST_MODEL", _DEFAULT_PATH)
+    return os.path.expanduser(path)
+
+
+def _device_key():
+    """Name of the current device, under which its constants are saved."""
+    device = cp.cuda.Device()
+    try:
+        name = cp.cuda.runtime.getDeviceProperties(device.id)["name"]
+    except AttributeError:
+        name = "sm_{}".format(device.compute_capability)
+    if isinstance(name, bytes):
+        name = name.decode()
+    return name
+
+
+def _read_saved(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        saved = json.load(f)
+    if not isinstance(saved, dict):
+        raise ValueError("{} is not a saved cost model".format(path))
+    return saved
+
+
+def save_cost_model(path=None):
+    """
+    Save the constants of the cost model for the current device.
+
+    Constants of other devices already in the file are kept, so one file
+    can serve a machine with several kinds of GPUs.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON file to write. Defaults to the ``CUSIGNAL_COST_MODEL``
+        environment variable if set, otherwise
+        ``~/.cusignal/cost_model.json``, which is loaded automatically by
+        every process.
+
+    See Also
+    --------
+    load_cost_model, calibrate_cost_model
+    """
+    path = _cost_model_path(path)
+    saved = _read_saved(path)
+    saved[_device_key()] = get_cost_model()
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    # Write the whole file at once so concurrent readers never see half of it
+    tmp = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp, "w") as f:
+        json.dump(saved, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_cost_model(path=None):
+    """
+    Load the constants of the cost model saved for the current device.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON file written by `save_cost_model`, with the same default.
+
+    Returns
+    -------
+    found : bool
+        Whether constants were saved for the current device. If not, the
+        cost model is left unchanged.
+    """
+    global _loaded
+    path = _cost_model_path(path)
+    saved = _read_saved(path)
+    if not saved:
+        return False
+    costs = saved.get(_device_key())
+    if costs is None:
+        return False
+
+    # Ignore constants this version does not know about
+    set_cost_model(**{k: v for k, v in costs.items() if k in _DEFAULT_COSTS})
+    _loaded = True
+    return True
+
+
+def _use_gpu_design(numtaps):
+    """Whether a `numtaps` filter is faster to design on the device."""
+    c = get_cost_model()
+    host = c["design_host_overhead"] + c["design_host_per_tap"] * numtaps
+    device = (
+        c["design_device_overhead"] + c["design_device_per_tap"] * numtaps
+    )
+    return device < host
+
+
+def _fft_work(n):
+    return n * np.log2(max(n, 2))
+
+
+def _use_fft_filter(numtaps, n_samps, n_batch=1):
+    """
+    Whether filtering `n_batch` signals of `n_samps` samples with a
+    `numtaps` FIR is faster with FFTs than directly.
+    """
+    c = get_cost_model()
+    direct = (
+        c["direct_overhead"]
+        + c["direct_per_mac"] * n_batch * n_samps * numtaps
+    )
+    fft = (
+        c["fft_overhead"]
+        + c["fft_per_point"] * n_batch * _fft_work(n_samps + numtaps - 1)
+    )
+    return fft < direct
+
+
+def _fit(work, seconds):
+    """Non-negative least-squares fit of ``overhead + rate * work``."""
+    work = np.asarray(work, dtype=np.float64)
+    seconds = np.asarray(seconds, dtype=np.float64)
+    A = np.stack((np.ones_like(work), work), -1)
+    (overhead, rate), _, _, _ = np.linalg.lstsq(A, seconds, rcond=None)
+    if overhead < 0:
+        overhead, rate = 0.0, seconds.dot(work) / work.dot(work)
+    if rate < 0:
+        overhead, rate = seconds.mean(), 0.0
+    return float(overhead), float(rate)
+
+
+def _time_gpu(func, repeat):
+    """Best wall time of `func` over `repeat` runs, after a warm-up run."""
+    func()
+    cp.cuda.Device().synchronize()
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        cp.cuda.Device().synchronize()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate_cost_model(repeat=5, save=False):
+    """
+    Fit the cost model to timings measured on the current device.
+
+    Times filter designs on the host and the device, direct and FFT
+    filtering, and direct, FFT and overlap-add convolution over a range of
+    sizes, then replaces the constants of the cost model with
+    least-squares fits. Takes a few seconds.
+
+    Parameters
+    ----------
+    repeat : int, optional
+        Number of timed runs per measurement; the fastest is kept.
+        Default is 5.
+    save : bool, optional
+        If True, also save the fitted constants with `save_cost_model`, so
+        that later processes on this kind of device load them. Default is
+        False.
+
+    Returns
+    -------
+    costs : dict
+        The fitted constants, as returned by `get_cost_model`.
+
+    Notes
+    -----
+    Unless saved, calibration only affects the current process. Individual
+    calls can always override the model by passing ``gpupath=True`` or
+    ``False``, or an explicit `method`; `set_cost_model` overrides it
+    globally.
+    """
+    from ..convolution.convolution_utils import _conv_work
+    from ..convolution.convolve import convolve
+    from ..filter_design.fir_filter_design import firwin
+    from ..filtering.filtering import firfilter
+
+    taps = [16, 256, 2048, 16384, 65536]
+    host, device = [], []
+    for n in taps:
+        host.append(
+            _time_gpu(
+                lambda: cp.asarray(firwin(n, 0.25, gpupath=False)), repeat
+            )
+        )
+        device.append(
+            _time_gpu(lambda: firwin(n, 0.25, gpupath=True), repeat)
+        )
+
+    x = cp.random.randn(1 << 18)
+    sizes = [(8, 1 << 12), (64, 1 << 14), (256, 1 << 16), (1024, 1 << 18)]
+    direct, fft, macs, points = [], [], [], []
+    for n, m in sizes:
+        b = cp.random.randn(n)
+        direct.append(
+            _time_gpu(lambda: firfilter(b, x[:m], method="direct"), repeat)
+        )
+        fft.append(
+            _time_gpu(lambda: firfilter(b, x[:m], method="fft"), repeat)
+        )
+        macs.append(n * m)
+        points.append(_fft_work(n + m - 1))
+
+    # Convolutions time the same FFTs as filtering, so they share a fit
+    conv_direct, conv_macs = [], []
+    for n, m in sizes + [(1 << 12, 1 << 13), (1 << 14, 1 << 14)]:
+        b = cp.random.randn(n)
+        work = _conv_work((m,), (n,), "full")
+        conv_direct.append(
+            _time_gpu(lambda: convolve(x[:m], b, method="direct"), repeat)
+        )
+        conv_macs.append(work["direct"])
+        fft.append(_time_gpu(lambda: convolve(x[:m], b, method="fft"), repeat))
+        points.append(work["fft"])
+        if work["oa"] is not None:
+            fft.append(
+                _time_gpu(lambda: convolve(x[:m], b, method="oa"), repeat)
+            )
+            points.append(work["oa"])
+
+    costs = {}
+    (
+        costs["design_host_overhead"],
+        costs["design_host_per_tap"],
+    ) = _fit(taps, host)
+    (
+        costs["design_device_overhead"],
+        costs["design_device_per_tap"],
+    ) = _fit(taps, device)
+    costs["direct_overhead"], costs["direct_per_mac"] = _fit(macs, direct)
+    costs["fft_overhead"], costs["fft_per_point"] = _fit(points, fft)
+    (
+        costs["conv_direct_overhead"],
+        costs["conv_direct_per_mac"],
+    ) = _fit(conv_macs, conv_direct)
+
+    set_cost_model(**costs)
+    if save:
+        save_cost_model()
+    return get_cost_model()